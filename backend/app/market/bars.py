@@ -0,0 +1,214 @@
+"""Incremental OHLC bar aggregation from PriceCache updates."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+from .rows import TickerRows
+
+logger = logging.getLogger(__name__)
+
+# Default bar intervals in seconds, finest first, with bars kept per ticker:
+# 5 minutes of 1s bars, 4 hours of 1m bars, a day of 5m bars, a week of 1h bars
+DEFAULT_INTERVALS = {1: 300, 60: 240, 300: 288, 3600: 168}
+
+
+@dataclass(frozen=True, slots=True)
+class Bars:
+    """A run of OHLC bars in time order. `start` is each bar's opening time."""
+
+    start: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    ticks: np.ndarray  # Price updates in the bar (the sources report no traded volume)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def to_dict(self) -> dict[str, list]:
+        """Serialize for JSON, one list per column."""
+        return {
+            "start": self.start.tolist(),
+            "open": self.open.tolist(),
+            "high": self.high.tolist(),
+            "low": self.low.tolist(),
+            "close": self.close.tolist(),
+            "ticks": self.ticks.tolist(),
+        }
+
+
+class _Level:
+    """Ring buffers of bars at one interval, one row per ticker."""
+
+    def __init__(self, interval: float, capacity: int, rows: int) -> None:
+        self.interval = interval
+        self.capacity = capacity
+        self.bars = np.zeros((5, rows, capacity))  # start, open, high, low, close
+        self.ticks = np.zeros((rows, capacity), dtype=np.int64)
+        self.count = np.zeros(rows, dtype=np.int64)  # Bars ever opened per row
+
+    def grow(self, rows: int) -> None:
+        extra = rows - len(self.count)
+        self.bars = np.concatenate((self.bars, np.zeros((5, extra, self.capacity))), axis=1)
+        self.ticks = np.concatenate((self.ticks, np.zeros((extra, self.capacity), np.int64)))
+        self.count = np.concatenate((self.count, np.zeros(extra, np.int64)))
+
+    def fold(
+        self, rows: np.ndarray, sub: np.ndarray, ticks: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Merge sub-bars (5, k) — ticks or finished finer bars — into each row's bar.
+
+        A sub-bar past the current bar's bucket closes it and opens a new
+        one. Returns the closed bars as (rows, bars, ticks), for the next
+        coarser level.
+        """
+        bucket = np.floor(sub[0] / self.interval) * self.interval
+        has = self.count[rows] > 0
+        slot = (self.count[rows] - 1) % self.capacity
+        current = self.bars[:, rows, slot]
+        # Late sub-bars (bucket before the current one) fold into the current bar
+        same = has & (bucket <= current[0])
+
+        r, s = rows[same], slot[same]
+        self.bars[2, r, s] = np.maximum(current[2, same], sub[2, same])
+        self.bars[3, r, s] = np.minimum(current[3, same], sub[3, same])
+        self.bars[4, r, s] = sub[4, same]
+        self.ticks[r, s] += ticks[same]
+
+        opened = ~same
+        closed = opened & has
+        closed_rows, closed_slots = rows[closed], slot[closed]
+        finished = (
+            closed_rows,
+            self.bars[:, closed_rows, closed_slots],
+            self.ticks[closed_rows, closed_slots],
+        )
+
+        r = rows[opened]
+        self.count[r] += 1
+        s = (self.count[r] - 1) % self.capacity
+        self.bars[:, r, s] = sub[:, opened]
+        self.bars[0, r, s] = bucket[opened]
+        self.ticks[r, s] = ticks[opened]
+        return finished
+
+    def stored(self, row: int) -> tuple[np.ndarray, np.ndarray]:
+        """A row's bars in time order: (5, k) columns and (k,) ticks."""
+        count = int(self.count[row])
+        if count <= self.capacity:
+            return self.bars[:, row, :count], self.ticks[row, :count]
+        order = np.roll(np.arange(self.capacity), -(count % self.capacity))
+        return self.bars[:, row, order], self.ticks[row, order]
+
+    def current(self, row: int) -> tuple[np.ndarray, int] | None:
+        count = int(self.count[row])
+        if count == 0:
+            return None
+        slot = (count - 1) % self.capacity
+        return self.bars[:, row, slot].copy(), int(self.ticks[row, slot])
+
+
+class BarAggregator(TickerRows):
+    """OHLC bars per ticker at several intervals, built incrementally from ticks.
+
+    Only the finest interval sees every tick: it updates the open bar in
+    O(1) (high, low, close and tick count), and when a tick lands in a new
+    bucket the finished bar is folded into the next coarser interval, and
+    so on up. Each interval keeps a fixed number of bars per ticker in
+    preallocated ring buffers. Queries merge the still-open finer bars into
+    the coarser bar they belong to, so every interval is current to the
+    latest tick without rescanning anything.
+
+    Intervals must each be a whole multiple of the previous one. Attach to a
+    PriceCache with attach(); bars are keyed by update timestamps, and
+    tickers removed from the cache are dropped on the next write.
+    """
+
+    def __init__(self, intervals: dict[float, int] | None = None, rows: int = 16) -> None:
+        intervals = dict(sorted((intervals or DEFAULT_INTERVALS).items()))
+        if not intervals:
+            raise ValueError("At least one interval is required")
+        sizes = list(intervals)
+        for fine, coarse in zip(sizes, sizes[1:]):
+            ratio = coarse / fine
+            if abs(ratio - round(ratio)) > 1e-9:
+                raise ValueError(f"Interval {coarse}s is not a multiple of {fine}s")
+        super().__init__(rows)
+        self._levels = [_Level(iv, capacity, rows) for iv, capacity in intervals.items()]
+
+    @property
+    def intervals(self) -> list[float]:
+        return [level.interval for level in self._levels]
+
+    def bars(
+        self,
+        ticker: str,
+        interval: float,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> Bars:
+        """Bars of `interval` opening in [start, end], the last one still open."""
+        levels = [level.interval for level in self._levels]
+        if interval not in levels:
+            raise ValueError(f"Unknown interval {interval}; aggregating {levels}")
+        with self._lock:
+            row = self._index.get(ticker)
+            if row is None:
+                return Bars(*np.zeros((5, 0)), np.zeros(0, np.int64))
+            k = levels.index(interval)
+            columns, ticks = self._levels[k].stored(row)
+            columns, ticks = columns.copy(), ticks.copy()
+            live = self._live(k, row)
+
+        if live is not None:
+            bar, n = live
+            if len(ticks) and columns[0, -1] == bar[0]:
+                columns[:, -1], ticks[-1] = bar, n
+            else:
+                columns = np.concatenate((columns, bar[:, None]), axis=1)
+                ticks = np.append(ticks, n)
+        lo = 0 if start is None else np.searchsorted(columns[0], start, side="left")
+        hi = len(ticks) if end is None else np.searchsorted(columns[0], end, side="right")
+        return Bars(*columns[:, lo:hi], ticks[lo:hi])
+
+    # --- Internals (caller holds _lock) ---
+
+    def _store(self, rows: np.ndarray, times: np.ndarray, prices: np.ndarray) -> None:
+        """Add one tick per row, folding finished bars up through the levels."""
+        sub = np.stack((times, prices, prices, prices, prices))
+        ticks = np.ones(len(rows), dtype=np.int64)
+        for level in self._levels:
+            rows, sub, ticks = level.fold(rows, sub, ticks)
+            if not rows.size:
+                break
+
+    def _grow(self, rows: int) -> None:
+        for level in self._levels:
+            level.grow(rows)
+
+    def _reset(self, row: int) -> None:
+        for level in self._levels:
+            level.count[row] = 0
+
+    def _live(self, k: int, row: int) -> tuple[np.ndarray, int] | None:
+        """Level k's open bar for a row, with the open bars of finer levels merged in."""
+        level = self._levels[k]
+        current = level.current(row)
+        below = self._live(k - 1, row) if k > 0 else None
+        if below is None:
+            return current
+        sub, n = below
+        bucket = np.floor(sub[0] / level.interval) * level.interval
+        if current is None or bucket > current[0][0]:
+            sub[0] = bucket  # The finer bars have opened a new bar at this level
+            return sub, n
+        bar, total = current
+        bar[2] = max(bar[2], sub[2])
+        bar[3] = min(bar[3], sub[3])
+        bar[4] = sub[4]
+        return bar, total + n
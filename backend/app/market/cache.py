@@ -2,23 +2,112 @@
 
 from __future__ import annotations
 
-import time
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from threading import Lock
 
+import numpy as np
+
+from .clock import SYSTEM_CLOCK, Clock
 from .models import PriceUpdate
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheSnapshot:
+    """Immutable state of a PriceCache at one version.
+
+    Writers never modify a published snapshot, so it can be read from any
+    thread without locking, and its prices always belong to its version.
+    """
+
+    version: int = 0
+    prices: Mapping[str, PriceUpdate] = field(default_factory=dict)  # Do not mutate
+    # Version of each ticker's latest update, oldest first (see changes_since)
+    stamps: Mapping[str, int] = field(default_factory=dict)  # Do not mutate
+
+    def get(self, ticker: str) -> PriceUpdate | None:
+        return self.prices.get(ticker)
+
+    def get_price(self, ticker: str) -> float | None:
+        update = self.prices.get(ticker)
+        return update.price if update else None
+
+    def get_version(self, ticker: str) -> int | None:
+        return self.stamps.get(ticker)
+
+    def updates(self) -> dict[str, PriceUpdate]:
+        """All prices as a new dict."""
+        return dict(self.prices)
+
+    def select(self, tickers: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """(prices, timestamps) arrays for tickers that are all present."""
+        updates = [self.prices[t] for t in tickers]
+        return (
+            np.fromiter((u.price for u in updates), float, len(updates)),
+            np.fromiter((u.timestamp for u in updates), float, len(updates)),
+        )
+
+    def changes_since(self, version: int) -> dict[str, PriceUpdate]:
+        """Latest prices of the tickers updated after `version`, oldest change first.
+
+        Takes time proportional to the number of changed tickers, not the
+        universe. Tickers removed since `version` are simply absent.
+        """
+        changed = []
+        for ticker, stamp in reversed(self.stamps.items()):
+            if stamp <= version:
+                break
+            changed.append(ticker)
+        return {ticker: self.prices[ticker] for ticker in reversed(changed)}
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.prices
+
+
+# Called with the snapshot a write published and the tickers it updated
+Listener = Callable[[CacheSnapshot, list[str]], None]
+
 
 class PriceCache:
     """Thread-safe in-memory cache of the latest price for each ticker.
 
     Writers: SimulatorDataSource or MassiveDataSource (one at a time).
     Readers: SSE streaming endpoint, portfolio valuation, trade execution.
+
+    Copy-on-write: each write builds a new CacheSnapshot and publishes it
+    with a single reference assignment, so readers never take a lock and
+    always see a consistent (version, prices) pair — use snapshot() to read
+    several things from the same version. Writers serialize on a lock and
+    pay one O(n) copy per write, which is why whole ticks should go through
+    update_many().
+
+    Updates without an explicit timestamp are stamped with `clock`.time().
+
+    Listeners (add_listener) are called after every published write with
+    the new snapshot and the tickers it updated, in version order, on the
+    writer's thread — they must be quick (history and bar aggregation).
+
+    Async consumers await wait_for_change() instead of polling `version`.
+    All waiters on one event loop share a single future, so a write costs
+    one call_soon_threadsafe() per loop with waiters, however many there
+    are, and nothing at all when no one is waiting.
     """
 
-    def __init__(self) -> None:
-        self._prices: dict[str, PriceUpdate] = {}
-        self._lock = Lock()
-        self._version: int = 0  # Monotonically increasing; bumped on every update
+    def __init__(self, clock: Clock = SYSTEM_CLOCK) -> None:
+        self._clock = clock
+        self._lock = Lock()  # Serializes writers only
+        self._state: CacheSnapshot = CacheSnapshot()
+        self._listeners: list[Listener] = []
+        # One pending future per event loop with waiters, resolved on the next write
+        self._waiters: dict[asyncio.AbstractEventLoop, asyncio.Future[None]] = {}
+        self._waiters_lock = Lock()
 
     def update(self, ticker: str, price: float, timestamp: float | None = None) -> PriceUpdate:
         """Record a new price for a ticker. Returns the created PriceUpdate.
@@ -27,49 +116,174 @@ class PriceCache:
         If this is the first update for the ticker, previous_price == price (direction='flat').
         """
         with self._lock:
-            ts = timestamp or time.time()
-            prev = self._prices.get(ticker)
-            previous_price = prev.price if prev else price
+            ts = timestamp or self._clock.time()
+            price = round(price, 2)
+            prev = self._state.prices.get(ticker)
 
             update = PriceUpdate(
                 ticker=ticker,
-                price=round(price, 2),
-                previous_price=round(previous_price, 2),
+                price=price,
+                previous_price=prev.price if prev else price,  # Rounded when stored
                 timestamp=ts,
             )
-            self._prices[ticker] = update
-            self._version += 1
+            self._publish({ticker: update})
             return update
 
+    def update_many(
+        self,
+        prices: dict[str, float],
+        timestamp: float | None = None,
+        timestamps: dict[str, float] | None = None,
+    ) -> None:
+        """Record a batch of prices under one lock acquisition and one version bump.
+
+        Readers see either none or all of the batch, so a whole simulator tick
+        or poll publishes as one version. Entries are stamped from
+        `timestamps` where given, else with one shared `timestamp` (now,
+        unless given).
+        """
+        if not prices:
+            return
+        per_ticker = timestamps or {}
+        with self._lock:
+            ts = timestamp or self._clock.time()
+            current = self._state.prices
+            updates = {}
+            for ticker, price in prices.items():
+                price = round(price, 2)
+                prev = current.get(ticker)
+                updates[ticker] = PriceUpdate(
+                    ticker=ticker,
+                    price=price,
+                    previous_price=prev.price if prev else price,
+                    timestamp=per_ticker.get(ticker, ts),
+                )
+            self._publish(updates)
+
+    def snapshot(self) -> CacheSnapshot:
+        """The current immutable state: a version with its prices. Lock-free."""
+        return self._state
+
     def get(self, ticker: str) -> PriceUpdate | None:
         """Get the latest price for a single ticker, or None if unknown."""
-        with self._lock:
-            return self._prices.get(ticker)
+        return self.snapshot().get(ticker)
 
     def get_all(self) -> dict[str, PriceUpdate]:
         """Snapshot of all current prices. Returns a shallow copy."""
-        with self._lock:
-            return dict(self._prices)
+        return self.snapshot().updates()
 
     def get_price(self, ticker: str) -> float | None:
         """Convenience: get just the price float, or None."""
-        update = self.get(ticker)
-        return update.price if update else None
+        return self.snapshot().get_price(ticker)
 
     def remove(self, ticker: str) -> None:
         """Remove a ticker from the cache (e.g., when removed from watchlist)."""
+        self.remove_many([ticker])
+
+    def remove_many(self, tickers: list[str]) -> None:
+        """Remove several tickers in one write."""
+        with self._lock:
+            state = self._state
+            if not any(ticker in state.prices for ticker in tickers):
+                return
+            prices, stamps = dict(state.prices), dict(state.stamps)
+            for ticker in tickers:
+                prices.pop(ticker, None)
+                stamps.pop(ticker, None)
+            self._state = CacheSnapshot(state.version, prices, stamps)
+
+    def changes_since(self, version: int) -> dict[str, PriceUpdate]:
+        """Latest prices of the tickers updated after `version` (see CacheSnapshot)."""
+        return self.snapshot().changes_since(version)
+
+    def get_version(self, ticker: str) -> int | None:
+        """Cache version of a ticker's latest update, or None if unknown."""
+        return self.snapshot().get_version(ticker)
+
+    async def wait_for_change(self, version: int, timeout: float | None = None) -> CacheSnapshot:
+        """Wait until the cache is past `version`, then return the current snapshot.
+
+        Returns immediately if it already is. After `timeout` seconds without
+        a write, returns the unchanged snapshot, so check its version. Writers
+        may publish from any thread; several writes before the waiter runs
+        coalesce into the one (latest) snapshot.
+        """
+        state = self.snapshot()
+        if state.version > version:
+            return state
+        loop = asyncio.get_running_loop()
+        with self._waiters_lock:
+            # Re-check under the lock. A write published after this point
+            # takes the same lock in _wake(), so it sees the future below
+            state = self._state
+            if state.version > version:
+                return state
+            future = self._waiters.get(loop)
+            if future is None:
+                future = self._waiters[loop] = loop.create_future()
+        try:
+            # Shielded: a waiter timing out or being cancelled must not cancel
+            # the future its siblings on this loop are waiting on
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError:
+            pass
+        return self.snapshot()
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call `listener(snapshot, tickers)` after each write (see class docstring)."""
         with self._lock:
-            self._prices.pop(ticker, None)
+            self._listeners = [*self._listeners, listener]
+
+    def remove_listener(self, listener: Listener) -> None:
+        with self._lock:
+            self._listeners = [f for f in self._listeners if f is not listener]
 
     @property
     def version(self) -> int:
         """Current version counter. Useful for SSE change detection."""
-        return self._version
+        return self.snapshot().version
 
     def __len__(self) -> int:
-        with self._lock:
-            return len(self._prices)
+        return len(self.snapshot())
 
     def __contains__(self, ticker: str) -> bool:
-        with self._lock:
-            return ticker in self._prices
+        return ticker in self.snapshot()
+
+    def _publish(self, updates: dict[str, PriceUpdate]) -> None:
+        """Publish a new snapshot with `updates` applied as one version (caller holds _lock)."""
+        state = self._state
+        version = state.version + 1
+        prices = dict(state.prices)
+        prices.update(updates)
+        stamps = dict(state.stamps)
+        for ticker in updates:
+            stamps.pop(ticker, None)  # Re-inserted at the newest end
+            stamps[ticker] = version
+        self._state = CacheSnapshot(version, prices, stamps)
+        self._notify(list(updates))
+
+    def _notify(self, tickers: list[str]) -> None:
+        """Hand a just-published write to the listeners and waiters (caller holds _lock)."""
+        for listener in self._listeners:
+            try:
+                listener(self._state, tickers)
+            except Exception:
+                logger.exception("Price cache listener failed")
+        self._wake()
+
+    def _wake(self) -> None:
+        """Resolve every loop's pending future, each on its own loop."""
+        with self._waiters_lock:
+            if not self._waiters:
+                return
+            waiters, self._waiters = self._waiters, {}
+        for loop, future in waiters.items():
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # The loop has closed; nothing is left to wake
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
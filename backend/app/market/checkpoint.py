@@ -0,0 +1,177 @@
+"""Warm-restart checkpoints of the price cache and simulator state."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .cache import PriceCache
+from .clock import SYSTEM_CLOCK, Clock
+from .interface import MarketDataSource
+from .scheduler import TickScheduler
+from .simulator import SimulatorDataSource
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_INTERVAL = 30.0  # Seconds between periodic saves
+
+_SIM_PREFIX = "sim_"  # Simulator arrays are stored under this prefix
+
+
+@dataclass(frozen=True, slots=True)
+class Checkpoint:
+    """The contents of a checkpoint file."""
+
+    tickers: list[str]
+    prices: np.ndarray
+    timestamps: np.ndarray
+    simulator: dict[str, np.ndarray] | None  # GBMSimulator.checkpoint(), if one was saved
+
+    def restore_cache(self, cache: PriceCache) -> None:
+        """Write the saved prices into `cache` as one version, at their saved timestamps."""
+        cache.update_many(
+            dict(zip(self.tickers, self.prices.tolist())),
+            timestamps=dict(zip(self.tickers, self.timestamps.tolist())),
+        )
+
+
+def save_checkpoint(
+    path: str | os.PathLike,
+    cache: PriceCache,
+    simulator: dict[str, np.ndarray] | None = None,
+) -> None:
+    """Write the cache's current prices (and simulator state) to `path` atomically.
+
+    The file is an uncompressed .npz of plain arrays, written to a temporary
+    file and renamed into place, so a crash mid-save leaves the previous
+    checkpoint intact.
+    """
+    path = Path(path)
+    snapshot = cache.snapshot()
+    tickers = list(snapshot.updates())
+    prices, timestamps = snapshot.select(tickers)
+    arrays = {"tickers": np.array(tickers, dtype=str), "prices": prices, "timestamps": timestamps}
+    for key, value in (simulator or {}).items():
+        arrays[_SIM_PREFIX + key] = value
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_checkpoint(path: str | os.PathLike) -> Checkpoint | None:
+    """Read a checkpoint, or None if the file is missing or unreadable."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+        return None
+    simulator = {
+        key.removeprefix(_SIM_PREFIX): value
+        for key, value in arrays.items()
+        if key.startswith(_SIM_PREFIX)
+    }
+    return Checkpoint(
+        tickers=[str(t) for t in arrays["tickers"]],
+        prices=arrays["prices"],
+        timestamps=arrays["timestamps"],
+        simulator=simulator or None,
+    )
+
+
+class Checkpointer:
+    """Periodically checkpoints a PriceCache (and simulator) to one file for warm restarts.
+
+    At boot, restore() loads the last checkpoint into the cache, so the app
+    serves last-known prices immediately, and hands the simulator state to
+    a SimulatorDataSource so prices continue from where they were instead
+    of jumping back to their seeds. A MassiveDataSource started on a
+    restored cache refreshes it in the background instead of blocking.
+
+    Lifecycle:
+        checkpointer = Checkpointer(path, cache, source)
+        checkpointer.restore()             # Before source.start()
+        await source.start(tickers)
+        await checkpointer.start()         # Saves every `interval` seconds
+        ...
+        await checkpointer.stop()          # Final save
+        await source.stop()
+
+    Saves run in a thread and are skipped while the cache is unchanged.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        price_cache: PriceCache,
+        source: MarketDataSource | None = None,
+        interval: float = CHECKPOINT_INTERVAL,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        self._path = Path(path)
+        self._cache = price_cache
+        self._source = source
+        self._interval = interval
+        self._clock = clock
+        self._saved_version: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def restore(self) -> bool:
+        """Load the last checkpoint, if any. Returns whether one was restored."""
+        checkpoint = load_checkpoint(self._path)
+        if checkpoint is None:
+            return False
+        checkpoint.restore_cache(self._cache)
+        if checkpoint.simulator is not None and isinstance(self._source, SimulatorDataSource):
+            self._source.restore(checkpoint.simulator)
+        logger.info("Restored %d prices from %s", len(checkpoint.tickers), self._path)
+        return True
+
+    def save(self) -> None:
+        """Checkpoint now, unless nothing changed since the last save."""
+        version = self._cache.version
+        if version == self._saved_version:
+            return
+        simulator = None
+        if isinstance(self._source, SimulatorDataSource):
+            simulator = self._source.checkpoint_state()
+        save_checkpoint(self._path, self._cache, simulator)
+        self._saved_version = version
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="market-checkpoint")
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await asyncio.to_thread(self._save_logged)
+
+    async def _run(self) -> None:
+        scheduler = TickScheduler(self._interval, start_immediately=False, clock=self._clock)
+        async for _ in scheduler:
+            await asyncio.to_thread(self._save_logged)
+
+    def _save_logged(self) -> None:
+        try:
+            self.save()
+        except Exception:
+            logger.exception("Checkpoint to %s failed", self._path)
@@ -0,0 +1,176 @@
+"""Injectable clocks: the system clock and an accelerated virtual clock."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """Source of time for schedulers, data sources and the price cache.
+
+    time() gives wall-clock timestamps (Unix seconds) for price updates;
+    monotonic() drives tick deadlines. sleep() and wait() block until a
+    span of *this clock's* time has passed, however fast it runs.
+    """
+
+    @abstractmethod
+    def time(self) -> float:
+        """Current wall-clock time in Unix seconds."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Monotonic time in seconds, for measuring intervals."""
+
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None:
+        """Sleep for `seconds` of clock time."""
+
+    @abstractmethod
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        """Block a thread for `seconds` of clock time or until `event` is set.
+
+        Returns True if the event was set (like threading.Event.wait).
+        """
+
+
+class SystemClock(Clock):
+    """The real clock."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        return event.wait(seconds)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+# Unscaled VirtualClock: event-loop iterations without any sleeper arriving
+# or leaving before the earliest sleeper may jump the clock to its deadline
+QUIET_ROUNDS = 3
+
+
+class VirtualClock(Clock):
+    """Simulated time, either scaled or as fast as possible.
+
+    With `speed` set, clock time runs `speed` times faster than real time
+    (speed=100 turns a 0.5s tick into a 5ms wait). With speed=None, sleeping
+    never waits for real time: sleepers wake in deadline order, and the
+    clock jumps to each deadline as its sleeper wakes, so a producer ticking
+    every 0.5s and a consumer sleeping 60s interleave exactly as they would
+    on the wall clock, only without the waiting. The clock only jumps once
+    the sleepers have been quiet for QUIET_ROUNDS loop iterations, i.e. once
+    every task still runnable on the loop has had the chance to go to sleep.
+    Work running in other threads is not waited for.
+
+    advance() moves the clock forward by hand (useful in tests). time() is
+    `epoch` (default: the real time at construction) plus elapsed clock time.
+    """
+
+    def __init__(self, speed: float | None = None, epoch: float | None = None) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self._speed = speed
+        self._epoch = time.time() if epoch is None else epoch
+        self._real_origin = time.monotonic()
+        self._offset = 0.0  # Clock time added by advance() and, unscaled, by sleeps
+        self._lock = threading.Lock()
+
+        # As-fast-as-possible mode: pending wake-ups as (deadline, seq)
+        self._sleepers: list[tuple[float, int]] = []
+        self._seq = itertools.count()
+        self._generation = 0  # Bumped whenever a sleeper arrives or leaves
+
+    @property
+    def speed(self) -> float | None:
+        return self._speed
+
+    def time(self) -> float:
+        return self._epoch + self.monotonic()
+
+    def monotonic(self) -> float:
+        if self._speed is None:
+            return self._offset
+        return self._offset + (time.monotonic() - self._real_origin) * self._speed
+
+    def advance(self, seconds: float) -> None:
+        """Move clock time forward by `seconds`."""
+        if seconds < 0:
+            raise ValueError("Cannot move a clock backwards")
+        with self._lock:
+            self._offset += seconds
+
+    async def sleep(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        if self._speed is not None:
+            await asyncio.sleep(seconds / self._speed)
+            return
+        entry = self._enqueue(seconds)
+        try:
+            seen, quiet = -1, 0
+            while True:
+                await asyncio.sleep(0)  # Always yield, so peers can run and register
+                seen, quiet = self._quiet_rounds(seen, quiet)
+                if quiet >= QUIET_ROUNDS and self._try_wake(entry):
+                    return
+        finally:
+            self._dequeue(entry)
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        seconds = max(seconds, 0.0)
+        if self._speed is not None:
+            return event.wait(seconds / self._speed)
+        entry = self._enqueue(seconds)
+        try:
+            seen, quiet = -1, 0
+            while True:
+                if event.wait(0.0001):
+                    return True
+                seen, quiet = self._quiet_rounds(seen, quiet)
+                if quiet >= QUIET_ROUNDS and self._try_wake(entry):
+                    return event.is_set()
+        finally:
+            self._dequeue(entry)
+
+    # --- Internals ---
+
+    def _quiet_rounds(self, seen: int, quiet: int) -> tuple[int, int]:
+        """Count consecutive polls during which no sleeper arrived or left."""
+        generation = self._generation
+        return (generation, quiet + 1) if generation == seen else (generation, 0)
+
+    def _enqueue(self, seconds: float) -> tuple[float, int]:
+        with self._lock:
+            entry = (self._offset + seconds, next(self._seq))
+            heapq.heappush(self._sleepers, entry)
+            self._generation += 1
+            return entry
+
+    def _try_wake(self, entry: tuple[float, int]) -> bool:
+        """Wake `entry` if it is the earliest sleeper, moving the clock to its deadline."""
+        with self._lock:
+            if self._sleepers[0] != entry:
+                return False
+            heapq.heappop(self._sleepers)
+            self._offset = max(self._offset, entry[0])
+            self._generation += 1
+            return True
+
+    def _dequeue(self, entry: tuple[float, int]) -> None:
+        """Drop an entry that never woke (cancelled sleep, stopped wait)."""
+        with self._lock:
+            if entry in self._sleepers:
+                self._sleepers.remove(entry)
+                heapq.heapify(self._sleepers)
+                self._generation += 1
@@ -0,0 +1,261 @@
+"""Struct-of-arrays PriceCache with zero-copy read-only snapshots."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from .cache import PriceCache
+from .clock import SYSTEM_CLOCK, Clock
+from .models import PriceUpdate
+
+# Batches remembered for changes_since(); older queries scan the stamp column
+CHANGE_LOG = 64
+
+
+@dataclass(frozen=True, slots=True)
+class PriceSnapshot:
+    """Read-only view of a ColumnarPriceCache at one version.
+
+    Row i of each array belongs to tickers[i]. The arrays are never written
+    again once published, so a snapshot stays consistent however long it is
+    held, without copying or locking. Offers the same read API as
+    CacheSnapshot.
+    """
+
+    version: int
+    tickers: tuple[str, ...]
+    index: dict[str, int]  # ticker -> row; do not mutate
+    price: np.ndarray
+    previous_price: np.ndarray
+    timestamp: np.ndarray
+    stamp: np.ndarray  # Cache version of each row's latest update
+    log: tuple[tuple[int, list[str]], ...] = ()  # Recent (version, tickers) batches
+
+    def get(self, ticker: str) -> PriceUpdate | None:
+        """Materialize one ticker's PriceUpdate, or None if absent."""
+        i = self.index.get(ticker)
+        return None if i is None else self._update(i)
+
+    def get_price(self, ticker: str) -> float | None:
+        i = self.index.get(ticker)
+        return None if i is None else float(self.price[i])
+
+    def get_version(self, ticker: str) -> int | None:
+        i = self.index.get(ticker)
+        return None if i is None else int(self.stamp[i])
+
+    def select(self, tickers: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """(prices, timestamps) arrays for tickers that are all present."""
+        rows = np.fromiter((self.index[t] for t in tickers), np.intp, len(tickers))
+        return self.price[rows], self.timestamp[rows]
+
+    def updates(self) -> dict[str, PriceUpdate]:
+        """Materialize every row, like PriceCache.get_all()."""
+        return {ticker: self._update(i) for i, ticker in enumerate(self.tickers)}
+
+    def changes_since(self, version: int) -> dict[str, PriceUpdate]:
+        """Materialize only the rows updated after `version`, oldest change first.
+
+        Answered from the batch log in time proportional to the changes while
+        it reaches back far enough, else by one scan of the stamp column.
+        """
+        if version >= self.version:
+            return {}
+        if self.log and self.log[0][0] <= version + 1:
+            # Every batch after `version` is still logged
+            changed: dict[str, None] = {}
+            for logged, tickers in reversed(self.log):
+                if logged <= version:
+                    break
+                changed.update(dict.fromkeys(tickers))
+            rows = [self.index[t] for t in changed if t in self.index]
+            rows.sort(key=lambda i: self.stamp[i])
+        else:
+            rows = np.flatnonzero(self.stamp > version)
+            rows = rows[np.argsort(self.stamp[rows], kind="stable")].tolist()
+        return {self.tickers[i]: self._update(i) for i in rows}
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.index
+
+    def _update(self, i: int) -> PriceUpdate:
+        return PriceUpdate(
+            ticker=self.tickers[i],
+            price=float(self.price[i]),
+            previous_price=float(self.previous_price[i]),
+            timestamp=float(self.timestamp[i]),
+        )
+
+
+class ColumnarPriceCache(PriceCache):
+    """PriceCache that stores prices as NumPy columns instead of PriceUpdate objects.
+
+    Prices, previous prices and timestamps live in preallocated float64
+    arrays with a ticker -> row table, so a tick is a few vectorized writes
+    with no per-ticker allocation. Each write publishes a PriceSnapshot of
+    read-only views over those arrays, which readers use lock-free exactly
+    like PriceCache's snapshots; the next write copies the columns (one
+    memcpy each) before modifying them, and the ticker table only when
+    tickers come or go. PriceUpdate objects are materialized only on demand
+    by get()/get_all(). Removal moves the last row into the freed one, so
+    rows are always dense.
+
+    Each row also carries the version of its latest update. changes_since()
+    answers from a log of the last CHANGE_LOG batches in time proportional
+    to the changes, and falls back to one vectorized scan of the stamp
+    column for older versions.
+    """
+
+    PRICE_DTYPE = np.float64  # Storage type of the price columns
+
+    def __init__(self, clock: Clock = SYSTEM_CLOCK, capacity: int = 64) -> None:
+        super().__init__(clock)
+        self._tickers: list[str] = []
+        self._index: dict[str, int] = {}
+        self._price = np.zeros(capacity, dtype=self.PRICE_DTYPE)
+        self._previous = np.zeros(capacity, dtype=self.PRICE_DTYPE)
+        self._timestamp = np.empty(capacity)
+        self._stamp = np.empty(capacity, dtype=np.int64)
+        self._log: deque[tuple[int, list[str]]] = deque(maxlen=CHANGE_LOG)
+        # Set while the published snapshot references the working arrays /
+        # ticker table: the writer copies them before its next change
+        self._arrays_shared = False
+        self._table_shared = False
+        self._published_tickers: tuple[str, ...] = ()
+        self._publish_columns()
+
+    def update(self, ticker: str, price: float, timestamp: float | None = None) -> PriceUpdate:
+        with self._lock:
+            prices = self._quantize(np.array([price]))
+            self._write([ticker], prices, timestamp or self._clock.time())
+            return self._state.get(ticker)
+
+    def update_many(
+        self,
+        prices: dict[str, float],
+        timestamp: float | None = None,
+        timestamps: dict[str, float] | None = None,
+    ) -> None:
+        if not prices:
+            return
+        tickers = list(prices)
+        with self._lock:
+            values = self._quantize(np.fromiter(prices.values(), float, len(tickers)))
+            self._write(tickers, values, self._stamps(tickers, timestamp, timestamps))
+
+    def get_all(self) -> dict[str, PriceUpdate]:
+        """All current prices, materialized. snapshot() avoids the allocation."""
+        return self._state.updates()
+
+    def snapshot(self) -> PriceSnapshot:
+        """The current read-only columns and their version. Lock-free."""
+        return self._state
+
+    def remove_many(self, tickers: list[str]) -> None:
+        with self._lock:
+            gone = [t for t in dict.fromkeys(tickers) if t in self._index]
+            if not gone:
+                return
+            self._own(table=True)
+            for ticker in gone:
+                self._remove_row(ticker)
+            self._publish_columns()
+
+    # --- Internals (caller holds _lock) ---
+
+    def _quantize(self, prices: np.ndarray) -> np.ndarray:
+        """Round incoming prices to the stored representation."""
+        return np.round(prices, 2)
+
+    def _stamps(
+        self, tickers: list[str], timestamp: float | None, timestamps: dict[str, float] | None
+    ) -> float | np.ndarray:
+        """One shared timestamp (now, unless given), or per-ticker ones where given."""
+        ts = timestamp or self._clock.time()
+        if timestamps:
+            return np.array([timestamps.get(t, ts) for t in tickers])
+        return ts
+
+    def _write(
+        self, tickers: list[str], prices: np.ndarray, timestamps: float | np.ndarray
+    ) -> None:
+        """Store a batch of already quantized prices and publish it as one version."""
+        new = [t for t in dict.fromkeys(tickers) if t not in self._index]
+        self._own(table=bool(new), extra=len(new))
+        first_new = len(self._tickers)
+        for ticker in new:
+            self._index[ticker] = len(self._tickers)
+            self._tickers.append(ticker)
+        rows = np.fromiter((self._index[t] for t in tickers), np.intp, len(tickers))
+
+        # New rows have no previous price: they start flat
+        self._previous[rows] = np.where(rows >= first_new, prices, self._price[rows])
+        self._price[rows] = prices
+        self._timestamp[rows] = timestamps
+        version = self._state.version + 1
+        self._stamp[rows] = version
+        self._log.append((version, tickers))
+        self._publish_columns(version)
+        self._notify(tickers)
+
+    def _own(self, table: bool, extra: int = 0) -> None:
+        """Make the arrays (and with `table`, the ticker table) safe to modify.
+
+        Copies whatever the published snapshot references, and grows the
+        arrays to fit `extra` more rows.
+        """
+        n = len(self._tickers)
+        capacity = len(self._price)
+        if self._arrays_shared or n + extra > capacity:
+            if n + extra > capacity:
+                capacity = max(2 * capacity, n + extra)
+            for name in ("_price", "_previous", "_timestamp", "_stamp"):
+                old = getattr(self, name)
+                column = np.empty(capacity, dtype=old.dtype)
+                column[:n] = old[:n]
+                setattr(self, name, column)
+            self._arrays_shared = False
+        if table and self._table_shared:
+            self._tickers = list(self._tickers)
+            self._index = dict(self._index)
+            self._table_shared = False
+
+    def _publish_columns(self, version: int | None = None) -> None:
+        """Publish the working arrays as the new snapshot (same version by default)."""
+        n = len(self._tickers)
+        if not self._table_shared:
+            self._published_tickers = tuple(self._tickers)
+        columns = []
+        for column in (self._price, self._previous, self._timestamp, self._stamp):
+            view = column[:n]
+            view.flags.writeable = False
+            columns.append(view)
+        self._state = self._snapshot(
+            self._state.version if version is None else version,
+            self._published_tickers,
+            self._index,
+            *columns,
+            log=tuple(self._log),
+        )
+        self._arrays_shared = self._table_shared = True
+
+    def _snapshot(self, *fields, log: tuple) -> PriceSnapshot:
+        return PriceSnapshot(*fields, log=log)
+
+    def _remove_row(self, ticker: str) -> None:
+        """Drop a ticker's row, moving the last row into its place."""
+        row = self._index.pop(ticker)
+        last = len(self._tickers) - 1
+        if row != last:
+            moved = self._tickers[last]
+            self._tickers[row] = moved
+            self._index[moved] = row
+            for column in (self._price, self._previous, self._timestamp, self._stamp):
+                column[row] = column[last]
+        self._tickers.pop()
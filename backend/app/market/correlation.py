@@ -0,0 +1,405 @@
+"""Correlation structure and Cholesky factor maintenance for the simulator."""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import logging
+import math
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .seed_prices import (
+    CORRELATION_GROUPS,
+    CROSS_GROUP_CORR,
+    INTRA_FINANCE_CORR,
+    INTRA_TECH_CORR,
+    TSLA_CORR,
+)
+
+logger = logging.getLogger(__name__)
+
+# Intra-group correlation for each entry in CORRELATION_GROUPS
+INTRA_GROUP_CORR: dict[str, float] = {
+    "tech": INTRA_TECH_CORR,
+    "finance": INTRA_FINANCE_CORR,
+}
+
+# Tickers that sit in a group but correlate with everything at TSLA_CORR
+INDEPENDENT_TICKERS: frozenset[str] = frozenset({"TSLA"})
+
+# Group codes: 0 = ungrouped, 1..g = CORRELATION_GROUPS in order, g+1 = independent
+_GROUP_NAMES = list(CORRELATION_GROUPS)
+_INDEPENDENT_CODE = len(_GROUP_NAMES) + 1
+
+
+def _build_code_table() -> np.ndarray:
+    """Correlation between two distinct tickers, indexed by their group codes."""
+    size = _INDEPENDENT_CODE + 1
+    table = np.full((size, size), CROSS_GROUP_CORR)
+    for code, name in enumerate(_GROUP_NAMES, start=1):
+        table[code, code] = INTRA_GROUP_CORR[name]
+    table[_INDEPENDENT_CODE, :] = TSLA_CORR
+    table[:, _INDEPENDENT_CODE] = TSLA_CORR
+    return table
+
+
+_CODE_TABLE = _build_code_table()
+
+# Sector factor model: one market factor plus one factor per correlation group.
+FACTOR_NAMES: tuple[str, ...] = ("market", *_GROUP_NAMES)
+
+
+def _build_loading_table() -> np.ndarray:
+    """Factor loadings indexed by group code, shape (codes, factors).
+
+    Every ticker loads sqrt(CROSS_GROUP_CORR) on the market factor, and group
+    members add sqrt(intra - cross) on their group's factor, so two tickers
+    share exactly the pairwise correlation in _CODE_TABLE. Independent tickers
+    load only on the market factor, scaled to give TSLA_CORR against everyone.
+    """
+    market = math.sqrt(CROSS_GROUP_CORR)
+    table = np.zeros((_INDEPENDENT_CODE + 1, len(FACTOR_NAMES)))
+    table[:, 0] = market
+    for code, name in enumerate(_GROUP_NAMES, start=1):
+        table[code, code] = math.sqrt(INTRA_GROUP_CORR[name] - CROSS_GROUP_CORR)
+    table[_INDEPENDENT_CODE, 0] = TSLA_CORR / market
+    return table
+
+
+_LOADING_TABLE = _build_loading_table()
+
+# Largest tolerated |row norm^2 - 1| of a correlation Cholesky factor before
+# an incrementally maintained factor is considered to have drifted.
+STABILITY_TOLERANCE = 1e-8
+
+
+def group_codes(tickers: list[str]) -> np.ndarray:
+    """Map each ticker to its correlation group code."""
+    codes = np.zeros(len(tickers), dtype=np.intp)
+    for i, ticker in enumerate(tickers):
+        if ticker in INDEPENDENT_TICKERS:
+            codes[i] = _INDEPENDENT_CODE
+            continue
+        for code, name in enumerate(_GROUP_NAMES, start=1):
+            if ticker in CORRELATION_GROUPS[name]:
+                codes[i] = code
+                break
+    return codes
+
+
+def sector_correlation(rows: list[str], cols: list[str]) -> np.ndarray:
+    """Pairwise sector correlations between two ticker lists, shape (len(rows), len(cols)).
+
+    Entries are for distinct tickers; a ticker paired with itself is not
+    special-cased here (see sector_correlation_matrix for the unit diagonal).
+    """
+    return _CODE_TABLE[group_codes(rows)[:, None], group_codes(cols)[None, :]]
+
+
+def sector_correlation_matrix(tickers: list[str]) -> np.ndarray:
+    """Full sector correlation matrix for a ticker list, with a unit diagonal."""
+    corr = sector_correlation(tickers, tickers)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def sector_factor_loadings(tickers: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Factor-model equivalent of sector_correlation_matrix.
+
+    Returns (loadings, idiosyncratic) with shapes (n, k) and (n,) such that
+    loadings @ loadings.T + diag(idiosyncratic**2) equals the sector
+    correlation matrix. Correlated draws then cost O(n*k) instead of O(n^2):
+
+        z = loadings @ factor_draws + idiosyncratic * independent_draws
+    """
+    loadings = _LOADING_TABLE[group_codes(tickers)]
+    idiosyncratic = np.sqrt(1.0 - np.einsum("ij,ij->i", loadings, loadings))
+    return loadings, idiosyncratic
+
+
+def solve_lower(lower: np.ndarray, b: np.ndarray, block: int = 64) -> np.ndarray:
+    """Solve lower @ x = b for lower-triangular `lower` by blocked forward substitution.
+
+    `b` may be a vector or a matrix of right-hand sides. Each block is one
+    small dense solve plus one GEMM against the rows already solved.
+    """
+    x = np.array(b, dtype=float, copy=True)
+    n = lower.shape[0]
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        if start:
+            x[start:stop] -= lower[start:stop, :start] @ x[:start]
+        x[start:stop] = np.linalg.solve(lower[start:stop, start:stop], x[start:stop])
+    return x
+
+
+def cholesky_append(lower: np.ndarray, cross: np.ndarray, block: np.ndarray) -> np.ndarray:
+    """Extend a Cholesky factor with rows for m new variables appended at the end.
+
+    Args:
+        lower: (n, n) factor of the existing correlation matrix.
+        cross: (m, n) correlations of the new variables with the existing ones.
+        block: (m, m) correlations among the new variables.
+
+    Raises np.linalg.LinAlgError if the extended matrix is not positive definite.
+    Cost is O(n^2 m) instead of the O((n+m)^3) of a fresh factorization.
+    """
+    n = lower.shape[0]
+    m = block.shape[0]
+    y = solve_lower(lower, cross.T)  # (n, m)
+    schur = block - y.T @ y
+    out = np.zeros((n + m, n + m))
+    out[:n, :n] = lower
+    out[n:, :n] = y.T
+    out[n:, n:] = np.linalg.cholesky(schur)
+    return out
+
+
+def cholesky_delete(lower: np.ndarray, k: int) -> np.ndarray:
+    """Cholesky factor of the matrix with variable k removed.
+
+    Dropping row/column k leaves the trailing block needing a rank-one update
+    with the removed column below the diagonal. Cost is O((n-k)^2).
+    """
+    n = lower.shape[0]
+    keep = np.r_[0:k, k + 1 : n]
+    out = lower[np.ix_(keep, keep)]
+    x = lower[k + 1 :, k].copy()
+    trailing = out[k:, k:]  # view into out
+    for j in range(x.size):
+        ljj = trailing[j, j]
+        r = math.hypot(ljj, x[j])
+        c = r / ljj
+        s = x[j] / ljj
+        trailing[j, j] = r
+        if j + 1 < x.size:
+            trailing[j + 1 :, j] = (trailing[j + 1 :, j] + s * x[j + 1 :]) / c
+            x[j + 1 :] = c * x[j + 1 :] - s * trailing[j + 1 :, j]
+    return out
+
+
+def is_stable_factor(lower: np.ndarray, start: int = 0) -> bool:
+    """Check that rows start: of `lower` still form a usable correlation factor.
+
+    Every row of a correlation Cholesky factor has unit norm, so drift in the
+    row norms (or a non-positive diagonal) flags accumulated rounding error.
+    Incremental updates only touch trailing rows, so only those are checked.
+    """
+    rows = lower[start:]
+    if rows.size == 0:
+        return True
+    diag = np.diagonal(lower)[start:]
+    if not np.all(np.isfinite(rows)) or diag.min() <= 0:
+        return False
+    row_norms = np.einsum("ij,ij->i", rows, rows)
+    return bool(np.abs(row_norms - 1.0).max() <= STABILITY_TOLERANCE)
+
+
+# --- Empirical correlation ---
+
+
+def nearest_correlation(matrix: np.ndarray, min_eigenvalue: float = 1e-8) -> np.ndarray:
+    """Repair a symmetric matrix into the nearest positive-definite correlation matrix.
+
+    Clips eigenvalues at `min_eigenvalue` (the spectral projection onto the
+    PD cone) and rescales to a unit diagonal. Estimated correlation matrices
+    with missing data or more tickers than observations are often slightly
+    indefinite; this keeps them usable for a Cholesky factorization.
+    """
+    sym = (matrix + matrix.T) / 2
+    values, vectors = np.linalg.eigh(sym)
+    if values.min() >= min_eigenvalue:
+        repaired = sym
+    else:
+        repaired = (vectors * np.maximum(values, min_eigenvalue)) @ vectors.T
+    scale = 1.0 / np.sqrt(np.diagonal(repaired))
+    repaired = repaired * scale[:, None] * scale[None, :]
+    np.fill_diagonal(repaired, 1.0)
+    return repaired
+
+
+def _read_matrix(path: Path) -> tuple[list[str], np.ndarray]:
+    """Read (tickers, square matrix) from .npz or .csv."""
+    if path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as data:
+            key = "correlation" if "correlation" in data else "covariance"
+            return [str(t) for t in data["tickers"]], np.asarray(data[key], dtype=float)
+    if path.suffix == ".csv":
+        with path.open(newline="") as f:
+            rows = [row for row in csv.reader(f) if row]
+        header = [cell.strip() for cell in rows[0]]
+        labelled = len(header) == len(rows) and len(rows[1]) == len(header)
+        tickers = header[1:] if labelled else header
+        body = [row[1:] if labelled else row for row in rows[1:]]
+        return tickers, np.array(body, dtype=float)
+    raise ValueError(f"Unsupported correlation file type {path.suffix!r}; use .npz or .csv")
+
+
+class EmpiricalCorrelation:
+    """Correlation matrix loaded from data, with sector fallback for other tickers.
+
+    Pairs of tickers that are both in the matrix use the empirical value;
+    any pair involving a ticker outside it falls back to sector_correlation.
+    Blending the two can leave a matrix that is not positive definite, so
+    full matrices should go through nearest_correlation before factorizing
+    (GBMSimulator does this when a factorization fails).
+    """
+
+    def __init__(self, tickers: list[str], matrix: np.ndarray) -> None:
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.shape != (len(tickers), len(tickers)):
+            raise ValueError(f"Matrix shape {matrix.shape} does not match {len(tickers)} tickers")
+        diag = np.diagonal(matrix)
+        if np.any(diag <= 0):
+            raise ValueError("Matrix diagonal must be positive")
+        if not np.allclose(diag, 1.0):
+            # A covariance matrix: normalize to correlations
+            scale = 1.0 / np.sqrt(diag)
+            matrix = matrix * scale[:, None] * scale[None, :]
+        self._tickers = list(tickers)
+        self._index = {t: i for i, t in enumerate(self._tickers)}
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\n".join(self._tickers).encode())
+        digest.update(np.ascontiguousarray(matrix).tobytes())
+        self._fingerprint = digest.hexdigest()
+
+        matrix = (matrix + matrix.T) / 2
+        try:
+            np.linalg.cholesky(matrix)  # Valid estimates factorize: no repair needed
+        except np.linalg.LinAlgError:
+            logger.info("Correlation matrix is not positive definite; repairing")
+            matrix = nearest_correlation(matrix)
+        self._matrix = matrix
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike) -> EmpiricalCorrelation:
+        """Load a correlation or covariance matrix.
+
+        Supported formats:
+            .npz - arrays "tickers" plus "correlation" or "covariance"
+            .csv - a header row of tickers, then one matrix row per ticker
+                   (an optional leading label column is ignored)
+        """
+        tickers, matrix = _read_matrix(Path(path))
+        logger.info("Loaded %d-ticker correlation matrix from %s", len(tickers), path)
+        return cls(tickers, matrix)
+
+    @property
+    def tickers(self) -> list[str]:
+        return list(self._tickers)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the loaded matrix and its tickers (before any repair)."""
+        return self._fingerprint
+
+    def correlation(self, rows: list[str], cols: list[str]) -> np.ndarray:
+        """Pairwise correlations between two ticker lists, shape (len(rows), len(cols))."""
+        out = sector_correlation(rows, cols)
+        r = np.array([self._index.get(t, -1) for t in rows], dtype=np.intp)
+        c = np.array([self._index.get(t, -1) for t in cols], dtype=np.intp)
+        ri, ci = np.flatnonzero(r >= 0), np.flatnonzero(c >= 0)
+        out[np.ix_(ri, ci)] = self._matrix[np.ix_(r[ri], c[ci])]
+        return out
+
+    def matrix(self, tickers: list[str]) -> np.ndarray:
+        """Full correlation matrix for a ticker list, with a unit diagonal."""
+        corr = self.correlation(tickers, tickers)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+
+# --- Factorization cache ---
+
+
+class FactorCache:
+    """On-disk cache of Cholesky factors, keyed by ticker list and correlation source.
+
+    Factors are stored as .npy files named by a hash of the ordered ticker
+    list plus the source's fingerprint, so a restart (or a watchlist seen
+    before) loads its factor instead of refactorizing. Writes go to a
+    temporary file first and are renamed into place, so a crash never
+    leaves a truncated entry.
+
+    The cache is a bounded LRU: loads touch an entry's mtime, and each store
+    evicts the least recently used entries beyond `max_entries` or
+    `max_bytes` (a 5,000-ticker factor alone is ~200 MB).
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_entries: int = 8,
+        max_bytes: int = 1 << 30,
+    ) -> None:
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+    @staticmethod
+    def key(tickers: list[str], source: str) -> str:
+        """Cache key for an ordered ticker list under a correlation source."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(source.encode())
+        digest.update(b"\0")
+        digest.update("\n".join(tickers).encode())
+        return digest.hexdigest()
+
+    def load(self, key: str, n: int) -> np.ndarray | None:
+        """Cached (n, n) factor for `key`, or None if absent or unreadable."""
+        path = self._dir / f"{key}.npy"
+        try:
+            lower = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if lower.shape != (n, n):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return lower
+
+    def store(self, key: str, lower: np.ndarray) -> None:
+        """Persist a factor atomically, then evict. Failures are logged, not raised."""
+        if lower.nbytes > self._max_bytes:
+            logger.debug("Factor %s exceeds the cache size limit; not stored", key)
+            return
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, lower, allow_pickle=False)
+            os.replace(tmp, self._dir / f"{key}.npy")
+        except OSError as e:
+            logger.warning("Could not write factor cache entry %s: %s", key, e)
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both limits hold."""
+        entries = []
+        for path in self._dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort(reverse=True)  # Most recently used first
+        total = 0
+        for count, (_, size, path) in enumerate(entries, start=1):
+            total += size
+            if count > self._max_entries or total > self._max_bytes:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.warning("Could not evict factor cache entry %s: %s", path.name, e)
@@ -6,6 +6,8 @@ import logging
 import os
 
 from .cache import PriceCache
+from .checkpoint import Checkpointer
+from .clock import SYSTEM_CLOCK, Clock
 from .interface import MarketDataSource
 from .massive_client import MassiveDataSource
 from .simulator import SimulatorDataSource
@@ -13,19 +15,50 @@ from .simulator import SimulatorDataSource
 logger = logging.getLogger(__name__)
 
 
-def create_market_data_source(price_cache: PriceCache) -> MarketDataSource:
+def create_market_data_source(
+    price_cache: PriceCache, seed: int | None = None, clock: Clock = SYSTEM_CLOCK
+) -> MarketDataSource:
     """Create the appropriate market data source based on environment variables.
 
     - MASSIVE_API_KEY set and non-empty → MassiveDataSource (real market data)
     - Otherwise → SimulatorDataSource (GBM simulation)
 
+    `seed` (or the SIMULATOR_SEED environment variable) makes the simulator
+    replay identical price paths; it is ignored for real market data.
+    SIMULATOR_CORRELATION_FILE points the simulator at an empirical
+    correlation matrix, and SIMULATOR_FACTOR_CACHE at a directory for cached
+    factorizations. `clock` paces either source (see clock.py).
+
     Returns an unstarted source. Caller must await source.start(tickers).
     """
     api_key = os.environ.get("MASSIVE_API_KEY", "").strip()
 
     if api_key:
         logger.info("Market data source: Massive API (real data)")
-        return MassiveDataSource(api_key=api_key, price_cache=price_cache)
+        return MassiveDataSource(api_key=api_key, price_cache=price_cache, clock=clock)
     else:
+        if seed is None and os.environ.get("SIMULATOR_SEED", "").strip():
+            seed = int(os.environ["SIMULATOR_SEED"])
         logger.info("Market data source: GBM Simulator")
-        return SimulatorDataSource(price_cache=price_cache)
+        return SimulatorDataSource(
+            price_cache=price_cache,
+            seed=seed,
+            correlation_file=os.environ.get("SIMULATOR_CORRELATION_FILE", "").strip() or None,
+            factor_cache_dir=os.environ.get("SIMULATOR_FACTOR_CACHE", "").strip() or None,
+            clock=clock,
+        )
+
+
+def create_checkpointer(
+    price_cache: PriceCache, source: MarketDataSource, clock: Clock = SYSTEM_CLOCK
+) -> Checkpointer | None:
+    """Create a warm-restart Checkpointer if MARKET_CHECKPOINT_FILE is set, else None.
+
+    Caller calls restore() before source.start(), then awaits start() and,
+    at shutdown, stop() (see Checkpointer).
+    """
+    path = os.environ.get("MARKET_CHECKPOINT_FILE", "").strip()
+    if not path:
+        return None
+    logger.info("Market data checkpoints: %s", path)
+    return Checkpointer(path, price_cache, source, clock=clock)
@@ -0,0 +1,100 @@
+"""Fixed-point PriceCache storing prices as integer ticks."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .clock import SYSTEM_CLOCK, Clock
+from .columnar import ColumnarPriceCache, PriceSnapshot
+from .models import PriceUpdate
+
+
+@dataclass(frozen=True, slots=True)
+class FixedPriceSnapshot(PriceSnapshot):
+    """PriceSnapshot whose `price` and `previous_price` columns are int64 ticks.
+
+    A tick is 1/`scale` of a currency unit. Reads in currency units divide
+    once on the way out; get_ticks() and the raw columns give the exact
+    integers for comparisons and packing.
+    """
+
+    scale: int = 100
+
+    def get_price(self, ticker: str) -> float | None:
+        i = self.index.get(ticker)
+        return None if i is None else int(self.price[i]) / self.scale
+
+    def get_ticks(self, ticker: str) -> int | None:
+        """A ticker's exact price in ticks, or None if absent."""
+        i = self.index.get(ticker)
+        return None if i is None else int(self.price[i])
+
+    def select(self, tickers: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """(prices, timestamps) arrays for tickers that are all present, prices in units."""
+        rows = np.fromiter((self.index[t] for t in tickers), np.intp, len(tickers))
+        return self.price[rows] / self.scale, self.timestamp[rows]
+
+    def _update(self, i: int) -> PriceUpdate:
+        return PriceUpdate(
+            ticker=self.tickers[i],
+            price=int(self.price[i]) / self.scale,
+            previous_price=int(self.previous_price[i]) / self.scale,
+            timestamp=float(self.timestamp[i]),
+        )
+
+
+class FixedPointPriceCache(ColumnarPriceCache):
+    """ColumnarPriceCache that stores prices as integer ticks of 1/`scale`.
+
+    scale=100 stores cents, scale=10_000 stores 1e-4 units. Float prices
+    passed to update()/update_many() are rounded to ticks exactly once, on
+    the way in; update_ticks() takes ticks directly, which is how
+    SimulatorDataSource publishes GBMSimulator.step_ticks() output with no
+    float rounding at all. From there on prices are exact integers: direction
+    and change are integer comparisons and subtractions, and the columns
+    pack into arrays or wire formats as-is.
+
+    Readers that want floats (get(), get_all(), PriceUpdate.to_dict() for
+    the SSE stream) get them by one division when a PriceUpdate is
+    materialized, so the JSON format is unchanged.
+    """
+
+    PRICE_DTYPE = np.int64
+
+    def __init__(self, scale: int = 100, clock: Clock = SYSTEM_CLOCK, capacity: int = 64) -> None:
+        if scale < 1:
+            raise ValueError("scale must be a positive number of ticks per unit")
+        self._scale = scale
+        super().__init__(clock=clock, capacity=capacity)
+
+    @property
+    def scale(self) -> int:
+        """Ticks per currency unit."""
+        return self._scale
+
+    def update_ticks(
+        self,
+        ticks: dict[str, int],
+        timestamp: float | None = None,
+        timestamps: dict[str, float] | None = None,
+    ) -> None:
+        """Like update_many(), with prices already in integer ticks."""
+        if not ticks:
+            return
+        tickers = list(ticks)
+        with self._lock:
+            values = np.fromiter(ticks.values(), np.int64, len(tickers))
+            self._write(tickers, values, self._stamps(tickers, timestamp, timestamps))
+
+    def snapshot(self) -> FixedPriceSnapshot:
+        return self._state
+
+    # --- Internals (caller holds _lock) ---
+
+    def _quantize(self, prices: np.ndarray) -> np.ndarray:
+        return np.rint(prices * self._scale).astype(np.int64)
+
+    def _snapshot(self, *fields, log: tuple) -> FixedPriceSnapshot:
+        return FixedPriceSnapshot(*fields, log=log, scale=self._scale)
@@ -0,0 +1,103 @@
+"""Fixed-memory per-ticker price history for sparklines and chart backfill."""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from .rows import TickerRows
+
+logger = logging.getLogger(__name__)
+
+
+class PriceHistory(TickerRows):
+    """Ring buffers of the last `capacity` (timestamp, price) points per ticker.
+
+    All tickers share two preallocated (rows, capacity) float64 arrays, so a
+    batch of updates is one fancy-indexed write and memory is fixed per
+    ticker. Attach it to a PriceCache with attach() and every cache write is
+    recorded as it happens; tickers removed from the cache are dropped on the
+    next write.
+
+    Queries return (timestamps, prices) arrays in time order, optionally
+    downsampled to at most `points` points, so a client can draw a sparkline
+    or chart right after connecting instead of waiting for the stream.
+    """
+
+    def __init__(self, capacity: int = 512, rows: int = 16) -> None:
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        super().__init__(rows)
+        self._capacity = capacity
+        self._times = np.zeros((rows, capacity))
+        self._prices = np.zeros((rows, capacity))
+        self._written = np.zeros(rows, dtype=np.int64)  # Points ever written per row
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def last(
+        self, ticker: str, n: int | None = None, points: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """The latest `n` points (all stored, by default), downsampled to `points`."""
+        times, prices = self._series(ticker)
+        if n is not None:
+            first = max(len(times) - n, 0)
+            times, prices = times[first:], prices[first:]
+        return downsample(times, prices, points)
+
+    def between(
+        self, ticker: str, start: float, end: float | None = None, points: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Points with start <= timestamp <= end, downsampled to `points`."""
+        times, prices = self._series(ticker)
+        lo = np.searchsorted(times, start, side="left")
+        hi = len(times) if end is None else np.searchsorted(times, end, side="right")
+        return downsample(times[lo:hi], prices[lo:hi], points)
+
+    # --- Internals ---
+
+    def _store(self, rows: np.ndarray, times: np.ndarray, prices: np.ndarray) -> None:
+        cols = self._written[rows] % self._capacity
+        self._times[rows, cols] = times
+        self._prices[rows, cols] = prices
+        self._written[rows] += 1
+
+    def _grow(self, rows: int) -> None:
+        extra = rows - len(self._written)
+        self._times = np.concatenate((self._times, np.zeros((extra, self._capacity))))
+        self._prices = np.concatenate((self._prices, np.zeros((extra, self._capacity))))
+        self._written = np.concatenate((self._written, np.zeros(extra, np.int64)))
+
+    def _reset(self, row: int) -> None:
+        self._written[row] = 0
+
+    def _series(self, ticker: str) -> tuple[np.ndarray, np.ndarray]:
+        """A ticker's stored points in time order (copies)."""
+        with self._lock:
+            row = self._index.get(ticker)
+            if row is None:
+                return np.empty(0), np.empty(0)
+            written = int(self._written[row])
+            if written <= self._capacity:
+                return self._times[row, :written].copy(), self._prices[row, :written].copy()
+            order = np.roll(np.arange(self._capacity), -(written % self._capacity))
+            return self._times[row, order], self._prices[row, order]
+
+
+def downsample(
+    times: np.ndarray, prices: np.ndarray, points: int | None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to at most `points` points, keeping each bucket's last point.
+
+    Buckets are equal runs of consecutive points; the final point is always
+    kept, so a downsampled sparkline still ends at the current price.
+    """
+    if points is None or len(times) <= points:
+        return times, prices
+    if points < 1:
+        return times[:0], prices[:0]
+    keep = np.linspace(0, len(times), points + 1)[1:].astype(np.intp) - 1
+    return times[keep], prices[keep]
@@ -18,6 +18,7 @@ class MarketDataSource(ABC):
         # ... app runs ...
         await source.add_ticker("TSLA")
         await source.remove_ticker("GOOGL")
+        await source.add_tickers(["NFLX", "META"])  # Batched watchlist edits
         # ... app shutting down ...
         await source.stop()
     """
@@ -52,6 +53,24 @@ class MarketDataSource(ABC):
         Also removes the ticker from the PriceCache.
         """
 
+    async def add_tickers(self, tickers: list[str]) -> None:
+        """Add several tickers to the active set. Already-present tickers are skipped.
+
+        Implementations override this to apply the whole batch at once; the
+        default just adds the tickers one by one.
+        """
+        for ticker in tickers:
+            await self.add_ticker(ticker)
+
+    async def remove_tickers(self, tickers: list[str]) -> None:
+        """Remove several tickers from the active set and the PriceCache.
+
+        Implementations override this to apply the whole batch at once; the
+        default just removes the tickers one by one.
+        """
+        for ticker in tickers:
+            await self.remove_ticker(ticker)
+
     @abstractmethod
     def get_tickers(self) -> list[str]:
         """Return the current list of actively tracked tickers."""
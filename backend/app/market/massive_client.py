@@ -9,7 +9,9 @@ from massive import RESTClient
 from massive.rest.models import SnapshotMarketType
 
 from .cache import PriceCache
+from .clock import SYSTEM_CLOCK, Clock
 from .interface import MarketDataSource
+from .scheduler import TickScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,10 @@ class MassiveDataSource(MarketDataSource):
     Rate limits:
       - Free tier: 5 req/min → poll every 15s (default)
       - Paid tiers: higher limits → poll every 2-5s
+
+    If the cache already holds every ticker at start (restored from a
+    checkpoint), the first poll runs in the background, so startup does
+    not wait on the API.
     """
 
     def __init__(
@@ -30,22 +36,26 @@ class MassiveDataSource(MarketDataSource):
         api_key: str,
         price_cache: PriceCache,
         poll_interval: float = 15.0,
+        clock: Clock = SYSTEM_CLOCK,
     ) -> None:
         self._api_key = api_key
         self._cache = price_cache
         self._interval = poll_interval
-        self._tickers: list[str] = []
+        self._clock = clock
+        self._tickers: dict[str, None] = {}  # Ordered set: O(1) membership and removal
         self._task: asyncio.Task | None = None
         self._client: RESTClient | None = None
 
     async def start(self, tickers: list[str]) -> None:
         self._client = RESTClient(api_key=self._api_key)
-        self._tickers = list(tickers)
+        self._tickers = dict.fromkeys(tickers)
 
-        # Do an immediate first poll so the cache has data right away
-        await self._poll_once()
+        warm = bool(tickers) and all(t in self._cache for t in self._tickers)
+        if not warm:
+            # Do an immediate first poll so the cache has data right away
+            await self._poll_once()
 
-        self._task = asyncio.create_task(self._poll_loop(), name="massive-poller")
+        self._task = asyncio.create_task(self._poll_loop(immediate=warm), name="massive-poller")
         logger.info(
             "Massive poller started: %d tickers, %.1fs interval",
             len(tickers),
@@ -64,26 +74,47 @@ class MassiveDataSource(MarketDataSource):
         logger.info("Massive poller stopped")
 
     async def add_ticker(self, ticker: str) -> None:
-        ticker = ticker.upper().strip()
-        if ticker not in self._tickers:
-            self._tickers.append(ticker)
-            logger.info("Massive: added ticker %s (will appear on next poll)", ticker)
+        await self.add_tickers([ticker])
+
+    async def add_tickers(self, tickers: list[str]) -> None:
+        normalized = dict.fromkeys(t.upper().strip() for t in tickers)
+        new = [t for t in normalized if t not in self._tickers]
+        if new:
+            self._tickers.update(dict.fromkeys(new))
+            logger.info(
+                "Massive: added %d ticker(s) (will appear on next poll): %s",
+                len(new),
+                ", ".join(new[:10]),
+            )
 
     async def remove_ticker(self, ticker: str) -> None:
-        ticker = ticker.upper().strip()
-        self._tickers = [t for t in self._tickers if t != ticker]
-        self._cache.remove(ticker)
-        logger.info("Massive: removed ticker %s", ticker)
+        await self.remove_tickers([ticker])
+
+    async def remove_tickers(self, tickers: list[str]) -> None:
+        tickers = [t.upper().strip() for t in tickers]
+        for ticker in tickers:
+            self._tickers.pop(ticker, None)
+        self._cache.remove_many(tickers)
+        logger.info("Massive: removed %d ticker(s): %s", len(tickers), ", ".join(tickers[:10]))
 
     def get_tickers(self) -> list[str]:
         return list(self._tickers)
 
     # --- Internal ---
 
-    async def _poll_loop(self) -> None:
-        """Poll on interval. First poll already happened in start()."""
-        while True:
-            await asyncio.sleep(self._interval)
+    async def _poll_loop(self, immediate: bool = False) -> None:
+        """Poll on interval. Unless `immediate`, the first poll already happened in start().
+
+        Polls fire on fixed deadlines, so a slow request does not push later
+        polls back; polls that would have started while one was still in
+        flight are skipped rather than fired back-to-back.
+        """
+        scheduler = TickScheduler(self._interval, start_immediately=immediate, clock=self._clock)
+        async for tick in scheduler:
+            if tick.missed:
+                logger.debug(
+                    "Massive poll %.1fs late, skipped %d poll(s)", tick.lateness, tick.missed
+                )
             await self._poll_once()
 
     async def _poll_once(self) -> None:
@@ -95,25 +126,24 @@ class MassiveDataSource(MarketDataSource):
             # The Massive RESTClient is synchronous — run in a thread to
             # avoid blocking the event loop.
             snapshots = await asyncio.to_thread(self._fetch_snapshots)
-            processed = 0
+            prices: dict[str, float] = {}
+            timestamps: dict[str, float] = {}
             for snap in snapshots:
                 try:
                     price = snap.last_trade.price
                     # Massive timestamps are Unix milliseconds → convert to seconds
                     timestamp = snap.last_trade.timestamp / 1000.0
-                    self._cache.update(
-                        ticker=snap.ticker,
-                        price=price,
-                        timestamp=timestamp,
-                    )
-                    processed += 1
+                    prices[snap.ticker] = price
+                    timestamps[snap.ticker] = timestamp
                 except (AttributeError, TypeError) as e:
                     logger.warning(
                         "Skipping snapshot for %s: %s",
                         getattr(snap, "ticker", "???"),
                         e,
                     )
-            logger.debug("Massive poll: updated %d/%d tickers", processed, len(self._tickers))
+            # The whole poll lands as one cache version
+            self._cache.update_many(prices, timestamps=timestamps)
+            logger.debug("Massive poll: updated %d/%d tickers", len(prices), len(self._tickers))
 
         except Exception as e:
             logger.error("Massive poll failed: %s", e)
@@ -124,5 +154,5 @@ class MassiveDataSource(MarketDataSource):
         """Synchronous call to the Massive REST API. Runs in a thread."""
         return self._client.get_snapshot_all(
             market_type=SnapshotMarketType.STOCKS,
-            tickers=self._tickers,
+            tickers=list(self._tickers),
         )
@@ -0,0 +1,69 @@
+"""Offline bulk GBM path generation for backtests and load fixtures."""
+
+from __future__ import annotations
+
+import logging
+import os
+
+import numpy as np
+
+from .simulator import GBMSimulator
+
+logger = logging.getLogger(__name__)
+
+# Peak working memory per chunk, in bytes
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+# Bytes simulate() holds per (step, ticker) cell: the float64 normals, three
+# float64 uniforms, the correlated float64 copy and the bool event mask
+_CELL_BYTES = 8 + 3 * 8 + 8 + 1
+
+
+def generate_paths(
+    path: str | os.PathLike,
+    tickers: list[str],
+    n_steps: int,
+    *,
+    dt: float = GBMSimulator.DEFAULT_DT,
+    event_probability: float = 0.001,
+    correlation: str = "cholesky",
+    seed: int | None = None,
+    chunk_steps: int | None = None,
+    dtype: np.dtype | type = np.float64,
+) -> np.memmap:
+    """Generate correlated GBM price paths and stream them into a memory-mapped .npy file.
+
+    The output has shape (n_steps + 1, len(tickers)): row 0 holds the seed
+    prices and row t the prices after t ticks. Columns follow `tickers`
+    (duplicates dropped). Paths use the same model as the live simulator —
+    TICKER_PARAMS, SEED_PRICES, sector correlations and random shock events —
+    and are produced `chunk_steps` rows at a time, so files far larger than
+    RAM can be written at full NumPy speed.
+
+    Returns the open read-write memmap. Load it later with
+    np.load(path, mmap_mode="r").
+    """
+    sim = GBMSimulator(
+        tickers=tickers,
+        dt=dt,
+        event_probability=event_probability,
+        correlation=correlation,
+        seed=seed,
+    )
+    columns = sim.get_tickers()
+    n = len(columns)
+    if chunk_steps is None:
+        chunk_steps = max(1, DEFAULT_CHUNK_BYTES // (_CELL_BYTES * max(n, 1)))
+
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(n_steps + 1, n))
+    out[0] = [sim.get_price(t) for t in columns]
+
+    row = 1
+    while row <= n_steps:
+        size = min(chunk_steps, n_steps + 1 - row)
+        out[row : row + size] = sim.simulate(size)
+        row += size
+
+    out.flush()
+    logger.info("Generated %d steps x %d tickers into %s", n_steps, n, os.fspath(path))
+    return out
@@ -0,0 +1,151 @@
+"""Reference-counted ticker universe in front of a MarketDataSource."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Hashable
+
+from .clock import SYSTEM_CLOCK, Clock
+from .interface import MarketDataSource
+from .scheduler import TickScheduler
+
+logger = logging.getLogger(__name__)
+
+GRACE_PERIOD = 60.0  # Seconds an unreferenced ticker is kept before eviction
+
+
+class TickerRegistry:
+    """Tracks which consumers need which tickers, and keeps the source to their union.
+
+    Consumers (a watchlist, open positions, an SSE subscription) are owners:
+    any hashable key. acquire() adds an owner's references and release()
+    drops them; the data source simulates or polls a ticker only while at
+    least one owner references it. A ticker whose last reference goes away
+    is evicted (removed from the source and the PriceCache) only after
+    `grace_period` seconds unreferenced, so a watchlist edit undone, a
+    reconnecting client or a position closed and reopened causes no churn.
+
+    Source edits are batched: one add_tickers() per acquire and one
+    remove_tickers() per sweep. Tickers the source is already tracking when
+    the registry starts count as unreferenced. Eviction runs every
+    `grace_period / 4` seconds once start() is called; sweep() runs it on
+    demand. Timing follows `clock`.
+    """
+
+    def __init__(
+        self,
+        source: MarketDataSource,
+        grace_period: float = GRACE_PERIOD,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        if grace_period < 0:
+            raise ValueError("grace_period must be >= 0")
+        self._source = source
+        self._grace = grace_period
+        self._clock = clock
+        self._owners: dict[str, set[Hashable]] = {}  # Referenced ticker -> owners
+        self._held: dict[Hashable, set[str]] = {}  # Owner -> tickers it references
+        self._idle: dict[str, float] = {}  # Unreferenced ticker -> monotonic time released
+        self._lock = asyncio.Lock()  # Orders source edits
+        self._task: asyncio.Task | None = None
+
+    async def acquire(self, owner: Hashable, tickers: list[str]) -> None:
+        """Reference `tickers` on behalf of `owner`; idempotent per (owner, ticker)."""
+        async with self._lock:
+            new = []
+            held = self._held.setdefault(owner, set())
+            for ticker in dict.fromkeys(_normalize(tickers)):
+                owners = self._owners.get(ticker)
+                if owners is None:
+                    owners = self._owners[ticker] = set()
+                    if self._idle.pop(ticker, None) is None:
+                        new.append(ticker)  # Not kept from an earlier reference
+                owners.add(owner)
+                held.add(ticker)
+            if new:
+                await self._source.add_tickers(new)
+
+    async def release(self, owner: Hashable, tickers: list[str] | None = None) -> None:
+        """Drop `owner`'s references to `tickers` (all of them, by default).
+
+        Tickers left unreferenced are evicted after the grace period, or
+        right away if it is 0.
+        """
+        async with self._lock:
+            held = self._held.get(owner)
+            if not held:
+                return
+            names = list(held) if tickers is None else _normalize(tickers)
+            now = self._clock.monotonic()
+            for ticker in names:
+                if ticker not in held:
+                    continue
+                held.discard(ticker)
+                owners = self._owners[ticker]
+                owners.discard(owner)
+                if not owners:
+                    del self._owners[ticker]
+                    self._idle[ticker] = now
+            if not held:
+                del self._held[owner]
+            if self._grace == 0:
+                await self._evict(now)
+
+    async def sweep(self) -> list[str]:
+        """Evict the tickers unreferenced for at least the grace period. Returns them."""
+        async with self._lock:
+            return await self._evict(self._clock.monotonic())
+
+    def refcount(self, ticker: str) -> int:
+        """Number of owners referencing a ticker."""
+        return len(self._owners.get(ticker, ()))
+
+    def get_tickers(self) -> list[str]:
+        """Tickers referenced by at least one owner."""
+        return list(self._owners)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._owners
+
+    async def start(self) -> None:
+        """Adopt the source's current tickers as unreferenced and begin evicting."""
+        now = self._clock.monotonic()
+        for ticker in self._source.get_tickers():
+            if ticker not in self._owners:
+                self._idle.setdefault(ticker, now)
+        if self._grace > 0:
+            self._task = asyncio.create_task(self._run(), name="ticker-registry")
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    # --- Internals ---
+
+    async def _run(self) -> None:
+        async for _ in TickScheduler(self._grace / 4, start_immediately=False, clock=self._clock):
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Ticker eviction failed")
+
+    async def _evict(self, now: float) -> list[str]:
+        """Remove expired idle tickers from the source (caller holds _lock)."""
+        expired = [t for t, since in self._idle.items() if now - since >= self._grace]
+        if not expired:
+            return []
+        for ticker in expired:
+            del self._idle[ticker]
+        await self._source.remove_tickers(expired)
+        logger.info("Evicted %d unreferenced ticker(s): %s", len(expired), ", ".join(expired[:10]))
+        return expired
+
+
+def _normalize(tickers: list[str]) -> list[str]:
+    return [t.strip().upper() for t in tickers]
@@ -0,0 +1,204 @@
+"""Monte Carlo portfolio VaR and expected shortfall on the simulator's return model."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+from .cache import CacheSnapshot, PriceCache
+from .simulator import GBMSimulator, ScenarioModel
+
+logger = logging.getLogger(__name__)
+
+# One trading day (6.5 hours) of trading time, in seconds
+TRADING_DAY_SECONDS = 6.5 * 3600
+
+# Risk results kept per price version (one per distinct position set)
+RESULT_CACHE = 64
+
+
+class ScenarioModelSource(Protocol):
+    """Anything that can describe its return model: GBMSimulator or SimulatorDataSource."""
+
+    def scenario_model(self, tickers: list[str]) -> ScenarioModel: ...
+
+
+@dataclass(frozen=True, slots=True)
+class RiskResult:
+    """Portfolio risk over one horizon. Losses are positive amounts of money."""
+
+    value: float  # Current market value of the positions
+    var: float  # Value at risk: the `confidence` quantile of the loss
+    expected_shortfall: float  # Mean loss in the tail beyond the VaR
+    confidence: float
+    horizon: float  # Seconds of trading time
+    scenarios: int
+    version: int  # PriceCache version the prices were read at
+
+
+class RiskEngine:
+    """Monte Carlo VaR/ES for a set of positions, priced from a PriceCache.
+
+    Scenarios follow the simulator's own model (see ScenarioModel): over a
+    horizon of h steps, each ticker's log return is drift * h plus
+    diffusion * sqrt(h) times correlated normals, mixed with the simulator's
+    Cholesky rows or factor loadings, plus a Poisson number of 2-5% shocks
+    (their sum drawn from its mean and variance given the count). Scenarios
+    are generated `batch_size` at a time as one (batch, k) @ (k, m) product,
+    and with `workers` > 0 the batches run in a process pool.
+
+    Each batch draws from its own substream of `seed`, so every evaluation
+    reuses the same random numbers: results are reproducible, independent
+    of `workers`, and only move when prices or positions do. Results are
+    cached until the PriceCache version changes.
+
+    Usage:
+        engine = RiskEngine(source, price_cache)
+        result = engine.evaluate({"AAPL": 10, "MSFT": -5})
+        engine.close()
+    """
+
+    def __init__(
+        self,
+        model_source: ScenarioModelSource,
+        price_cache: PriceCache,
+        scenarios: int = 10_000,
+        confidence: float = 0.99,
+        horizon: float = TRADING_DAY_SECONDS,
+        batch_size: int = 2_000,
+        workers: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        if scenarios < 1 or batch_size < 1:
+            raise ValueError("scenarios and batch_size must be positive")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        if horizon <= 0:
+            raise ValueError("horizon must be positive")
+        self._source = model_source
+        self._cache = price_cache
+        self._scenarios = scenarios
+        self._confidence = confidence
+        self._horizon = horizon
+        self._batch_size = batch_size
+        self._workers = workers
+        self._seed: int = np.random.SeedSequence(seed).entropy
+        self._pool: Executor | None = None
+
+        self._lock = threading.Lock()
+        self._results: dict[tuple[tuple[str, float], ...], RiskResult] = {}
+        self._results_version = -1
+
+    def evaluate(self, positions: dict[str, float]) -> RiskResult:
+        """VaR and expected shortfall for {ticker: quantity} (negative = short).
+
+        Raises ValueError for a ticker that has no price or is not simulated.
+        """
+        key = tuple(sorted((t, float(q)) for t, q in positions.items() if q))
+        # One snapshot: the version and the prices always belong together
+        snapshot = self._cache.snapshot()
+        version = snapshot.version
+        with self._lock:
+            if self._results_version == version and key in self._results:
+                return self._results[key]
+
+        tickers = [t for t, _ in key]
+        prices = np.array([_price(snapshot, t) for t in tickers])
+        exposure = prices * np.array([q for _, q in key])
+        losses = self._losses(tickers, exposure)
+        var = float(np.quantile(losses, self._confidence)) if losses.size else 0.0
+        tail = losses[losses >= var]
+        result = RiskResult(
+            value=float(exposure.sum()),
+            var=var,
+            expected_shortfall=float(tail.mean()) if tail.size else var,
+            confidence=self._confidence,
+            horizon=self._horizon,
+            scenarios=self._scenarios,
+            version=version,
+        )
+
+        with self._lock:
+            if self._results_version != version or len(self._results) >= RESULT_CACHE:
+                self._results.clear()
+                self._results_version = version
+            self._results[key] = result
+        return result
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # --- Internals ---
+
+    def _losses(self, tickers: list[str], exposure: np.ndarray) -> np.ndarray:
+        """Portfolio loss in every scenario, shape (scenarios,)."""
+        if not tickers:
+            return np.zeros(self._scenarios)
+        model = self._source.scenario_model(tickers)
+        steps = self._horizon / (model.dt * GBMSimulator.TRADING_SECONDS_PER_YEAR)
+        args = (
+            model.drift * steps,
+            model.diffusion * np.sqrt(steps),
+            model.mixing,
+            model.event_probability * steps,
+            model.shock_mean,
+            model.shock_var,
+            exposure,
+            self._seed,
+        )
+        sizes = [
+            min(self._batch_size, self._scenarios - start)
+            for start in range(0, self._scenarios, self._batch_size)
+        ]
+        if self._workers > 0 and len(sizes) > 1:
+            if self._pool is None:
+                # Imported here: sharded.py pulls in the worker machinery
+                from .sharded import mp_context
+
+                self._pool = ProcessPoolExecutor(self._workers, mp_context=mp_context())
+            futures = [
+                self._pool.submit(_scenario_losses, *args, b, n) for b, n in enumerate(sizes)
+            ]
+            batches = [f.result() for f in futures]
+        else:
+            batches = [_scenario_losses(*args, b, n) for b, n in enumerate(sizes)]
+        return np.concatenate(batches)
+
+
+def _price(snapshot: CacheSnapshot, ticker: str) -> float:
+    price = snapshot.get_price(ticker)
+    if price is None:
+        raise ValueError(f"No price for {ticker}")
+    return price
+
+
+def _scenario_losses(
+    mean: np.ndarray,
+    scale: np.ndarray,
+    mixing: np.ndarray,
+    shock_rate: float,
+    shock_mean: float,
+    shock_var: float,
+    exposure: np.ndarray,
+    seed: int,
+    batch: int,
+    size: int,
+) -> np.ndarray:
+    """Losses for one batch of scenarios. Module-level so process pools can run it."""
+    rng = GBMSimulator.substream(seed, batch)
+    z = rng.standard_normal((size, mixing.shape[1])) @ mixing.T
+    log_returns = mean + scale * z
+    if shock_rate > 0:
+        counts = rng.poisson(shock_rate, size=log_returns.shape)
+        log_returns += counts * shock_mean + np.sqrt(counts * shock_var) * rng.standard_normal(
+            log_returns.shape
+        )
+    return -(np.expm1(log_returns) @ exposure)
@@ -0,0 +1,92 @@
+"""Per-ticker row allocation for array-backed PriceCache listeners."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+from .cache import CacheSnapshot, PriceCache
+
+
+class TickerRows:
+    """Base for stores that keep one row per ticker in preallocated arrays.
+
+    Subclasses own the arrays: _grow() extends them to a number of rows,
+    _reset() clears a row handed to a new ticker, and _store() writes one
+    batch of (rows, timestamps, prices). This class assigns rows on first
+    sight (doubling the arrays when none are free), recycles the rows of
+    tickers that leave the cache, and listens to a PriceCache.
+    """
+
+    def __init__(self, rows: int) -> None:
+        self._rows = rows
+        self._index: dict[str, int] = {}
+        self._free = list(range(rows - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def attach(self, cache: PriceCache) -> None:
+        """Record every write to `cache` from now on, starting with its current prices."""
+        snapshot = cache.snapshot()
+        self.record(snapshot, list(snapshot.updates()))
+        cache.add_listener(self.record)
+
+    def detach(self, cache: PriceCache) -> None:
+        cache.remove_listener(self.record)
+
+    def record(self, snapshot: CacheSnapshot, tickers: list[str]) -> None:
+        """Store the prices of `tickers` from `snapshot` (a PriceCache listener).
+
+        Tickers no longer in the cache are dropped first.
+        """
+        if not tickers:
+            return
+        prices, times = snapshot.select(tickers)
+        with self._lock:
+            if len(self._index) > len(snapshot):
+                self._prune(snapshot)
+            rows = np.fromiter((self._row(t) for t in tickers), np.intp, len(tickers))
+            self._store(rows, times, prices)
+
+    def remove(self, ticker: str) -> None:
+        with self._lock:
+            self._release(ticker)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._index
+
+    # --- Subclass hooks (caller holds _lock) ---
+
+    def _grow(self, rows: int) -> None:
+        raise NotImplementedError
+
+    def _reset(self, row: int) -> None:
+        raise NotImplementedError
+
+    def _store(self, rows: np.ndarray, times: np.ndarray, prices: np.ndarray) -> None:
+        raise NotImplementedError
+
+    # --- Internals (caller holds _lock) ---
+
+    def _row(self, ticker: str) -> int:
+        """Row for a ticker, assigning (and growing the arrays) on first sight."""
+        row = self._index.get(ticker)
+        if row is not None:
+            return row
+        if not self._free:
+            rows, self._rows = self._rows, 2 * self._rows
+            self._grow(self._rows)
+            self._free = list(range(self._rows - 1, rows - 1, -1))
+        row = self._index[ticker] = self._free.pop()
+        self._reset(row)
+        return row
+
+    def _prune(self, snapshot: CacheSnapshot) -> None:
+        """Drop tickers that are no longer in the cache."""
+        for ticker in [t for t in self._index if t not in snapshot]:
+            self._release(ticker)
+
+    def _release(self, ticker: str) -> None:
+        row = self._index.pop(ticker, None)
+        if row is not None:
+            self._free.append(row)
@@ -0,0 +1,115 @@
+"""Drift-free tick scheduler on absolute monotonic deadlines."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from .clock import SYSTEM_CLOCK, Clock
+
+
+@dataclass(frozen=True, slots=True)
+class Tick:
+    """One firing of a TickScheduler."""
+
+    index: int  # Deadline number since start (skipped deadlines count too)
+    deadline: float  # Monotonic time this tick was due
+    lateness: float  # Seconds between the deadline and the actual wake-up
+    missed: int  # Deadlines that passed unserved since the previous tick
+    intervals: int  # Intervals this tick should account for (see TickScheduler)
+
+
+class TickScheduler:
+    """Fires every `interval` seconds on absolute monotonic deadlines.
+
+    Deadlines are start + k * interval, so the period does not stretch by the
+    time the caller spends working between ticks (unlike sleeping for
+    `interval` after each unit of work). If the caller falls behind by whole
+    intervals, the passed deadlines are collapsed into one tick and reported
+    in Tick.missed. The policy says what that tick stands for:
+
+        "skip"     - Tick.intervals is always 1: the missed ticks are dropped.
+        "catch_up" - Tick.intervals is missed + 1, so a simulator can step
+                     once with dt scaled to cover the whole gap.
+
+    Usage:
+        async for tick in TickScheduler(0.5):
+            ...
+
+    or, from a dedicated thread, with a threading.Event to stop early:
+        while (tick := scheduler.wait(stop_event)) is not None:
+            ...
+
+    Deadlines and sleeps follow `clock` (the system clock by default), so a
+    VirtualClock runs the schedule accelerated.
+    """
+
+    POLICIES = ("skip", "catch_up")
+
+    def __init__(
+        self,
+        interval: float,
+        policy: str = "skip",
+        start_immediately: bool = True,
+        clock: Clock = SYSTEM_CLOCK,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {self.POLICIES}")
+        self._interval = interval
+        self._policy = policy
+        self._start_immediately = start_immediately
+        self._clock = clock
+        self._next_deadline: float | None = None
+        self._index = -1
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def delay(self) -> float:
+        """Seconds until the next deadline (0 if it has already passed)."""
+        now = self._clock.monotonic()
+        if self._next_deadline is None:
+            self._next_deadline = now if self._start_immediately else now + self._interval
+        return max(0.0, self._next_deadline - now)
+
+    def fire(self) -> Tick:
+        """Consume the current deadline and describe the tick. Call once delay() hits 0."""
+        if self._next_deadline is None:
+            self.delay()
+        now = self._clock.monotonic()
+        deadline = self._next_deadline
+        lateness = max(0.0, now - deadline)
+        missed = int(lateness // self._interval)
+
+        self._index += missed + 1
+        self._next_deadline = deadline + (missed + 1) * self._interval
+        return Tick(
+            index=self._index,
+            deadline=deadline,
+            lateness=lateness,
+            missed=missed,
+            intervals=missed + 1 if self._policy == "catch_up" else 1,
+        )
+
+    async def next(self) -> Tick:
+        """Sleep until the next deadline and return its tick."""
+        delay = self.delay()
+        if delay > 0:
+            await self._clock.sleep(delay)
+        return self.fire()
+
+    def wait(self, stop: threading.Event) -> Tick | None:
+        """Blocking variant of next() for threads. Returns None once `stop` is set."""
+        if self._clock.wait(stop, self.delay()):
+            return None
+        return self.fire()
+
+    def __aiter__(self) -> AsyncIterator[Tick]:
+        return self
+
+    async def __anext__(self) -> Tick:
+        return await self.next()
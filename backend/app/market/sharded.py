@@ -0,0 +1,334 @@
+"""Multi-process sharded GBM simulator with shared-memory price output."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import threading
+from multiprocessing.connection import Connection
+
+import numpy as np
+
+from . import shm
+from .correlation import FACTOR_NAMES
+from .simulator import FACTOR_STREAM, GBMSimulator
+
+logger = logging.getLogger(__name__)
+
+_FLOAT_SIZE = np.dtype(np.float64).itemsize
+
+
+def _worker_main(
+    conn: Connection,
+    prices_name: str,
+    capacity: int,
+    factors_name: str,
+    tickers: list[str],
+    slots: list[int],
+    sim_kwargs: dict,
+) -> None:
+    """Worker process: step one shard and write its prices into shared memory.
+
+    Commands arrive on `conn` as tuples; every command gets exactly one reply,
+    None on success or the exception that was raised. The parent owns (and
+    unlinks) both segments; the worker only maps them.
+    """
+    prices_shm = shm.attach(prices_name, inherited_tracker=True)
+    factors_shm = shm.attach(factors_name, inherited_tracker=True)
+    prices = np.ndarray((capacity,), dtype=np.float64, buffer=prices_shm.buf)
+    factors = np.ndarray((len(FACTOR_NAMES),), dtype=np.float64, buffer=factors_shm.buf)
+
+    sim = GBMSimulator(tickers=tickers, correlation="factor", **sim_kwargs)
+    slot_index = np.array(slots, dtype=np.intp)
+    prices[slot_index] = [sim.get_price(t) for t in tickers]
+    conn.send(None)
+
+    while True:
+        cmd, *args = conn.recv()
+        try:
+            if cmd == "step":
+                (steps,) = args
+                prices[slot_index] = sim.advance(factor_shocks=factors, steps=steps)
+            elif cmd == "add":
+                new_tickers, new_slots = args
+                sim.add_tickers(new_tickers)
+                slot_index = np.append(slot_index, new_slots)
+                prices[new_slots] = [sim.get_price(t) for t in new_tickers]
+            elif cmd == "remove":
+                (old_tickers,) = args
+                gone = set(old_tickers)
+                keep = [i for i, t in enumerate(sim.get_tickers()) if t not in gone]
+                sim.remove_tickers(old_tickers)
+                slot_index = slot_index[keep]
+            elif cmd == "attach":
+                prices_name, capacity = args
+                del prices
+                prices_shm.close()
+                prices_shm = shm.attach(prices_name, inherited_tracker=True)
+                prices = np.ndarray((capacity,), dtype=np.float64, buffer=prices_shm.buf)
+            elif cmd == "stop":
+                conn.send(None)
+                break
+            else:
+                raise ValueError(f"Unknown command {cmd!r}")
+        except Exception as e:
+            conn.send(e)
+        else:
+            conn.send(None)
+
+    del prices, factors
+    prices_shm.close()
+    factors_shm.close()
+
+
+def mp_context() -> mp.context.BaseContext:
+    """Multiprocessing context for the market worker processes.
+
+    Used for the sharded simulator's workers and RiskEngine's process pool.
+    forkserver (where available) forks each worker from a server that has
+    already imported this module, so starting workers stays cheap; fork
+    itself is avoided because the parent runs threads (asyncio.to_thread).
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return mp.get_context("spawn")
+
+
+class ShardedSimulator:
+    """GBM simulation split across worker processes.
+
+    Each worker owns a "factor"-mode GBMSimulator over its shard of the ticker
+    universe and writes prices straight into one shared-memory array. The
+    sector factor shocks are drawn once per tick here and broadcast through a
+    second shared-memory segment, so tickers in different shards keep the
+    same pairwise correlations as a single-process simulator; workers only
+    add their own idiosyncratic noise. Because every ticker draws from its
+    own seeded substreams, a given seed yields the same paths as a
+    single-process GBMSimulator(correlation="factor", seed=seed), whatever
+    the shard layout.
+
+    Mirrors the GBMSimulator API (step/add_ticker(s)/remove_ticker(s)/
+    get_price/get_tickers). Methods are thread-safe and block until every
+    worker has replied. Call close() to stop the workers and free the
+    shared memory.
+    """
+
+    def __init__(
+        self,
+        tickers: list[str],
+        workers: int = 2,
+        dt: float = GBMSimulator.DEFAULT_DT,
+        event_probability: float = 0.001,
+        seed: int | None = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        unique = list(dict.fromkeys(tickers))
+        self._seed: int = np.random.SeedSequence(seed).entropy
+        self._factor_rng = GBMSimulator.substream(self._seed, FACTOR_STREAM)
+        self._lock = threading.Lock()
+
+        # Price slots in shared memory; slot order is independent of shard layout
+        self._capacity = max(1024, 2 * len(unique))
+        self._prices_shm = shm.create(self._capacity * _FLOAT_SIZE)
+        self._prices = np.ndarray((self._capacity,), dtype=np.float64, buffer=self._prices_shm.buf)
+        self._factors_shm = shm.create(len(FACTOR_NAMES) * _FLOAT_SIZE)
+        self._factors = np.ndarray(
+            (len(FACTOR_NAMES),), dtype=np.float64, buffer=self._factors_shm.buf
+        )
+
+        self._slots: dict[str, int] = {}  # ticker -> slot, in insertion order
+        self._shard_of: dict[str, int] = {}  # ticker -> worker index
+        self._shard_sizes = [0] * workers
+        self._free_slots: list[int] = []
+        self._next_slot = 0
+        self._slot_index = np.empty(0, dtype=np.intp)
+
+        # Deal tickers round-robin; slots follow the caller's ticker order
+        shards: list[list[str]] = [[] for _ in range(workers)]
+        shard_slots: list[list[int]] = [[] for _ in range(workers)]
+        for i, ticker in enumerate(unique):
+            shards[i % workers].append(ticker)
+            shard_slots[i % workers].append(self._assign(ticker, i % workers))
+
+        ctx = mp_context()
+        self._conns: list[Connection] = []
+        self._procs: list[mp.process.BaseProcess] = []
+        sim_kwargs = {"dt": dt, "event_probability": event_probability}
+        for w, (shard, slots) in enumerate(zip(shards, shard_slots)):
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(
+                    child_conn,
+                    self._prices_shm.name,
+                    self._capacity,
+                    self._factors_shm.name,
+                    shard,
+                    slots,
+                    {**sim_kwargs, "seed": self._seed},
+                ),
+                name=f"gbm-shard-{w}",
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+        self._refresh_index()
+        self._collect(self._conns)  # Wait until every worker has seeded its prices
+        logger.info("Sharded simulator: %d tickers across %d workers", len(unique), workers)
+
+    # --- Public API ---
+
+    def step(self, steps: int = 1) -> dict[str, float]:
+        """Advance all shards by one time step. Returns {ticker: new_price}.
+
+        `steps` > 1 covers several time steps in one draw (see GBMSimulator.advance).
+        """
+        with self._lock:
+            if not self._slots:
+                return {}
+            self._factors[:] = self._factor_rng.standard_normal(len(FACTOR_NAMES))
+            self._broadcast(("step", steps))
+            prices = np.round(self._prices[self._slot_index], 2)
+            return dict(zip(self._slots, prices.tolist()))
+
+    def add_ticker(self, ticker: str) -> None:
+        """Add a ticker to the least-loaded shard. No-op if already present."""
+        self.add_tickers([ticker])
+
+    def add_tickers(self, tickers: list[str]) -> None:
+        """Add several tickers, each to the least-loaded shard at that point.
+
+        Each affected worker gets one batched command; workers apply their
+        batches in parallel.
+        """
+        with self._lock:
+            new = [t for t in dict.fromkeys(tickers) if t not in self._slots]
+            if not new:
+                return
+            while len(self._free_slots) + self._capacity - self._next_slot < len(new):
+                self._grow()
+            batches: dict[int, tuple[list[str], list[int]]] = {}
+            for ticker in new:
+                shard = self._shard_sizes.index(min(self._shard_sizes))
+                names, slots = batches.setdefault(shard, ([], []))
+                names.append(ticker)
+                slots.append(self._assign(ticker, shard))
+            self._refresh_index()
+            self._scatter({shard: ("add", *batch) for shard, batch in batches.items()})
+
+    def remove_ticker(self, ticker: str) -> None:
+        """Remove a ticker from its shard. No-op if not present."""
+        self.remove_tickers([ticker])
+
+    def remove_tickers(self, tickers: list[str]) -> None:
+        """Remove several tickers with one batched command per affected worker."""
+        with self._lock:
+            batches: dict[int, list[str]] = {}
+            for ticker in dict.fromkeys(tickers):
+                slot = self._slots.pop(ticker, None)
+                if slot is None:
+                    continue
+                shard = self._shard_of.pop(ticker)
+                self._shard_sizes[shard] -= 1
+                self._free_slots.append(slot)
+                batches.setdefault(shard, []).append(ticker)
+            if not batches:
+                return
+            self._refresh_index()
+            self._scatter({shard: ("remove", names) for shard, names in batches.items()})
+
+    def get_price(self, ticker: str) -> float | None:
+        """Current price for a ticker, or None if not tracked."""
+        slot = self._slots.get(ticker)
+        return None if slot is None else float(self._prices[slot])
+
+    def get_tickers(self) -> list[str]:
+        """Return the list of currently tracked tickers."""
+        return list(self._slots)
+
+    @property
+    def seed(self) -> int:
+        """Master seed shared by every worker."""
+        return self._seed
+
+    def close(self) -> None:
+        """Stop the worker processes and release shared memory. Idempotent."""
+        with self._lock:
+            if not self._procs:
+                return
+            for conn in self._conns:
+                try:
+                    conn.send(("stop",))
+                except (BrokenPipeError, OSError):
+                    pass
+            for conn, proc in zip(self._conns, self._procs):
+                try:
+                    if conn.poll(5.0):
+                        conn.recv()
+                except (EOFError, OSError):
+                    pass
+                proc.join(timeout=5.0)
+                if proc.is_alive():
+                    proc.terminate()
+                conn.close()
+            self._conns.clear()
+            self._procs.clear()
+            del self._prices, self._factors
+            shm.unlink(self._prices_shm)
+            shm.unlink(self._factors_shm)
+            logger.info("Sharded simulator stopped")
+
+    # --- Internals ---
+
+    def _assign(self, ticker: str, shard: int) -> int:
+        """Allocate a price slot for a ticker on a shard."""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = self._next_slot
+            self._next_slot += 1
+        self._slots[ticker] = slot
+        self._shard_of[ticker] = shard
+        self._shard_sizes[shard] += 1
+        return slot
+
+    def _refresh_index(self) -> None:
+        self._slot_index = np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+
+    def _grow(self) -> None:
+        """Double the shared price array and move every worker onto it."""
+        capacity = self._capacity * 2
+        segment = shm.create(capacity * _FLOAT_SIZE)
+        prices = np.ndarray((capacity,), dtype=np.float64, buffer=segment.buf)
+        prices[: self._capacity] = self._prices
+        self._broadcast(("attach", segment.name, capacity))
+
+        old = self._prices_shm
+        del self._prices
+        shm.unlink(old)
+        self._prices_shm, self._prices, self._capacity = segment, prices, capacity
+
+    def _scatter(self, messages: dict[int, tuple]) -> None:
+        """Send per-shard commands, then wait for those workers' replies."""
+        conns = [self._conns[shard] for shard in messages]
+        for conn, message in zip(conns, messages.values()):
+            conn.send(message)
+        self._collect(conns)
+
+    def _broadcast(self, message: tuple) -> None:
+        """Send a command to every worker, then wait for all replies (they run in parallel)."""
+        for conn in self._conns:
+            conn.send(message)
+        self._collect(self._conns)
+
+    @staticmethod
+    def _collect(conns: list[Connection]) -> None:
+        errors = [reply for reply in (conn.recv() for conn in conns) if reply is not None]
+        if errors:
+            raise errors[0]
@@ -0,0 +1,246 @@
+"""Shared-memory PriceCache: one writer process, any number of reader processes."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from . import shm
+from .cache import Listener, PriceCache
+from .clock import SYSTEM_CLOCK, Clock
+from .columnar import ColumnarPriceCache, PriceSnapshot
+from .models import PriceUpdate
+
+logger = logging.getLogger(__name__)
+
+TICKER_BYTES = 16  # Fixed-width ASCII ticker names in the segment
+
+# Header slots (int64); the header is padded to 64 bytes
+_SEQ, _VERSION, _COUNT, _TABLE, _CAPACITY = range(5)
+_HEADER = 8
+
+# Reader retries while the writer is mid-publish before giving up on a refresh
+_SPIN_LIMIT = 100_000
+
+
+def _layout(buf: memoryview, capacity: int) -> tuple[np.ndarray, list[np.ndarray], np.ndarray]:
+    """Map a segment: (header, [price, previous, timestamp, stamp], names)."""
+    header = np.ndarray((_HEADER,), dtype=np.int64, buffer=buf)
+    offset = header.nbytes
+    columns = []
+    for dtype in (np.float64, np.float64, np.float64, np.int64):
+        columns.append(np.ndarray((capacity,), dtype=dtype, buffer=buf, offset=offset))
+        offset += columns[-1].nbytes
+    names = np.ndarray((capacity,), dtype=f"S{TICKER_BYTES}", buffer=buf, offset=offset)
+    return header, columns, names
+
+
+def _segment_size(capacity: int) -> int:
+    return _HEADER * 8 + capacity * (4 * 8 + TICKER_BYTES)
+
+
+class SharedPriceCache(ColumnarPriceCache):
+    """ColumnarPriceCache that mirrors every published version into shared memory.
+
+    The producer (simulator or Massive poller) writes to this cache as usual;
+    other processes open a SharedPriceReader on its segment `name` and read
+    the same prices with no IPC and no serialization, so SSE fan-out can run
+    in as many worker processes as there are cores.
+
+    The segment is a seqlock: a sequence counter, then the header and the
+    price columns. Each publish makes the counter odd, copies the columns
+    (and the ticker names, only when tickers came or went), then makes it
+    even again; readers retry any copy during which the counter moved. There
+    is exactly one writer, so writers never wait on readers and readers
+    never block each other.
+
+    The segment is sized for `capacity` tickers up front and does not grow;
+    tickers must be ASCII and at most TICKER_BYTES long. close() unlinks the
+    segment.
+    """
+
+    def __init__(
+        self, name: str | None = None, capacity: int = 1024, clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        self._shm = shm.create(_segment_size(capacity), name)
+        self._header, self._columns, self._names = _layout(self._shm.buf, capacity)
+        self._header[:] = 0
+        self._header[_CAPACITY] = capacity
+        self._mirrored_tickers: tuple[str, ...] | None = None
+        super().__init__(clock=clock, capacity=capacity)
+
+    @property
+    def name(self) -> str:
+        """Segment name for SharedPriceReader."""
+        return self._shm.name
+
+    def close(self) -> None:
+        """Release and unlink the segment. Readers keep their current mapping."""
+        with self._lock:
+            if self._shm is None:
+                return
+            del self._header, self._columns, self._names
+            shm.unlink(self._shm)
+            self._shm = None
+
+    # --- Internals (caller holds _lock) ---
+
+    def _write(
+        self, tickers: list[str], prices: np.ndarray, timestamps: float | np.ndarray
+    ) -> None:
+        for ticker in tickers:
+            if ticker not in self._index and (len(ticker) > TICKER_BYTES or not ticker.isascii()):
+                raise ValueError(f"Ticker {ticker!r} does not fit the shared segment")
+        super()._write(tickers, prices, timestamps)
+
+    def _own(self, table: bool, extra: int = 0) -> None:
+        capacity = int(self._header[_CAPACITY])
+        if len(self._tickers) + extra > capacity:
+            raise ValueError(f"Shared price cache is full ({capacity} tickers)")
+        super()._own(table, extra)
+
+    def _publish_columns(self, version: int | None = None) -> None:
+        super()._publish_columns(version)
+        self._mirror(self._state)
+
+    def _mirror(self, state: PriceSnapshot) -> None:
+        """Copy a published snapshot into the segment under the seqlock."""
+        n = len(state)
+        header = self._header
+        header[_SEQ] += 1  # Odd: a write is in progress
+        if state.tickers is not self._mirrored_tickers:
+            self._names[:n] = state.tickers
+            header[_TABLE] += 1
+            self._mirrored_tickers = state.tickers
+        for column, values in zip(
+            self._columns, (state.price, state.previous_price, state.timestamp, state.stamp)
+        ):
+            column[:n] = values
+        header[_VERSION] = state.version
+        header[_COUNT] = n
+        header[_SEQ] += 1  # Even: consistent again
+
+
+class SharedPriceReader(PriceCache):
+    """Read-only PriceCache over a SharedPriceCache segment in another process.
+
+    snapshot() checks the writer's sequence counter and, only when it has
+    moved, copies the live rows out under the seqlock (ticker names only
+    when tickers came or went) into an ordinary PriceSnapshot; otherwise it
+    returns the snapshot it already has. Everything built on snapshots -
+    get(), changes_since(), the SSE stream - works unchanged.
+
+    A background thread polls the counter every `poll_interval` seconds, but
+    only while someone is listening, to feed wait_for_change() and
+    listeners. Versions published between two polls reach them as one
+    change. Writing raises TypeError.
+    """
+
+    def __init__(
+        self, name: str, poll_interval: float = 0.005, clock: Clock = SYSTEM_CLOCK
+    ) -> None:
+        super().__init__(clock)
+        self._shm = shm.attach(name)
+        capacity = int(np.ndarray((_HEADER,), dtype=np.int64, buffer=self._shm.buf)[_CAPACITY])
+        self._header, self._columns, self._names = _layout(self._shm.buf, capacity)
+        self._seen = -1  # Sequence number of the current snapshot
+        self._table = -1  # Table generation of the cached tickers/index
+        self._table_cache: tuple[tuple[str, ...], dict[str, int]] = ((), {})
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        with self._lock:
+            self._refresh()
+
+    def snapshot(self) -> PriceSnapshot:
+        """The writer's latest consistent state, copied out only when it changed."""
+        if self._header[_SEQ] != self._seen:
+            with self._lock:
+                self._refresh()
+        return self._state
+
+    async def wait_for_change(self, version: int, timeout: float | None = None) -> PriceSnapshot:
+        self._watch()
+        return await super().wait_for_change(version, timeout)
+
+    def add_listener(self, listener: Listener) -> None:
+        super().add_listener(listener)
+        self._watch()
+
+    def update(self, ticker: str, price: float, timestamp: float | None = None) -> PriceUpdate:
+        raise TypeError("SharedPriceReader is read-only")
+
+    def update_many(
+        self,
+        prices: dict[str, float],
+        timestamp: float | None = None,
+        timestamps: dict[str, float] | None = None,
+    ) -> None:
+        raise TypeError("SharedPriceReader is read-only")
+
+    def remove_many(self, tickers: list[str]) -> None:
+        raise TypeError("SharedPriceReader is read-only")
+
+    def close(self) -> None:
+        """Stop polling and unmap the segment (the writer owns and unlinks it)."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        with self._lock:
+            if self._shm is None:
+                return
+            del self._header, self._columns, self._names
+            self._shm.close()
+            self._shm = None
+
+    # --- Internals ---
+
+    def _refresh(self) -> None:
+        """Copy the segment into a new snapshot if the writer has moved on (caller holds _lock)."""
+        header = self._header
+        for _ in range(_SPIN_LIMIT):
+            seq = int(header[_SEQ])
+            if seq == self._seen:
+                return
+            if seq & 1:
+                time.sleep(0)  # Writer mid-publish
+                continue
+            version, count, table = (int(v) for v in header[[_VERSION, _COUNT, _TABLE]])
+            columns = [column[:count].copy() for column in self._columns]
+            if table != self._table:
+                names = self._names[:count].copy()
+            if int(header[_SEQ]) == seq:
+                break
+        else:
+            logger.warning("Shared price segment stayed busy; serving the previous snapshot")
+            return
+
+        if table != self._table:
+            tickers = tuple(name.decode() for name in names)
+            self._table_cache = (tickers, {t: i for i, t in enumerate(tickers)})
+            self._table = table
+        tickers, index = self._table_cache
+        for column in columns:
+            column.flags.writeable = False
+        previous, self._seen = self._state.version, seq
+        self._state = PriceSnapshot(version, tickers, index, *columns)
+        if version > previous:
+            changed = np.flatnonzero(self._state.stamp > previous)
+            self._notify([tickers[i] for i in changed])
+
+    def _watch(self) -> None:
+        """Start the polling thread on first use."""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(
+                    target=self._poll, name="shared-price-reader", daemon=True
+                )
+                self._watcher.start()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            if self._waiters or self._listeners:
+                self.snapshot()
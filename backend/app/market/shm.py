@@ -0,0 +1,43 @@
+"""Shared-memory segments that outlive the processes that only read them."""
+
+from __future__ import annotations
+
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+_created: set[str] = set()  # Segments created (and not yet unlinked) by this process
+
+
+def create(size: int, name: str | None = None) -> SharedMemory:
+    """Create a segment owned by this process; release it with unlink()."""
+    shm = SharedMemory(name=name, create=True, size=size)
+    _created.add(shm._name)
+    return shm
+
+
+def attach(name: str, inherited_tracker: bool = False) -> SharedMemory:
+    """Map an existing segment without letting this process's exit unlink it.
+
+    Before Python 3.13 every attach registers the segment with this
+    process's resource tracker, which unlinks it when the tracker's
+    processes have all exited. For a process with a tracker of its own (an
+    unrelated reader) the registration is withdrawn, unless this process
+    also created the segment. A multiprocessing child of the creator
+    reports to the creator's tracker, where the registration already exists
+    and withdrawing it would undo the creator's; pass `inherited_tracker`.
+    From 3.13 the segment is simply not tracked.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    shm = SharedMemory(name=name)
+    if not inherited_tracker and shm._name not in _created:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def unlink(shm: SharedMemory) -> None:
+    """Close and unlink a segment made by create()."""
+    shm.close()
+    shm.unlink()
+    _created.discard(shm._name)
@@ -3,27 +3,117 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import math
-import random
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import numpy as np
 
 from .cache import PriceCache
-from .interface import MarketDataSource
-from .seed_prices import (
-    CORRELATION_GROUPS,
-    CROSS_GROUP_CORR,
-    DEFAULT_PARAMS,
-    INTRA_FINANCE_CORR,
-    INTRA_TECH_CORR,
-    SEED_PRICES,
-    TICKER_PARAMS,
-    TSLA_CORR,
+from .clock import SYSTEM_CLOCK, Clock
+from .correlation import (
+    FACTOR_NAMES,
+    EmpiricalCorrelation,
+    FactorCache,
+    cholesky_append,
+    cholesky_delete,
+    is_stable_factor,
+    nearest_correlation,
+    sector_correlation,
+    sector_correlation_matrix,
+    sector_factor_loadings,
 )
+from .fixed_point import FixedPointPriceCache
+from .interface import MarketDataSource
+from .scheduler import Tick, TickScheduler
+from .seed_prices import DEFAULT_PARAMS, SEED_PRICES, TICKER_PARAMS
+
+if TYPE_CHECKING:
+    from .sharded import ShardedSimulator
 
 logger = logging.getLogger(__name__)
 
+# Substream keys (see GBMSimulator.substream)
+FACTOR_STREAM = 0
+NORMAL_STREAM = 1
+EVENT_STREAM = 2
+SEED_PRICE_STREAM = 3
+
+# Removing more than DOWNDATE_LIMIT tickers in one call refactorizes the
+# Cholesky factor instead of downdating it once per removed ticker (each
+# downdate is an O(n) Python loop; a refactorization is one LAPACK call)
+DOWNDATE_LIMIT = 4
+
+# start() builds an in-process simulator over more tickers than this in a
+# thread, off the event loop (the Cholesky factorization is O(n^3))
+INLINE_BUILD_LIMIT = 500
+
+# Distinct due sets whose Cholesky rows are kept gathered (see _factor_rows)
+DUE_ROWS_CACHE = 8
+
+# Midpoint grid over the (event, magnitude, sign) uniforms, for shock moments
+_SHOCK_GRID = np.stack(
+    np.meshgrid([0.0], (np.arange(64) + 0.5) / 64, [0.25, 0.75], indexing="ij"), axis=-1
+).reshape(-1, 3)
+
+
+def _symbol_key(ticker: str) -> int:
+    """Stable 64-bit key for a symbol (unlike hash(), identical across processes)."""
+    return int.from_bytes(hashlib.blake2b(ticker.encode(), digest_size=8).digest(), "little")
+
+
+_WORD = (1 << 64) - 1
+
+
+def _pack_rng(rng: np.random.Generator) -> np.ndarray:
+    """A PCG64 generator's state as six uint64 words (see _unpack_rng)."""
+    state = rng.bit_generator.state
+    inner = state["state"]
+    return np.array(
+        [
+            inner["state"] >> 64,
+            inner["state"] & _WORD,
+            inner["inc"] >> 64,
+            inner["inc"] & _WORD,
+            state["has_uint32"],
+            state["uinteger"],
+        ],
+        dtype=np.uint64,
+    )
+
+
+def _unpack_rng(rng: np.random.Generator, words: np.ndarray) -> None:
+    """Put a generator back into a state saved by _pack_rng."""
+    hi, lo, inc_hi, inc_lo, has_uint32, uinteger = (int(w) for w in words)
+    rng.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": hi << 64 | lo, "inc": inc_hi << 64 | inc_lo},
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioModel:
+    """One step of the simulator's return model for a set of tickers.
+
+    A step's log return is drift + diffusion * z, where z = mixing @ e for
+    independent standard normals e, plus a shock with the given chance.
+    """
+
+    tickers: list[str]
+    drift: np.ndarray  # (m,) log drift per step
+    diffusion: np.ndarray  # (m,) volatility per step
+    mixing: np.ndarray  # (m, k): correlated normals from k independent ones
+    dt: float  # Step length in trading years
+    event_probability: float  # Shock chance per ticker per step
+    shock_mean: float  # Mean log shock size, given a shock
+    shock_var: float  # Variance of the log shock size, given a shock
+
 
 class GBMSimulator:
     """Geometric Brownian Motion simulator for correlated stock prices.
@@ -40,6 +130,38 @@ class GBMSimulator:
 
     The tiny dt (~8.5e-8 for 500ms ticks over 252 trading days * 6.5h/day)
     produces sub-cent moves per tick that accumulate naturally over time.
+
+    Correlation modes:
+        "cholesky" - dense Cholesky factor of the sector correlation matrix.
+                     O(n^2) memory and work per tick; exact for any matrix.
+        "factor"   - sector factor model (market + one factor per group) plus
+                     idiosyncratic noise. Same pairwise correlations, O(n*k)
+                     per tick, for universes too large for a dense factor.
+
+    In "cholesky" mode, `empirical` swaps the sector constants for a
+    correlation matrix estimated from data (see EmpiricalCorrelation), and
+    `factor_cache` keeps full factorizations on disk so restarts and
+    watchlists seen before skip the O(n^3) work.
+
+    Randomness: every ticker draws from its own numpy substreams, derived
+    from a master seed and the symbol (see substream()), and the sector
+    factors from one more. A ticker's path therefore depends only on the seed
+    and its own history, not on which other tickers are simulated alongside
+    it — exactly so in "factor" mode; in "cholesky" mode appending tickers
+    leaves existing ones untouched, while removing one re-mixes the tickers
+    after it. Draws are pre-generated `block_size` ticks at a time (one GEMM
+    per block rather than one GEMV per tick); on watchlist changes only the
+    correlation mixing of the remaining rows is redone, so each ticker
+    still consumes its streams in order.
+
+    Update strides: set_stride(ticker, k) steps a ticker only every k-th
+    step, with one draw covering the k*dt since its last update (drift x k,
+    volatility x sqrt(k), event chance 1 - (1 - p)^k). Its marginal
+    statistics are unchanged, but correlation mixing, exp() and shock
+    handling only run for tickers that are due, so per-tick work follows how
+    often tickers are actually wanted. Tickers sharing a stride stay fully
+    correlated; across strides, comovement only enters through the shared
+    draw at the due step, so it is understated.
     """
 
     # 500ms expressed as a fraction of a trading year
@@ -47,129 +169,612 @@ class GBMSimulator:
     TRADING_SECONDS_PER_YEAR = 252 * 6.5 * 3600  # 5,896,800
     DEFAULT_DT = 0.5 / TRADING_SECONDS_PER_YEAR  # ~8.48e-8
 
+    CORRELATION_MODES = ("cholesky", "factor")
+
     def __init__(
         self,
         tickers: list[str],
         dt: float = DEFAULT_DT,
         event_probability: float = 0.001,
+        correlation: str = "cholesky",
+        seed: int | None = None,
+        block_size: int = 64,
+        empirical: EmpiricalCorrelation | None = None,
+        factor_cache: FactorCache | None = None,
     ) -> None:
+        if correlation not in self.CORRELATION_MODES:
+            raise ValueError(
+                f"Unknown correlation mode {correlation!r}; "
+                f"expected one of {self.CORRELATION_MODES}"
+            )
+        if empirical is not None and correlation != "cholesky":
+            raise ValueError("An empirical correlation matrix requires correlation='cholesky'")
         self._dt = dt
         self._event_prob = event_probability
+        self._correlation = correlation
+        self._empirical = empirical
+        self._factor_cache = factor_cache
 
-        # Per-ticker state
+        # Master seed; fresh OS entropy when not given (read back via .seed)
+        self._seed: int = np.random.SeedSequence(seed).entropy
+        self._factor_rng = self.substream(self._seed, FACTOR_STREAM)
+
+        # Pre-generated draws: row i of each block is one tick for all tickers.
+        # Rows before _block_pos are spent.
+        self._block_size = block_size
+        self._block_pos = block_size  # Nothing buffered yet
+        self._raw = np.empty((block_size, 0))  # independent normals, (block_size, n)
+        self._uniforms = np.empty((block_size, 0, 3))  # event/magnitude/sign, (block_size, n, 3)
+        self._factor_raw = np.empty((block_size, len(FACTOR_NAMES)))  # factor draws
+        self._block: np.ndarray | None = None  # "cholesky" mode: correlated _raw, cached
+
+        # Per-ticker state, stored column-wise: position i in every array
+        # belongs to self._tickers[i], and self._index maps ticker -> i.
         self._tickers: list[str] = []
-        self._prices: dict[str, float] = {}
-        self._params: dict[str, dict[str, float]] = {}
+        self._index: dict[str, int] = {}
+        self._normal_rngs: list[np.random.Generator] = []
+        self._event_rngs: list[np.random.Generator] = []
+        self._prices = np.empty(0)
+        self._drift = np.empty(0)  # (mu - sigma^2/2) * dt, precomputed per ticker
+        self._diffusion = np.empty(0)  # sigma * sqrt(dt), precomputed per ticker
+
+        # Update strides: ticker i is stepped every _stride[i] steps; _synced[i]
+        # is the last step its price accounts for
+        self._stride = np.empty(0, dtype=np.int64)
+        self._synced = np.empty(0, dtype=np.int64)
+        self._strided = False  # Any stride > 1? (otherwise every ticker is due)
+        self._step_count = 0
+        self._last_due: np.ndarray | None = None  # Indices published by the last step; None = all
+        self._due_rows: dict[bytes, np.ndarray] = {}  # Cholesky rows per recurring due set
 
-        # Cholesky decomposition of the correlation matrix (for correlated moves)
+        # Cholesky decomposition of the correlation matrix ("cholesky" mode)
         self._cholesky: np.ndarray | None = None
 
+        # Sector factor loadings and idiosyncratic scale per ticker ("factor" mode)
+        self._loadings = np.empty((0, len(FACTOR_NAMES)))
+        self._idio = np.empty(0)
+
         # Initialize all starting tickers
-        for ticker in tickers:
-            self._add_ticker_internal(ticker)
+        self._add_tickers_internal(tickers)
         self._rebuild_cholesky()
 
     # --- Public API ---
 
-    def step(self) -> dict[str, float]:
+    def step(self, steps: int = 1) -> dict[str, float]:
         """Advance all tickers by one time step. Returns {ticker: new_price}.
 
-        This is the hot path — called every 500ms. Keep it fast.
+        This is the hot path — called every 500ms. The whole tick, shock
+        events included, is a handful of array operations over all tickers.
+        `steps` > 1 covers several time steps in one draw (see advance()).
         """
-        n = len(self._tickers)
-        if n == 0:
-            return {}
+        tickers, prices = self._step_due(steps)
+        return dict(zip(tickers, np.round(prices, 2).tolist()))
 
-        # Generate n independent standard normal draws
-        z_independent = np.random.standard_normal(n)
+    def step_ticks(self, scale: int = 100, steps: int = 1) -> dict[str, int]:
+        """Like step(), with prices as integer ticks of 1/`scale` (100 = cents).
 
-        # Apply Cholesky to get correlated draws
-        if self._cholesky is not None:
-            z_correlated = self._cholesky @ z_independent
+        Rounded once, straight from the price array, for caches that store
+        fixed-point prices (see FixedPointPriceCache).
+        """
+        tickers, prices = self._step_due(steps)
+        return dict(zip(tickers, np.rint(prices * scale).astype(np.int64).tolist()))
+
+    def advance(self, factor_shocks: np.ndarray | None = None, steps: int = 1) -> np.ndarray:
+        """Advance all tickers by one time step and return the price array.
+
+        Prices are unrounded and ordered like get_tickers(). The array is the
+        simulator's live state — copy it if you need to keep it. Tickers that
+        are not due this step (see set_stride) keep their last price.
+
+        In "factor" mode, `factor_shocks` (one standard normal per entry in
+        FACTOR_NAMES) replaces the simulator's own factor draws, so several
+        simulators fed the same shocks stay correlated with each other.
+
+        `steps` > 1 catches up after missed ticks: one draw with dt scaled by
+        `steps` (drift x steps, volatility x sqrt(steps)), an event chance of
+        1 - (1 - p)^steps, and the step counter moved on by `steps`. Strided
+        tickers get the same scaling for all steps since their last update.
+        """
+        if factor_shocks is not None and self._correlation != "factor":
+            raise ValueError("factor_shocks requires correlation='factor'")
+        if steps < 1:
+            raise ValueError("steps must be >= 1")
+        if not self._tickers:
+            return self._prices
+
+        last = self._step_count + steps - 1
+        due: np.ndarray | None = None
+        if self._strided:
+            # Due if any of the covered steps is a multiple of the stride
+            due = np.flatnonzero(last // self._stride > (self._step_count - 1) // self._stride)
+        z, uniforms = self._next_draws(factor_shocks, due)
+        idx = slice(None) if due is None else due
+        span = last - self._synced[idx]  # Steps each ticker's draw covers
+
+        # GBM: S(t+dt) = S(t) * exp((mu - 0.5*sigma^2)*dt + sigma*sqrt(dt)*Z)
+        if due is None and steps == 1 and span.max(initial=1) == 1:
+            log_returns = self._drift + self._diffusion * z
+            event_prob = self._event_prob
         else:
-            z_correlated = z_independent
-
-        result: dict[str, float] = {}
-        for i, ticker in enumerate(self._tickers):
-            params = self._params[ticker]
-            mu = params["mu"]
-            sigma = params["sigma"]
-
-            # GBM: S(t+dt) = S(t) * exp((mu - 0.5*sigma^2)*dt + sigma*sqrt(dt)*Z)
-            drift = (mu - 0.5 * sigma**2) * self._dt
-            diffusion = sigma * math.sqrt(self._dt) * z_correlated[i]
-            self._prices[ticker] *= math.exp(drift + diffusion)
-
-            # Random event: ~0.1% chance per tick per ticker
-            # With 10 tickers at 2 ticks/sec, expect an event ~every 50 seconds
-            if random.random() < self._event_prob:
-                shock_magnitude = random.uniform(0.02, 0.05)
-                shock_sign = random.choice([-1, 1])
-                self._prices[ticker] *= 1 + shock_magnitude * shock_sign
-                logger.debug(
-                    "Random event on %s: %.1f%% %s",
-                    ticker,
-                    shock_magnitude * 100,
-                    "up" if shock_sign > 0 else "down",
-                )
+            log_returns = span * self._drift[idx] + np.sqrt(span) * self._diffusion[idx] * z
+            event_prob = 1.0 - (1.0 - self._event_prob) ** span
+
+        # Random events: ~0.1% chance per tick per ticker of a 2-5% shock.
+        # With 10 tickers at 2 ticks/sec, expect an event ~every 50 seconds
+        hits = uniforms[:, 0] < event_prob
+        if hits.any():
+            events = np.flatnonzero(hits)
+            shocks = self._shock_sizes(uniforms[events])
+            log_returns[events] += np.log1p(shocks)
+            if logger.isEnabledFor(logging.DEBUG):
+                tickers = self._tickers if due is None else [self._tickers[i] for i in due]
+                for i, shock in zip(events.tolist(), shocks.tolist()):
+                    logger.debug(
+                        "Random event on %s: %.1f%% %s",
+                        tickers[i],
+                        abs(shock) * 100,
+                        "up" if shock > 0 else "down",
+                    )
 
-            result[ticker] = round(self._prices[ticker], 2)
+        self._prices[idx] *= np.exp(log_returns)
+        self._synced[idx] = last
+        self._last_due = due
+        self._step_count += steps
+        return self._prices
 
-        return result
+    def simulate(self, n_steps: int) -> np.ndarray:
+        """Advance all tickers n_steps ticks in one batch. Returns prices, shape (n_steps, n).
+
+        Same model as step(), shock events included, but vectorized over
+        time as well as tickers: log-returns are accumulated with a cumulative
+        sum rather than tick by tick. Columns follow get_tickers(); prices are
+        not rounded. Used for offline path generation (see paths.py); update
+        strides do not apply, and strided tickers continue from their last
+        price (steps since their last update are not replayed).
+        """
+        n = len(self._tickers)
+        if n == 0 or n_steps <= 0:
+            return np.empty((max(n_steps, 0), n))
+
+        raw, uniforms, factors = self._take_rows(n_steps)
+        log_returns = self._correlate(raw, factors)
+        log_returns *= self._diffusion
+        log_returns += self._drift
+
+        events = uniforms[:, :, 0] < self._event_prob
+        if events.any():
+            log_returns[events] += np.log1p(self._shock_sizes(uniforms[events]))
+
+        np.cumsum(log_returns, axis=0, out=log_returns)
+        paths = np.exp(log_returns, out=log_returns)
+        paths *= self._prices
+        self._prices = paths[-1].copy()
+        self._step_count += n_steps
+        self._synced[:] = self._step_count - 1
+        return paths
 
     def add_ticker(self, ticker: str) -> None:
-        """Add a ticker to the simulation. Rebuilds the correlation matrix."""
-        if ticker in self._prices:
-            return
-        self._add_ticker_internal(ticker)
-        self._rebuild_cholesky()
+        """Add a ticker to the simulation. Extends the Cholesky factor by one row."""
+        self.add_tickers([ticker])
+
+    def add_tickers(self, tickers: list[str]) -> None:
+        """Add several tickers at once. Already-tracked tickers are ignored.
+
+        The Cholesky factor is extended once by a block of rows, so adding
+        m tickers costs one O(n^2 m) update rather than m separate ones.
+        """
+        start = len(self._tickers)
+        self._add_tickers_internal(tickers)
+        if self._correlation == "cholesky" and len(self._tickers) > start:
+            self._extend_cholesky(start)
 
     def remove_ticker(self, ticker: str) -> None:
-        """Remove a ticker from the simulation. Rebuilds the correlation matrix."""
-        if ticker not in self._prices:
+        """Remove a ticker from the simulation. Downdates the Cholesky factor."""
+        self.remove_tickers([ticker])
+
+    def remove_tickers(self, tickers: list[str]) -> None:
+        """Remove several tickers at once. Unknown tickers are ignored.
+
+        Every state array is compacted in one pass. The Cholesky factor is
+        downdated row by row for a handful of removals and refactorized once
+        for anything larger.
+        """
+        drop = sorted({self._index[t] for t in tickers if t in self._index})
+        if not drop:
             return
-        self._tickers.remove(ticker)
-        del self._prices[ticker]
-        del self._params[ticker]
-        self._rebuild_cholesky()
+        if self._correlation == "cholesky":
+            if len(drop) > DOWNDATE_LIMIT:
+                self._cholesky = None  # Cheaper to refactorize below
+            else:
+                for k in reversed(drop):  # Highest index first keeps the rest valid
+                    self._shrink_cholesky(k)
+                    if self._cholesky is None:
+                        break
+
+        dropped = set(drop)
+        self._tickers = [t for i, t in enumerate(self._tickers) if i not in dropped]
+        self._index = {t: i for i, t in enumerate(self._tickers)}
+        self._prices = np.delete(self._prices, drop)
+        self._drift = np.delete(self._drift, drop)
+        self._diffusion = np.delete(self._diffusion, drop)
+        self._stride = np.delete(self._stride, drop)
+        self._synced = np.delete(self._synced, drop)
+        self._strided = bool((self._stride > 1).any())
+        for k in reversed(drop):
+            del self._normal_rngs[k], self._event_rngs[k]
+        self._raw = np.delete(self._raw, drop, axis=1)
+        self._uniforms = np.delete(self._uniforms, drop, axis=1)
+        self._block = None
+        self._due_rows.clear()
+        if self._correlation == "factor":
+            self._loadings = np.delete(self._loadings, drop, axis=0)
+            self._idio = np.delete(self._idio, drop)
+        elif self._cholesky is None:
+            # Downdate was skipped or was unstable — refactorize from scratch
+            self._rebuild_cholesky()
 
     def get_price(self, ticker: str) -> float | None:
         """Current price for a ticker, or None if not tracked."""
-        return self._prices.get(ticker)
+        i = self._index.get(ticker)
+        return None if i is None else float(self._prices[i])
 
     def get_tickers(self) -> list[str]:
         """Return the list of currently tracked tickers."""
         return list(self._tickers)
 
+    def set_stride(self, ticker: str, stride: int) -> None:
+        """Step and publish a ticker only every `stride` steps (1 = every step).
+
+        Steps are phase-aligned: all tickers with the same stride come due on
+        the same steps. No-op for an unknown ticker.
+        """
+        if stride < 1:
+            raise ValueError("stride must be >= 1")
+        i = self._index.get(ticker)
+        if i is None:
+            return
+        self._stride[i] = stride
+        self._strided = bool((self._stride > 1).any())
+
+    def scenario_model(self, tickers: list[str]) -> ScenarioModel:
+        """The per-step return model for `tickers`, for risk simulation.
+
+        Uses the same drift, volatility and correlation structure (Cholesky
+        rows or factor loadings) as step(). Raises ValueError for tickers
+        that are not simulated.
+        """
+        missing = [t for t in tickers if t not in self._index]
+        if missing:
+            raise ValueError(f"Tickers not simulated: {', '.join(missing)}")
+        idx = np.array([self._index[t] for t in tickers], dtype=np.intp)
+        if self._correlation == "factor":
+            mixing = np.hstack((self._loadings[idx], np.diag(self._idio[idx])))
+        elif self._cholesky is not None and idx.size:
+            # Rows are lower-triangular: columns past the largest index are zero
+            mixing = self._cholesky[idx, : idx.max() + 1]
+        else:
+            mixing = np.eye(idx.size)
+        log_shocks = np.log1p(self._shock_sizes(_SHOCK_GRID))
+        return ScenarioModel(
+            tickers=list(tickers),
+            drift=self._drift[idx],
+            diffusion=self._diffusion[idx],
+            mixing=mixing,
+            dt=self._dt,
+            event_probability=self._event_prob,
+            shock_mean=float(log_shocks.mean()),
+            shock_var=float(log_shocks.var()),
+        )
+
+    def checkpoint(self) -> dict[str, np.ndarray]:
+        """Prices and random state as plain arrays, for restore() after a restart.
+
+        Includes each ticker's generator states and the pre-generated draws
+        not yet consumed, so a restored simulator continues the exact paths.
+        """
+        pos = min(self._block_pos, self._block_size)
+        n = len(self._tickers)
+        return {
+            "seed": np.array(str(self._seed)),
+            "tickers": np.array(self._tickers, dtype=str),
+            "prices": self._prices.copy(),
+            "normal_rng": np.array([_pack_rng(r) for r in self._normal_rngs]).reshape(n, 6),
+            "event_rng": np.array([_pack_rng(r) for r in self._event_rngs]).reshape(n, 6),
+            "factor_rng": _pack_rng(self._factor_rng),
+            "raw": self._raw[pos:].copy(),
+            "uniforms": self._uniforms[pos:].copy(),
+            "factor_raw": self._factor_raw[pos:].copy(),
+        }
+
+    def restore(self, state: Mapping[str, np.ndarray]) -> list[str]:
+        """Resume the tickers saved by checkpoint() that are simulated here.
+
+        Their prices, random streams and buffered draws are restored; other
+        tickers keep their fresh state. Build the simulator with the saved
+        seed (int(state["seed"])) so tickers added later draw the same
+        streams as before. Returns the restored tickers.
+        """
+        saved = [str(t) for t in state["tickers"]]
+        pairs = [(j, self._index[t]) for j, t in enumerate(saved) if t in self._index]
+        if not pairs:
+            return []
+        src = np.array([j for j, _ in pairs], dtype=np.intp)
+        dst = np.array([i for _, i in pairs], dtype=np.intp)
+        self._prices[dst] = state["prices"][src]
+        for j, i in pairs:
+            _unpack_rng(self._normal_rngs[i], state["normal_rng"][j])
+            _unpack_rng(self._event_rngs[i], state["event_rng"][j])
+        _unpack_rng(self._factor_rng, state["factor_rng"])
+
+        # Restored tickers continue from their saved draws; the rest draw fresh rows
+        rest = min(len(state["raw"]), self._block_size)
+        pos = self._block_size - rest
+        n = len(self._tickers)
+        self._raw = np.zeros((self._block_size, n))
+        self._uniforms = np.ones((self._block_size, n, 3))
+        self._raw[pos:, dst] = state["raw"][:rest, src]
+        self._uniforms[pos:, dst] = state["uniforms"][:rest, src]
+        for i in np.setdiff1d(np.arange(n), dst):
+            self._raw[pos:, i] = self._normal_rngs[i].standard_normal(rest)
+            self._uniforms[pos:, i] = self._event_rngs[i].random((rest, 3))
+        self._factor_raw[pos:] = state["factor_raw"][:rest]
+        self._block_pos = pos
+        self._block = None
+        return [saved[j] for j in src]
+
+    @property
+    def seed(self) -> int:
+        """Master seed. Pass it back in to replay the same price paths."""
+        return self._seed
+
+    @staticmethod
+    def substream(seed: int, *key: int) -> np.random.Generator:
+        """Independent random stream derived from a master seed and an integer key."""
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
     # --- Internals ---
 
-    def _add_ticker_internal(self, ticker: str) -> None:
-        """Add a ticker without rebuilding Cholesky (for batch initialization)."""
-        if ticker in self._prices:
+    def _step_due(self, steps: int) -> tuple[list[str], np.ndarray]:
+        """Advance, then return the tickers published by this step and their prices."""
+        if not self._tickers:
+            return [], np.empty(0)
+        prices = self.advance(steps=steps)
+        due = self._last_due
+        if due is None:
+            return self._tickers, prices
+        return [self._tickers[i] for i in due.tolist()], prices[due]
+
+    def _draw_rows(self, size: int, first: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """Draw `size` rows of raw normals and event uniforms for tickers[first:].
+
+        Returns (raw, uniforms) with shapes (size, m) and (size, m, 3). Each
+        column comes from that ticker's own substreams.
+        """
+        m = len(self._tickers) - first
+        raw = np.empty((size, m))
+        uniforms = np.empty((size, m, 3))
+        for j in range(m):
+            raw[:, j] = self._normal_rngs[first + j].standard_normal(size)
+            uniforms[:, j] = self._event_rngs[first + j].random((size, 3))
+        return raw, uniforms
+
+    def _correlate(self, raw: np.ndarray, factors: np.ndarray) -> np.ndarray:
+        """Turn independent normals (rows, n) into correlated ones."""
+        if self._correlation == "factor":
+            return raw * self._idio + factors @ self._loadings.T
+        if self._cholesky is not None:
+            return raw @ self._cholesky.T
+        return raw.copy()
+
+    def _refill(self) -> None:
+        """Draw the next block of raw draws for every ticker."""
+        self._raw, self._uniforms = self._draw_rows(self._block_size)
+        self._factor_raw = self._factor_rng.standard_normal((self._block_size, len(FACTOR_NAMES)))
+        self._block = None
+        self._block_pos = 0
+
+    def _take_rows(self, size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Consume `size` ticks of raw draws: buffered rows first, then fresh ones.
+
+        Returns (raw, uniforms, factors). Keeps every stream in sequence, so
+        batch consumers (simulate) and step() share one path.
+        """
+        pos = self._block_pos
+        buffered = min(size, self._block_size - pos)
+        raw = self._raw[pos : pos + buffered]
+        uniforms = self._uniforms[pos : pos + buffered]
+        factors = self._factor_raw[pos : pos + buffered]
+        self._block_pos += buffered
+        if buffered < size:
+            more_raw, more_uniforms = self._draw_rows(size - buffered)
+            more_factors = self._factor_rng.standard_normal((size - buffered, len(FACTOR_NAMES)))
+            raw = np.concatenate((raw, more_raw))
+            uniforms = np.concatenate((uniforms, more_uniforms))
+            factors = np.concatenate((factors, more_factors))
+        return raw, uniforms, factors
+
+    def _next_draws(
+        self, factor_shocks: np.ndarray | None = None, due: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Correlated normals (n,) and event uniforms (n, 3) for one tick.
+
+        With `due` given, only those tickers' rows are mixed and returned
+        (every ticker's streams still advance by one row).
+        """
+        if self._block_pos >= self._block_size:
+            self._refill()
+        i = self._block_pos
+        self._block_pos += 1
+
+        if self._correlation == "factor":
+            factors = self._factor_raw[i] if factor_shocks is None else factor_shocks
+            if due is not None:
+                z = self._raw[i, due] * self._idio[due] + self._loadings[due] @ factors
+                return z, self._uniforms[i, due]
+            z = self._raw[i] * self._idio + self._loadings @ factors
+        elif due is not None:
+            # Mix only the due rows: O(due * n) instead of O(n^2) per tick
+            raw = self._raw[i]
+            if self._cholesky is None:
+                z = raw[due]
+            elif 2 * due.size < len(self._tickers):
+                z = self._factor_rows(due) @ raw
+            else:
+                z = (self._cholesky @ raw)[due]  # Cheaper than gathering most rows
+            return z, self._uniforms[i, due]
+        else:
+            if self._block is None:
+                # One GEMM for every remaining row of the block
+                self._block = np.empty_like(self._raw)
+                self._block[i:] = self._correlate(self._raw[i:], self._factor_raw[i:])
+            z = self._block[i]
+        return z, self._uniforms[i]
+
+    def _factor_rows(self, due: np.ndarray) -> np.ndarray:
+        """Cholesky rows for a due set. Tiers repeat a few due sets, so they are cached."""
+        key = due.tobytes()
+        rows = self._due_rows.get(key)
+        if rows is None:
+            if len(self._due_rows) >= DUE_ROWS_CACHE:
+                self._due_rows.clear()
+            rows = self._due_rows[key] = self._cholesky[due]
+        return rows
+
+    @staticmethod
+    def _shock_sizes(uniforms: np.ndarray) -> np.ndarray:
+        """Signed 2-5% shock sizes from (events, 3) uniforms [event, magnitude, sign]."""
+        magnitude = 0.02 + 0.03 * uniforms[:, 1]
+        return np.where(uniforms[:, 2] < 0.5, -magnitude, magnitude)
+
+    def _add_tickers_internal(self, tickers: list[str]) -> None:
+        """Append tickers to the state arrays without rebuilding Cholesky."""
+        new: list[str] = []
+        for ticker in tickers:
+            if ticker not in self._index:
+                self._index[ticker] = len(self._tickers)
+                self._tickers.append(ticker)
+                new.append(ticker)
+        if not new:
             return
-        self._tickers.append(ticker)
-        self._prices[ticker] = SEED_PRICES.get(ticker, random.uniform(50.0, 300.0))
-        self._params[ticker] = TICKER_PARAMS.get(ticker, dict(DEFAULT_PARAMS))
+
+        # Newly added tickers join the current block for its remaining rows
+        first = len(self._tickers) - len(new)
+        keys = [_symbol_key(t) for t in new]
+        self._normal_rngs += [self.substream(self._seed, NORMAL_STREAM, k) for k in keys]
+        self._event_rngs += [self.substream(self._seed, EVENT_STREAM, k) for k in keys]
+        pos = min(self._block_pos, self._block_size)
+        raw = np.zeros((self._block_size, len(new)))
+        uniforms = np.ones((self._block_size, len(new), 3))
+        raw[pos:], uniforms[pos:] = self._draw_rows(self._block_size - pos, first)
+        self._raw = np.concatenate((self._raw, raw), axis=1)
+        self._uniforms = np.concatenate((self._uniforms, uniforms), axis=1)
+        self._block = None
+        self._due_rows.clear()
+
+        params = [TICKER_PARAMS.get(t, DEFAULT_PARAMS) for t in new]
+        mu = np.array([p["mu"] for p in params])
+        sigma = np.array([p["sigma"] for p in params])
+        prices = np.array(
+            [
+                SEED_PRICES[t]
+                if t in SEED_PRICES
+                else self.substream(self._seed, SEED_PRICE_STREAM, k).uniform(50.0, 300.0)
+                for t, k in zip(new, keys)
+            ]
+        )
+
+        self._prices = np.concatenate((self._prices, prices))
+        self._drift = np.concatenate((self._drift, (mu - 0.5 * sigma**2) * self._dt))
+        self._diffusion = np.concatenate((self._diffusion, sigma * math.sqrt(self._dt)))
+        self._stride = np.concatenate((self._stride, np.ones(len(new), dtype=np.int64)))
+        self._synced = np.concatenate(
+            (self._synced, np.full(len(new), self._step_count - 1, dtype=np.int64))
+        )
+        if self._correlation == "factor":
+            loadings, idio = sector_factor_loadings(new)
+            self._loadings = np.concatenate((self._loadings, loadings))
+            self._idio = np.concatenate((self._idio, idio))
 
     def _rebuild_cholesky(self) -> None:
-        """Rebuild the Cholesky decomposition of the ticker correlation matrix.
+        """Rebuild the Cholesky decomposition of the ticker correlation matrix from scratch.
 
-        Called whenever tickers are added or removed. O(n^2) but n < 50.
+        Used at construction and as the fallback when an incremental update
+        fails. O(n^3), with the correlation matrix built by array lookups.
         """
         n = len(self._tickers)
+        if n <= 1 or self._correlation != "cholesky":
+            self._cholesky = None
+            return
+        key = None
+        if self._factor_cache is not None:
+            source = self._empirical.fingerprint if self._empirical else "sector"
+            key = FactorCache.key(self._tickers, source)
+            cached = self._factor_cache.load(key, n)
+            if cached is not None:
+                self._cholesky = cached
+                return
+
+        if self._empirical is None:
+            self._cholesky = np.linalg.cholesky(sector_correlation_matrix(self._tickers))
+        else:
+            corr = self._empirical.matrix(self._tickers)
+            try:
+                self._cholesky = np.linalg.cholesky(corr)
+            except np.linalg.LinAlgError:
+                logger.debug("Blended correlation matrix not positive definite; repairing")
+                self._cholesky = np.linalg.cholesky(nearest_correlation(corr))
+        if key is not None:
+            self._factor_cache.store(key, self._cholesky)
+
+    def _extend_cholesky(self, start: int) -> None:
+        """Extend the factor with rows for self._tickers[start:], which were just appended."""
+        n = len(self._tickers)
         if n <= 1:
             self._cholesky = None
             return
+        if start == 0:
+            self._rebuild_cholesky()
+            return
 
-        # Build the correlation matrix
-        corr = np.eye(n)
-        for i in range(n):
-            for j in range(i + 1, n):
-                rho = self._pairwise_correlation(self._tickers[i], self._tickers[j])
-                corr[i, j] = rho
-                corr[j, i] = rho
+        lower = self._cholesky if self._cholesky is not None else np.ones((1, 1))
+        old, new = self._tickers[:start], self._tickers[start:]
+        try:
+            extended = cholesky_append(
+                lower, self._pair_correlation(new, old), self._correlation_matrix(new)
+            )
+        except np.linalg.LinAlgError:
+            extended = None
+        if extended is None or not is_stable_factor(extended, start):
+            logger.debug("Incremental Cholesky update unstable; rebuilding")
+            self._rebuild_cholesky()
+            return
+        self._cholesky = extended
+
+    def _pair_correlation(self, rows: list[str], cols: list[str]) -> np.ndarray:
+        if self._empirical is not None:
+            return self._empirical.correlation(rows, cols)
+        return sector_correlation(rows, cols)
+
+    def _correlation_matrix(self, tickers: list[str]) -> np.ndarray:
+        if self._empirical is not None:
+            return self._empirical.matrix(tickers)
+        return sector_correlation_matrix(tickers)
 
-        self._cholesky = np.linalg.cholesky(corr)
+    def _shrink_cholesky(self, k: int) -> None:
+        """Drop row/column k from the factor before the ticker's state is deleted.
+
+        Leaves self._cholesky as None when the caller must rebuild instead
+        (fewer than two tickers remain, or the downdate lost stability).
+        """
+        n = self._cholesky.shape[0] if self._cholesky is not None else 0
+        if n <= 2:
+            self._cholesky = None
+            return
+        shrunk = cholesky_delete(self._cholesky, k)
+        if not is_stable_factor(shrunk, k):
+            logger.debug("Incremental Cholesky downdate unstable; rebuilding")
+            shrunk = None
+        self._cholesky = shrunk
 
     @staticmethod
     def _pairwise_correlation(t1: str, t2: str) -> float:
@@ -182,19 +787,7 @@ class GBMSimulator:
           - Cross-sector:       0.3
           - Unknown tickers:    0.3
         """
-        tech = CORRELATION_GROUPS["tech"]
-        finance = CORRELATION_GROUPS["finance"]
-
-        # TSLA is in tech set but behaves independently
-        if t1 == "TSLA" or t2 == "TSLA":
-            return TSLA_CORR
-
-        if t1 in tech and t2 in tech:
-            return INTRA_TECH_CORR
-        if t1 in finance and t2 in finance:
-            return INTRA_FINANCE_CORR
-
-        return CROSS_GROUP_CORR
+        return float(sector_correlation([t1], [t2])[0, 0])
 
 
 class SimulatorDataSource(MarketDataSource):
@@ -202,32 +795,154 @@ class SimulatorDataSource(MarketDataSource):
 
     Runs a background asyncio task that calls GBMSimulator.step() every
     `update_interval` seconds and writes results to the PriceCache.
+
+    Use correlation="factor" for very large universes (see GBMSimulator).
+    With workers > 0 the universe is split across that many processes by a
+    ShardedSimulator (always factor-correlated), and each tick is awaited in
+    a thread so the event loop keeps serving requests meanwhile.
+
+    Executors (where the stepping and cache writes run):
+        "loop"    - on the asyncio event loop (default).
+        "thread"  - in a dedicated worker thread; the event loop does no
+                    per-tick work and readers just see finished ticks in
+                    the PriceCache, whose lock makes this safe.
+        "process" - like "thread", with the simulation itself in a
+                    subprocess (a ShardedSimulator with max(workers, 1)
+                    workers).
+
+    Pass `seed` to replay identical price paths run-to-run; the seed in use
+    is logged at start either way.
+
+    Rate tiers: `tiers` maps tier names to update intervals, e.g.
+    {"focus": 0.1, "watchlist": 0.5, "background": 5.0}, and
+    set_ticker_tier() assigns tickers to them (unassigned tickers update
+    every `update_interval`). The loop ticks at the fastest interval and
+    each ticker is stepped and published only at its tier's rate via
+    GBMSimulator strides, so per-tick work tracks the tickers that are due.
+    dt and the event probability are scaled to the base tick, so a ticker's
+    price statistics per wall-clock second do not depend on its tier. Not
+    available with workers > 0.
+
+    Ticks fire on a drift-free TickScheduler. If a tick overruns, the missed
+    ticks are handled per `missed_ticks`: "skip" drops them (simulated time
+    falls behind the wall clock), "catch_up" takes one step with dt scaled
+    to cover the gap.
+
+    `clock` drives the tick schedule and the update timestamps; pass a
+    VirtualClock to run accelerated or as fast as possible.
+
+    `correlation_file` loads an empirical correlation or covariance matrix
+    (see EmpiricalCorrelation.from_file) for tickers it covers, and
+    `factor_cache_dir` caches Cholesky factorizations there across restarts.
+    Both apply to the in-process "cholesky" simulator only.
+
+    With a FixedPointPriceCache, in-process ticks are published as integer
+    ticks at the cache's scale (GBMSimulator.step_ticks).
+
+    Warm restarts: checkpoint_state() captures the in-process simulator's
+    prices and random state, and restore() before start() resumes from it
+    (see checkpoint.py); worker processes always start from seed prices.
     """
 
+    EXECUTORS = ("loop", "thread", "process")
+
     def __init__(
         self,
         price_cache: PriceCache,
         update_interval: float = 0.5,
         event_probability: float = 0.001,
+        correlation: str = "cholesky",
+        workers: int = 0,
+        seed: int | None = None,
+        executor: str = "loop",
+        tiers: dict[str, float] | None = None,
+        missed_ticks: str = "skip",
+        correlation_file: str | None = None,
+        factor_cache_dir: str | None = None,
+        clock: Clock = SYSTEM_CLOCK,
     ) -> None:
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}; expected one of {self.EXECUTORS}")
+        if tiers and (workers > 0 or executor == "process"):
+            raise ValueError("Rate tiers are not supported with worker processes")
+        if correlation_file and (workers > 0 or executor == "process"):
+            raise ValueError("Empirical correlations are not supported with worker processes")
+        if missed_ticks not in TickScheduler.POLICIES:
+            raise ValueError(
+                f"Unknown missed_ticks policy {missed_ticks!r}; "
+                f"expected one of {TickScheduler.POLICIES}"
+            )
         self._cache = price_cache
         self._interval = update_interval
         self._event_prob = event_probability
-        self._sim: GBMSimulator | None = None
+        self._correlation = correlation
+        self._workers = max(workers, 1) if executor == "process" else workers
+        self._seed = seed
+        self._executor = executor
+        self._missed_ticks = missed_ticks
+        self._correlation_file = correlation_file
+        self._factor_cache_dir = factor_cache_dir
+        self._clock = clock
+
+        # Rate tiers: the loop ticks at the fastest interval; each tier's stride
+        # is its interval in base ticks
+        self._tiers = dict(tiers or {})
+        self._tick_interval = min([update_interval, *self._tiers.values()])
+        self._default_stride = self._stride_for(update_interval)
+        self._tier_strides = {name: self._stride_for(iv) for name, iv in self._tiers.items()}
+        self._tier_of: dict[str, str] = {}
+
+        self._sim: GBMSimulator | ShardedSimulator | None = None
         self._task: asyncio.Task | None = None
 
+        # "thread"/"process" executors: the stepping thread and its stop signal.
+        # _sim_lock serializes a tick (step + cache writes) against watchlist edits.
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._sim_lock = threading.Lock()
+        # Tickers whose tier changed, applied by the stepping thread at its next tick
+        self._retiered: set[str] = set()
+        self._restored: Mapping[str, np.ndarray] | None = None  # Applied by start()
+
     async def start(self, tickers: list[str]) -> None:
-        self._sim = GBMSimulator(
-            tickers=tickers,
-            event_probability=self._event_prob,
-        )
+        if self._workers > 0:
+            # Imported here: sharded.py builds on GBMSimulator from this module
+            from .sharded import ShardedSimulator
+
+            self._sim = await asyncio.to_thread(
+                ShardedSimulator,
+                tickers=tickers,
+                workers=self._workers,
+                event_probability=self._event_prob,
+                seed=self._seed,
+            )
+        else:
+            reads_files = self._correlation_file or self._factor_cache_dir
+            if reads_files or len(tickers) > INLINE_BUILD_LIMIT:
+                # File reads, correlation repair and the factorization would
+                # stall the event loop
+                self._sim = await asyncio.to_thread(self._build, tickers)
+            else:
+                self._sim = self._build(tickers)
+            for ticker in tickers:
+                self._apply_tier(ticker)
         # Seed the cache with initial prices so SSE has data immediately
-        for ticker in tickers:
-            price = self._sim.get_price(ticker)
-            if price is not None:
-                self._cache.update(ticker=ticker, price=price)
-        self._task = asyncio.create_task(self._run_loop(), name="simulator-loop")
-        logger.info("Simulator started with %d tickers", len(tickers))
+        self._seed_cache(tickers)
+
+        if self._executor == "loop":
+            self._task = asyncio.create_task(self._run_loop(), name="simulator-loop")
+        else:
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run_thread, name="simulator-thread", daemon=True
+            )
+            self._thread.start()
+        logger.info(
+            "Simulator started with %d tickers (seed=%d, executor=%s)",
+            len(tickers),
+            self._sim.seed,
+            self._executor,
+        )
 
     async def stop(self) -> None:
         if self._task and not self._task.done():
@@ -237,34 +952,208 @@ class SimulatorDataSource(MarketDataSource):
             except asyncio.CancelledError:
                 pass
         self._task = None
+        if self._thread is not None:
+            self._stop_event.set()
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+        if self._workers > 0 and self._sim is not None:
+            await asyncio.to_thread(self._sim.close)
         logger.info("Simulator stopped")
 
     async def add_ticker(self, ticker: str) -> None:
-        if self._sim:
-            self._sim.add_ticker(ticker)
-            # Seed cache immediately so the ticker has a price right away
-            price = self._sim.get_price(ticker)
-            if price is not None:
-                self._cache.update(ticker=ticker, price=price)
-            logger.info("Simulator: added ticker %s", ticker)
+        await self.add_tickers([ticker])
+
+    async def add_tickers(self, tickers: list[str]) -> None:
+        if not self._sim:
+            return
+        known = set(self._sim.get_tickers())
+        new = [t for t in dict.fromkeys(tickers) if t not in known]
+        if not new:
+            return
+        if self._offloaded:
+            # Refactorization, worker round-trips and waiting out a tick in
+            # progress all stay off the event loop
+            await asyncio.to_thread(self._add_tickers, new)
+        else:
+            self._add_tickers(new)
+        logger.info("Simulator: added %d ticker(s): %s", len(new), ", ".join(new[:10]))
 
     async def remove_ticker(self, ticker: str) -> None:
-        if self._sim:
-            self._sim.remove_ticker(ticker)
-        self._cache.remove(ticker)
-        logger.info("Simulator: removed ticker %s", ticker)
+        await self.remove_tickers([ticker])
+
+    async def remove_tickers(self, tickers: list[str]) -> None:
+        if self._offloaded:
+            await asyncio.to_thread(self._remove_tickers, tickers)
+        else:
+            self._remove_tickers(tickers)
+        logger.info("Simulator: removed %d ticker(s): %s", len(tickers), ", ".join(tickers[:10]))
 
     def get_tickers(self) -> list[str]:
         return self._sim.get_tickers() if self._sim else []
 
+    def scenario_model(self, tickers: list[str]) -> ScenarioModel:
+        """The simulator's return model for `tickers` (see GBMSimulator.scenario_model).
+
+        Taken between ticks, so it never sees a watchlist edit half-applied.
+        Not available with worker processes.
+        """
+        if not isinstance(self._sim, GBMSimulator):
+            raise ValueError("Scenario models need a running in-process simulator")
+        with self._sim_lock:
+            return self._sim.scenario_model(tickers)
+
+    def restore(self, state: Mapping[str, np.ndarray]) -> None:
+        """Resume from a GBMSimulator.checkpoint() when start() is called.
+
+        Ignored with worker processes, or if `seed` was given and differs
+        from the checkpoint's.
+        """
+        self._restored = state
+
+    def checkpoint_state(self) -> dict[str, np.ndarray] | None:
+        """The simulator's state for a warm restart, or None with worker processes."""
+        if not isinstance(self._sim, GBMSimulator):
+            return None
+        with self._sim_lock:
+            return self._sim.checkpoint()
+
+    def set_ticker_tier(self, ticker: str, tier: str | None) -> None:
+        """Assign a ticker to a rate tier, or back to `update_interval` with None.
+
+        May be called before the ticker is added; the assignment sticks.
+        With the "thread" executor the new rate is applied by the stepping
+        thread at its next tick, so this never waits for a tick in progress.
+        """
+        if tier is not None and tier not in self._tiers:
+            raise ValueError(f"Unknown tier {tier!r}; configured tiers are {list(self._tiers)}")
+        if tier is None:
+            self._tier_of.pop(ticker, None)
+        else:
+            self._tier_of[ticker] = tier
+        if self._thread is not None:
+            self._retiered.add(ticker)
+            return
+        with self._sim_lock:
+            self._apply_tier(ticker)
+
+    @property
+    def _offloaded(self) -> bool:
+        """Whether simulator work runs off the event loop (workers or a stepping thread)."""
+        return self._workers > 0 or self._executor != "loop"
+
+    def _add_tickers(self, tickers: list[str]) -> None:
+        """Add tickers to the simulation and seed their cache entries."""
+        with self._sim_lock:
+            self._sim.add_tickers(tickers)
+            for ticker in tickers:
+                self._apply_tier(ticker)
+            # Seed cache immediately so the tickers have a price right away
+            self._seed_cache(tickers)
+
+    def _remove_tickers(self, tickers: list[str]) -> None:
+        with self._sim_lock:
+            if self._sim:
+                self._sim.remove_tickers(tickers)
+            self._cache.remove_many(tickers)
+
+    def _seed_cache(self, tickers: list[str]) -> None:
+        """Write the simulator's current prices for `tickers` as one cache batch."""
+        prices = {t: p for t in tickers if (p := self._sim.get_price(t)) is not None}
+        self._cache.update_many(prices, timestamp=self._clock.time())
+
+    def _stride_for(self, interval: float) -> int:
+        """Number of base ticks per `interval`; intervals must be whole multiples."""
+        stride = round(interval / self._tick_interval)
+        if abs(stride * self._tick_interval - interval) > 1e-9 * interval:
+            raise ValueError(
+                f"Tier interval {interval}s is not a multiple of the base tick "
+                f"{self._tick_interval}s"
+            )
+        return stride
+
+    def _build(self, tickers: list[str]) -> GBMSimulator:
+        """The in-process simulator, resumed from restore()'s state if any."""
+        # Scale the per-step dt and event probability to the base tick so
+        # simulated time keeps the pace set by update_interval
+        ratio = self._tick_interval / self._interval
+        event_prob = self._event_prob if ratio == 1 else 1 - (1 - self._event_prob) ** ratio
+        empirical = factor_cache = None
+        if self._correlation_file:
+            empirical = EmpiricalCorrelation.from_file(self._correlation_file)
+        if self._factor_cache_dir:
+            factor_cache = FactorCache(self._factor_cache_dir)
+        seed, restored = self._seed, self._restored
+        if restored is not None:
+            if seed is None or seed == int(restored["seed"]):
+                seed = int(restored["seed"])
+            else:
+                logger.warning("Checkpoint was saved with another seed; starting fresh")
+                restored = None
+        sim = GBMSimulator(
+            tickers=tickers,
+            dt=GBMSimulator.DEFAULT_DT * ratio,
+            event_probability=event_prob,
+            correlation=self._correlation,
+            seed=seed,
+            empirical=empirical,
+            factor_cache=factor_cache,
+        )
+        if restored is not None:
+            resumed = sim.restore(restored)
+            logger.info("Simulator resumed %d ticker(s) from checkpoint", len(resumed))
+        return sim
+
+    def _apply_tier(self, ticker: str) -> None:
+        """Push a ticker's stride to the simulator (caller holds _sim_lock)."""
+        if isinstance(self._sim, GBMSimulator):
+            tier = self._tier_of.get(ticker)
+            stride = self._default_stride if tier is None else self._tier_strides[tier]
+            self._sim.set_stride(ticker, stride)
+
+    def _scheduler(self) -> TickScheduler:
+        return TickScheduler(self._tick_interval, policy=self._missed_ticks, clock=self._clock)
+
+    def _tick(self, tick: Tick | None = None) -> None:
+        """Step the simulation once and publish the prices. Safe from any thread."""
+        steps = 1
+        if tick is not None:
+            steps = tick.intervals
+            if tick.missed:
+                logger.debug(
+                    "Simulator tick %d ran %.3fs late (%d missed, policy=%s)",
+                    tick.index,
+                    tick.lateness,
+                    tick.missed,
+                    self._missed_ticks,
+                )
+        with self._sim_lock:
+            while self._retiered:
+                self._apply_tier(self._retiered.pop())
+            cache = self._cache
+            if isinstance(cache, FixedPointPriceCache) and isinstance(self._sim, GBMSimulator):
+                # Integer ticks straight from the simulator: no float rounding on the way
+                ticks = self._sim.step_ticks(cache.scale, steps)
+                cache.update_ticks(ticks, timestamp=self._clock.time())
+            elif self._sim:
+                # One batch: readers never see half a tick, and it is one version
+                self._cache.update_many(self._sim.step(steps), timestamp=self._clock.time())
+
     async def _run_loop(self) -> None:
-        """Core loop: step the simulation, write to cache, sleep."""
-        while True:
+        """Core loop: step the simulation and write to cache on every tick."""
+        async for tick in self._scheduler():
+            try:
+                if self._workers > 0:
+                    await asyncio.to_thread(self._tick, tick)
+                else:
+                    self._tick(tick)
+            except Exception:
+                logger.exception("Simulator step failed")
+
+    def _run_thread(self) -> None:
+        """Dedicated-thread loop for the "thread"/"process" executors."""
+        scheduler = self._scheduler()
+        while (tick := scheduler.wait(self._stop_event)) is not None:
             try:
-                if self._sim:
-                    prices = self._sim.step()
-                    for ticker, price in prices.items():
-                        self._cache.update(ticker=ticker, price=price)
+                self._tick(tick)
             except Exception:
                 logger.exception("Simulator step failed")
-            await asyncio.sleep(self._interval)
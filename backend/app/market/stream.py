@@ -7,28 +7,39 @@ import json
 import logging
 from collections.abc import AsyncGenerator
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
+from .bars import BarAggregator
 from .cache import PriceCache
+from .clock import SYSTEM_CLOCK, Clock
+from .history import PriceHistory
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/stream", tags=["streaming"])
 
 
-def create_stream_router(price_cache: PriceCache) -> APIRouter:
+def create_stream_router(
+    price_cache: PriceCache,
+    clock: Clock = SYSTEM_CLOCK,
+    history: PriceHistory | None = None,
+    bars: BarAggregator | None = None,
+) -> APIRouter:
     """Create the SSE streaming router with a reference to the price cache.
 
-    This factory pattern lets us inject the PriceCache without globals.
+    This factory pattern lets us inject the PriceCache (and the clock that
+    dates history windows) without globals. With a PriceHistory attached to the
+    cache, GET /api/stream/history serves recent points for backfill; with
+    a BarAggregator, GET /api/stream/bars serves OHLC candles.
     """
 
     @router.get("/prices")
     async def stream_prices(request: Request) -> StreamingResponse:
         """SSE endpoint for live price updates.
 
-        Streams all tracked ticker prices every ~500ms. The client connects
-        with EventSource and receives events in the format:
+        Streams all tracked ticker prices whenever the cache changes. The
+        client connects with EventSource and receives events in the format:
 
             data: {"AAPL": {"ticker": "AAPL", "price": 190.50, ...}, ...}
 
@@ -45,18 +56,74 @@ def create_stream_router(price_cache: PriceCache) -> APIRouter:
             },
         )
 
+    if history is not None:
+
+        @router.get("/history")
+        async def price_history(
+            tickers: str | None = None, points: int = 60, seconds: float | None = None
+        ) -> dict:
+            """Recent price points per ticker, for drawing sparklines on connect.
+
+            `tickers` is a comma-separated list (default: every cached ticker),
+            `seconds` limits the window, and each series is downsampled to at
+            most `points` points:
+
+                {"AAPL": {"timestamps": [...], "prices": [...]}, ...}
+            """
+            names = tickers.split(",") if tickers else list(price_cache.get_all())
+            since = None if seconds is None else clock.time() - seconds
+            return _history_payload(history, names, points, since)
+
+    if bars is not None:
+
+        @router.get("/bars")
+        async def price_bars(
+            ticker: str, interval: float = 60, seconds: float | None = None
+        ) -> dict:
+            """OHLC bars for one ticker, oldest first, the last one still open.
+
+            `seconds` limits the window to bars opening in the last N seconds:
+
+                {"start": [...], "open": [...], "high": [...], "low": [...],
+                 "close": [...], "ticks": [...]}
+            """
+            since = None if seconds is None else clock.time() - seconds
+            try:
+                result = bars.bars(ticker.strip().upper(), interval, start=since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            return result.to_dict()
+
     return router
 
 
+def _history_payload(
+    history: PriceHistory, tickers: list[str], points: int, since: float | None = None
+) -> dict[str, dict[str, list[float]]]:
+    """JSON-ready history for each known ticker."""
+    payload = {}
+    for ticker in (t.strip().upper() for t in tickers):
+        if ticker not in history:
+            continue
+        if since is None:
+            times, prices = history.last(ticker, points=points)
+        else:
+            times, prices = history.between(ticker, since, points=points)
+        payload[ticker] = {"timestamps": times.tolist(), "prices": prices.tolist()}
+    return payload
+
+
 async def _generate_events(
     price_cache: PriceCache,
     request: Request,
-    interval: float = 0.5,
+    idle_timeout: float = 5.0,
 ) -> AsyncGenerator[str, None]:
     """Async generator that yields SSE-formatted price events.
 
-    Sends all prices every `interval` seconds. Stops when the client
-    disconnects (detected via request.is_disconnected()).
+    Sends all prices as soon as the cache publishes a new version; writes
+    that land while an event is being sent coalesce into the next one. An
+    idle stream only wakes every `idle_timeout` seconds to check whether
+    the client disconnected (detected via request.is_disconnected()).
     """
     # Tell the client to retry after 1 second if the connection drops
     yield "retry: 1000\n\n"
@@ -67,21 +134,21 @@ async def _generate_events(
 
     try:
         while True:
+            # One snapshot: the version and the prices always belong together
+            snapshot = await price_cache.wait_for_change(last_version, timeout=idle_timeout)
+
             # Check for client disconnect
             if await request.is_disconnected():
                 logger.info("SSE client disconnected: %s", client_ip)
                 break
 
-            current_version = price_cache.version
-            if current_version != last_version:
-                last_version = current_version
-                prices = price_cache.get_all()
+            if snapshot.version != last_version:
+                last_version = snapshot.version
+                prices = snapshot.updates()
 
                 if prices:
                     data = {ticker: update.to_dict() for ticker, update in prices.items()}
                     payload = json.dumps(data)
                     yield f"data: {payload}\n\n"
-
-            await asyncio.sleep(interval)
     except asyncio.CancelledError:
         logger.info("SSE stream cancelled for: %s", client_ip)
@@ -1,6 +1,9 @@
 """FinAlly Market Data Simulator Demo.
 
-Run with:  uv run market_data_demo.py
+Run with:  uv run market_data_demo.py [--speed N]
+
+--speed N runs the simulation N times faster than real time on a
+VirtualClock (the 60 simulated seconds then take 60/N real seconds).
 
 Displays a live-updating terminal dashboard of simulated stock prices
 using the GBM simulator and Rich library.
@@ -8,6 +11,7 @@ using the GBM simulator and Rich library.
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 import time
 from collections import deque
@@ -20,11 +24,14 @@ from rich.table import Table
 from rich.text import Text
 
 from app.market.cache import PriceCache
+from app.market.clock import SYSTEM_CLOCK, Clock, VirtualClock
+from app.market.history import PriceHistory
 from app.market.seed_prices import SEED_PRICES
 from app.market.simulator import SimulatorDataSource
 
 # Sparkline characters, low to high
 SPARK_CHARS = "▁▂▃▄▅▆▇█"
+SPARK_POINTS = 40
 
 # Ordered ticker list matching the default watchlist
 TICKERS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA", "NVDA", "META", "JPM", "V", "NFLX"]
@@ -53,7 +60,7 @@ def format_price(price: float) -> str:
 
 def build_table(
     cache: PriceCache,
-    history: dict[str, deque],
+    history: PriceHistory,
     elapsed: float,
 ) -> Table:
     """Build the price table."""
@@ -94,7 +101,7 @@ def build_table(
         pct_str = f"[{color}]{update.change_percent:+.2f}%[/]"
 
         # Sparkline from history
-        vals = list(history.get(ticker, []))
+        vals = history.last(ticker, n=SPARK_POINTS)[1].tolist()
         spark_str = f"[bright_cyan]{sparkline(vals)}[/]" if len(vals) > 1 else ""
 
         table.add_row(ticker, price_str, change_str, pct_str, arrow, spark_str)
@@ -120,12 +127,13 @@ def build_event_log(events: deque) -> Panel:
 
 def build_dashboard(
     cache: PriceCache,
-    history: dict[str, deque],
+    history: PriceHistory,
     events: deque,
     start_time: float,
+    clock: Clock = SYSTEM_CLOCK,
 ) -> Layout:
     """Build the full dashboard layout."""
-    elapsed = time.time() - start_time
+    elapsed = clock.monotonic() - start_time
     remaining = max(0, DURATION - elapsed)
 
     layout = Layout()
@@ -204,53 +212,48 @@ def print_summary(cache: PriceCache) -> None:
     console.print()
 
 
-async def run() -> None:
+async def run(speed: float = 1.0) -> None:
     """Main demo loop."""
-    cache = PriceCache()
-    source = SimulatorDataSource(price_cache=cache, update_interval=0.5)
+    clock = SYSTEM_CLOCK if speed == 1.0 else VirtualClock(speed=speed)
+    cache = PriceCache(clock=clock)
+    source = SimulatorDataSource(price_cache=cache, update_interval=0.5, clock=clock)
 
-    # Per-ticker price history for sparklines
-    history: dict[str, deque] = {t: deque(maxlen=40) for t in TICKERS}
+    # Per-ticker price history for sparklines, recorded on every cache write
+    history = PriceHistory(capacity=SPARK_POINTS)
+    history.attach(cache)
 
     # Recent event log
     events: deque = deque(maxlen=12)
 
     await source.start(TICKERS)
-    start_time = time.time()
-
-    # Seed initial history points
-    for ticker in TICKERS:
-        update = cache.get(ticker)
-        if update:
-            history[ticker].append(update.price)
+    start_time = clock.monotonic()
 
     try:
         with Live(
-            build_dashboard(cache, history, events, start_time),
+            build_dashboard(cache, history, events, start_time, clock),
             refresh_per_second=4,
             screen=True,
         ) as live:
             last_version = cache.version
-            while time.time() - start_time < DURATION:
-                await asyncio.sleep(0.25)
+            while clock.monotonic() - start_time < DURATION:
+                await clock.sleep(0.25)
 
                 # Check for updates
                 if cache.version == last_version:
                     continue
                 last_version = cache.version
 
-                # Record history & detect events
+                # Detect events
                 for ticker in TICKERS:
                     update = cache.get(ticker)
                     if update is None:
                         continue
-                    history[ticker].append(update.price)
 
                     # Log notable moves
                     if abs(update.change_percent) > 1.0:
                         direction = "\u25b2" if update.direction == "up" else "\u25bc"
                         color = "green" if update.direction == "up" else "red"
-                        timestamp = time.strftime("%H:%M:%S")
+                        timestamp = time.strftime("%H:%M:%S", time.localtime(update.timestamp))
                         events.appendleft(
                             f"[bright_black]{timestamp}[/]  "
                             f"[bold {color}]{direction} {ticker}[/]  "
@@ -258,7 +261,7 @@ async def run() -> None:
                             f"${format_price(update.price)}"
                         )
 
-                live.update(build_dashboard(cache, history, events, start_time))
+                live.update(build_dashboard(cache, history, events, start_time, clock))
 
     except KeyboardInterrupt:
         pass
@@ -269,4 +272,8 @@ async def run() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="simulated seconds per real second"
+    )
+    asyncio.run(run(speed=parser.parse_args().speed))
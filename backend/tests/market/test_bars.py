@@ -0,0 +1,109 @@
+"""Tests for OHLC bar aggregation."""
+
+import numpy as np
+import pytest
+
+from app.market.bars import BarAggregator
+from app.market.cache import PriceCache
+from app.market.columnar import ColumnarPriceCache
+
+COLUMNS = ("start", "open", "high", "low", "close", "ticks")
+
+
+def _brute_force(times, prices, interval):
+    """Reference bars: group ticks by bucket and take OHLC / counts."""
+    buckets = np.floor(times / interval) * interval
+    out = []
+    for bucket in np.unique(buckets):
+        p = prices[buckets == bucket]
+        out.append((bucket, p[0], p.max(), p.min(), p[-1], len(p)))
+    return out
+
+
+class TestBarAggregator:
+    """Unit tests for BarAggregator."""
+
+    @pytest.fixture
+    def ticks(self):
+        rng = np.random.default_rng(0)
+        times = np.sort(rng.uniform(0, 1000, 3000))
+        prices = np.round(100 + np.cumsum(rng.normal(0, 0.1, 3000)), 2)
+        return times, prices
+
+    @pytest.mark.parametrize("cache_cls", [PriceCache, ColumnarPriceCache])
+    def test_matches_brute_force(self, ticks, cache_cls):
+        """Every interval, rolled up or not, matches grouping the raw ticks."""
+        times, prices = ticks
+        cache = cache_cls()
+        agg = BarAggregator({1: 2000, 60: 100, 300: 10})
+        agg.attach(cache)
+        for t, p in zip(times, prices):
+            cache.update_many({"AAPL": p}, timestamp=t)
+
+        for interval in (1, 60, 300):
+            bars = agg.bars("AAPL", interval)
+            got = list(zip(*(getattr(bars, c).tolist() for c in COLUMNS)))
+            assert got == _brute_force(times, prices, interval)
+
+    def test_open_coarse_bar_includes_latest_tick(self):
+        """A coarse bar is current even before any finer bar has closed."""
+        cache = PriceCache()
+        agg = BarAggregator({1: 10, 60: 10})
+        agg.attach(cache)
+        cache.update("AAPL", 100.0, timestamp=60.2)
+        cache.update("AAPL", 105.0, timestamp=60.7)
+        bars = agg.bars("AAPL", 60)
+        assert bars.to_dict() == {
+            "start": [60.0],
+            "open": [100.0],
+            "high": [105.0],
+            "low": [100.0],
+            "close": [105.0],
+            "ticks": [2],
+        }
+
+    def test_ring_keeps_latest_bars(self, ticks):
+        """Each interval keeps only its configured number of bars."""
+        times, prices = ticks
+        cache = PriceCache()
+        agg = BarAggregator({1: 5, 60: 3})
+        agg.attach(cache)
+        for t, p in zip(times, prices):
+            cache.update_many({"AAPL": p}, timestamp=t)
+        assert len(agg.bars("AAPL", 1)) == 5
+        bars = agg.bars("AAPL", 60)
+        assert bars.start.tolist() == [840.0, 900.0, 960.0]
+
+    def test_range_query(self, ticks):
+        """Bars are selected by opening time."""
+        times, prices = ticks
+        cache = PriceCache()
+        agg = BarAggregator({60: 100})
+        agg.attach(cache)
+        for t, p in zip(times, prices):
+            cache.update_many({"AAPL": p}, timestamp=t)
+        assert agg.bars("AAPL", 60, start=120, end=300).start.tolist() == [120, 180, 240, 300]
+
+    def test_many_tickers_per_write(self):
+        """A batch updates every ticker's bars, growing storage as needed."""
+        cache = PriceCache()
+        agg = BarAggregator({1: 10, 60: 10}, rows=1)
+        agg.attach(cache)
+        tickers = [f"T{i}" for i in range(20)]
+        for second in range(3):
+            cache.update_many({t: 100.0 + second for t in tickers}, timestamp=second + 0.5)
+        for ticker in tickers:
+            assert agg.bars(ticker, 1).close.tolist() == [100.0, 101.0, 102.0]
+            assert agg.bars(ticker, 60).ticks.tolist() == [3]
+
+    def test_unknown_interval_and_ticker(self):
+        """Unaggregated intervals are rejected; unknown tickers have no bars."""
+        agg = BarAggregator({1: 10})
+        with pytest.raises(ValueError):
+            agg.bars("AAPL", 60)
+        assert len(agg.bars("AAPL", 1)) == 0
+
+    def test_intervals_must_nest(self):
+        """Each interval must be a multiple of the next finer one."""
+        with pytest.raises(ValueError):
+            BarAggregator({60: 10, 90: 10})
@@ -1,6 +1,14 @@
 """Tests for PriceCache."""
 
+import asyncio
+import threading
+import time
+
+import pytest
+
 from app.market.cache import PriceCache
+from app.market.columnar import ColumnarPriceCache
+from app.market.stream import _generate_events
 
 
 class TestPriceCache:
@@ -49,6 +57,42 @@ class TestPriceCache:
         cache = PriceCache()
         cache.remove("AAPL")  # Should not raise
 
+    def test_update_many(self):
+        """Test that a batch is applied with one version bump and one timestamp."""
+        cache = PriceCache()
+        cache.update("AAPL", 190.00)
+        version = cache.version
+        cache.update_many({"AAPL": 191.00, "GOOGL": 175.00}, timestamp=1234567890.0)
+        assert cache.version == version + 1
+        assert cache.get("AAPL").previous_price == 190.00
+        assert cache.get("AAPL").direction == "up"
+        assert cache.get("GOOGL").direction == "flat"
+        assert cache.get("GOOGL").timestamp == 1234567890.0
+
+    def test_update_many_per_ticker_timestamps(self):
+        """Test that per-ticker timestamps override the shared one."""
+        cache = PriceCache()
+        cache.update_many(
+            {"AAPL": 190.00, "GOOGL": 175.00}, timestamp=100.0, timestamps={"AAPL": 50.0}
+        )
+        assert cache.get("AAPL").timestamp == 50.0
+        assert cache.get("GOOGL").timestamp == 100.0
+
+    def test_update_many_empty(self):
+        """Test that an empty batch does not bump the version."""
+        cache = PriceCache()
+        cache.update_many({})
+        assert cache.version == 0
+
+    def test_remove_many(self):
+        """Test removing several tickers at once."""
+        cache = PriceCache()
+        cache.update("AAPL", 190.00)
+        cache.update("GOOGL", 175.00)
+        cache.update("MSFT", 420.00)
+        cache.remove_many(["AAPL", "MSFT", "NOPE"])
+        assert list(cache.get_all()) == ["GOOGL"]
+
     def test_get_all(self):
         """Test getting all prices."""
         cache = PriceCache()
@@ -101,3 +145,169 @@ class TestPriceCache:
         cache = PriceCache()
         update = cache.update("AAPL", 190.12345)
         assert update.price == 190.12
+
+    def test_changes_since(self):
+        """Test that only tickers updated after a version are returned."""
+        cache = PriceCache()
+        cache.update_many({"AAPL": 190.00, "GOOGL": 175.00, "MSFT": 420.00})
+        version = cache.version
+        cache.update("GOOGL", 176.00)
+        cache.update("AAPL", 191.00)
+        changes = cache.changes_since(version)
+        assert list(changes) == ["GOOGL", "AAPL"]  # Oldest change first
+        assert changes["AAPL"].price == 191.00
+        assert cache.changes_since(cache.version) == {}
+        assert len(cache.changes_since(0)) == 3
+
+    def test_changes_since_skips_removed(self):
+        """Test that removed tickers drop out of the delta."""
+        cache = PriceCache()
+        cache.update_many({"AAPL": 190.00, "GOOGL": 175.00})
+        cache.remove("AAPL")
+        assert list(cache.changes_since(0)) == ["GOOGL"]
+
+    def test_get_version(self):
+        """Test per-ticker version stamps."""
+        cache = PriceCache()
+        cache.update_many({"AAPL": 190.00, "GOOGL": 175.00})
+        cache.update("AAPL", 191.00)
+        assert cache.get_version("AAPL") == 2
+        assert cache.get_version("GOOGL") == 1
+        assert cache.get_version("MSFT") is None
+
+    def test_snapshot_is_unaffected_by_later_writes(self):
+        """Test that a held snapshot keeps its version and prices."""
+        cache = PriceCache()
+        cache.update_many({"AAPL": 190.00, "GOOGL": 175.00})
+        snapshot = cache.snapshot()
+        cache.update("AAPL", 191.00)
+        cache.remove("GOOGL")
+        assert snapshot.version == 1
+        assert snapshot.get_price("AAPL") == 190.00
+        assert "GOOGL" in snapshot
+        assert cache.snapshot().version == 2 and "GOOGL" not in cache
+
+    def test_snapshot_consistent_under_concurrent_writes(self):
+        """Test that readers always see a version paired with its own prices."""
+        cache = PriceCache()
+        tickers = [f"T{i}" for i in range(50)]
+        stop = threading.Event()
+
+        def write():
+            while not stop.is_set():
+                # Every price in a batch equals the version it will publish
+                cache.update_many(dict.fromkeys(tickers, float(cache.version + 1)))
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(2000):
+                snapshot = cache.snapshot()
+                prices = {update.price for update in snapshot.prices.values()}
+                assert prices <= {float(snapshot.version)}
+        finally:
+            stop.set()
+            writer.join()
+
+    def test_listeners_see_each_write(self):
+        """Test that listeners get every published batch, and can be removed."""
+        cache = PriceCache()
+        seen = []
+
+        def listener(snapshot, tickers):
+            seen.append((snapshot.version, tickers))
+
+        cache.add_listener(listener)
+        cache.update_many({"AAPL": 190.00, "GOOGL": 175.00})
+        cache.update("AAPL", 191.00)
+        cache.remove_listener(listener)
+        cache.update("AAPL", 192.00)
+        assert seen == [(1, ["AAPL", "GOOGL"]), (2, ["AAPL"])]
+
+
+@pytest.mark.asyncio
+class TestWaitForChange:
+    """Tests for PriceCache.wait_for_change."""
+
+    async def test_returns_immediately_when_already_newer(self):
+        """Test that a waiter behind the cache gets the current snapshot at once."""
+        cache = PriceCache()
+        cache.update("AAPL", 190.00)
+        snapshot = await cache.wait_for_change(0, timeout=0)
+        assert snapshot.version == 1
+
+    async def test_timeout_returns_unchanged_snapshot(self):
+        """Test that a timed-out wait returns the same version."""
+        cache = PriceCache()
+        snapshot = await cache.wait_for_change(0, timeout=0.01)
+        assert snapshot.version == 0
+
+    @pytest.mark.parametrize("cache_cls", [PriceCache, ColumnarPriceCache])
+    async def test_one_write_wakes_every_waiter(self, cache_cls):
+        """Test that a write from another thread wakes all waiters via one shared future."""
+        cache = cache_cls()
+        waiters = [asyncio.create_task(cache.wait_for_change(0, timeout=5)) for _ in range(50)]
+        await asyncio.sleep(0)
+        assert len(cache._waiters) == 1
+
+        writer = threading.Thread(target=cache.update, args=("AAPL", 190.00))
+        writer.start()
+        snapshots = await asyncio.gather(*waiters)
+        writer.join()
+        assert {s.version for s in snapshots} == {1}
+        assert not cache._waiters
+
+    async def test_write_between_recheck_and_registration(self):
+        """Test that a write landing while a waiter registers still wakes it."""
+        cache = PriceCache()
+        cache.update("AAPL", 190.00)
+        writers = []
+
+        class RacingWaiters(dict):
+            def get(self, key, default=None):
+                # Runs after the waiter's re-check, before its future is registered
+                writer = threading.Thread(target=cache.update, args=("AAPL", 191.00))
+                writer.start()
+                writers.append(writer)
+                while cache.snapshot().version < 2:
+                    time.sleep(0.001)
+                return super().get(key, default)
+
+        cache._waiters = RacingWaiters()
+        start = time.monotonic()
+        snapshot = await cache.wait_for_change(1, timeout=2.0)
+        writers[0].join()
+        assert snapshot.version == 2
+        assert time.monotonic() - start < 1.0
+
+    async def test_cancelled_waiter_does_not_affect_others(self):
+        """Test that cancelling one waiter leaves the others waiting."""
+        cache = PriceCache()
+        first = asyncio.create_task(cache.wait_for_change(0, timeout=5))
+        second = asyncio.create_task(cache.wait_for_change(0, timeout=5))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        cache.update("AAPL", 190.00)
+        assert (await second).version == 1
+
+    async def test_stream_sends_each_change(self):
+        """Test that the SSE generator sends an event per change, not on a timer."""
+
+        class FakeRequest:
+            client = None
+
+            async def is_disconnected(self):
+                return False
+
+        cache = PriceCache()
+        events = _generate_events(cache, FakeRequest(), idle_timeout=5)
+        assert await anext(events) == "retry: 1000\n\n"
+        cache.update("AAPL", 190.00)
+        assert '"AAPL"' in await asyncio.wait_for(anext(events), 1)
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.01)
+        assert not pending.done()  # Idle: nothing to send
+        cache.update("AAPL", 191.00)
+        assert "191.0" in await asyncio.wait_for(pending, 1)
+        await events.aclose()
@@ -0,0 +1,121 @@
+"""Tests for warm-restart checkpoints."""
+
+import numpy as np
+import pytest
+
+from app.market.cache import PriceCache
+from app.market.checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from app.market.columnar import ColumnarPriceCache
+from app.market.simulator import GBMSimulator, SimulatorDataSource
+
+TICKERS = ["AAPL", "GOOGL", "MSFT", "JPM"]
+
+
+class TestCheckpointFile:
+    """Saving and loading checkpoint files."""
+
+    @pytest.mark.parametrize("cache_cls", [PriceCache, ColumnarPriceCache])
+    def test_round_trip(self, tmp_path, cache_cls):
+        """Saved prices come back into a fresh cache at their timestamps."""
+        cache = cache_cls()
+        cache.update_many({"AAPL": 190.5, "GOOGL": 175.25}, timestamps={"AAPL": 1.0, "GOOGL": 2.0})
+        path = tmp_path / "prices.npz"
+        save_checkpoint(path, cache)
+
+        restored = PriceCache()
+        load_checkpoint(path).restore_cache(restored)
+        assert restored.version == 1
+        assert restored.get_price("AAPL") == 190.5
+        assert restored.get("GOOGL").timestamp == 2.0
+
+    def test_missing_or_corrupt_file(self, tmp_path):
+        """A missing or unreadable checkpoint is treated as none."""
+        assert load_checkpoint(tmp_path / "nope.npz") is None
+        bad = tmp_path / "bad.npz"
+        bad.write_bytes(b"not a checkpoint")
+        assert load_checkpoint(bad) is None
+
+    def test_save_replaces_atomically(self, tmp_path):
+        """Saving again replaces the file and leaves no temporary files behind."""
+        cache = PriceCache()
+        path = tmp_path / "prices.npz"
+        cache.update("AAPL", 190.0)
+        save_checkpoint(path, cache)
+        cache.update("AAPL", 191.0)
+        save_checkpoint(path, cache)
+        assert load_checkpoint(path).prices.tolist() == [191.0]
+        assert [p.name for p in tmp_path.iterdir()] == ["prices.npz"]
+
+
+class TestSimulatorCheckpoint:
+    """GBMSimulator.checkpoint() / restore()."""
+
+    @pytest.mark.parametrize("correlation", ["cholesky", "factor"])
+    def test_restored_simulator_continues_same_paths(self, correlation):
+        """A restored simulator produces exactly the paths the original would have."""
+        original = GBMSimulator(TICKERS, seed=5, correlation=correlation)
+        for _ in range(10):
+            original.step()
+        state = original.checkpoint()
+        expected = [original.step() for _ in range(100)]
+
+        restored = GBMSimulator(TICKERS, seed=int(state["seed"]), correlation=correlation)
+        assert restored.restore(state) == TICKERS
+        assert [restored.step() for _ in range(100)] == expected
+
+    def test_restore_subset(self):
+        """Only tickers simulated on both sides are restored; new ones start fresh."""
+        original = GBMSimulator(TICKERS, seed=5, correlation="factor")
+        for _ in range(10):
+            original.step()
+        state = original.checkpoint()
+
+        restored = GBMSimulator(["AAPL", "TSLA"], seed=5, correlation="factor")
+        assert restored.restore(state) == ["AAPL"]
+        assert restored.get_price("AAPL") == original.get_price("AAPL")
+        assert set(restored.step()) == {"AAPL", "TSLA"}
+
+
+@pytest.mark.asyncio
+class TestCheckpointer:
+    """End-to-end warm restart through SimulatorDataSource."""
+
+    async def test_warm_restart_resumes_prices(self, tmp_path):
+        """After a restart the cache is served at once and the simulator carries on."""
+        path = tmp_path / "prices.npz"
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.01)
+        await source.start(TICKERS)
+        for _ in range(20):
+            source._tick()
+        checkpointer = Checkpointer(path, cache, source)
+        await checkpointer.start()
+        await source.stop()
+        await checkpointer.stop()  # Final save
+        saved = cache.get_all()
+        sim_prices = {t: source._sim.get_price(t) for t in TICKERS}
+
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=60.0)
+        checkpointer = Checkpointer(path, cache, source)
+        assert checkpointer.restore()
+        assert {t: u.price for t, u in cache.get_all().items()} == {
+            t: u.price for t, u in saved.items()
+        }
+        await source.start(TICKERS)
+        assert {t: source._sim.get_price(t) for t in TICKERS} == sim_prices
+        await source.stop()
+
+    async def test_save_skipped_when_unchanged(self, tmp_path):
+        """Nothing is written while the cache version stays the same."""
+        path = tmp_path / "prices.npz"
+        cache = PriceCache()
+        cache.update("AAPL", 190.0)
+        checkpointer = Checkpointer(path, cache)
+        checkpointer.save()
+        path.unlink()
+        checkpointer.save()
+        assert not path.exists()
+        cache.update("AAPL", 191.0)
+        checkpointer.save()
+        assert np.array_equal(load_checkpoint(path).prices, [191.0])
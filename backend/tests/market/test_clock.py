@@ -0,0 +1,83 @@
+"""Tests for the system and virtual clocks."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.market.clock import SYSTEM_CLOCK, VirtualClock
+
+
+class TestVirtualClock:
+    """Unit tests for VirtualClock bookkeeping."""
+
+    def test_starts_at_epoch(self):
+        """time() starts at the epoch and monotonic() at zero."""
+        clock = VirtualClock(epoch=1_700_000_000.0)
+        assert clock.monotonic() == 0.0
+        assert clock.time() == 1_700_000_000.0
+
+    def test_advance(self):
+        """advance() moves both time() and monotonic()."""
+        clock = VirtualClock(epoch=1000.0)
+        clock.advance(2.5)
+        assert clock.monotonic() == 2.5
+        assert clock.time() == 1002.5
+        with pytest.raises(ValueError):
+            clock.advance(-1)
+
+    def test_scaled_clock_runs_faster(self):
+        """A speed-k clock covers k seconds per real second."""
+        clock = VirtualClock(speed=1000.0)
+        time.sleep(0.01)
+        assert clock.monotonic() >= 10.0
+
+    def test_invalid_speed_rejected(self):
+        """Non-positive speeds are rejected."""
+        with pytest.raises(ValueError):
+            VirtualClock(speed=0)
+
+    def test_thread_wait_jumps_ahead(self):
+        """A thread waiting on an unscaled clock returns at once with time advanced."""
+        clock = VirtualClock()
+        start = time.monotonic()
+        assert clock.wait(threading.Event(), 3600.0) is False
+        assert time.monotonic() - start < 1.0
+        assert clock.monotonic() == 3600.0
+
+
+@pytest.mark.asyncio
+class TestVirtualClockAsync:
+    """Async sleep ordering."""
+
+    async def test_sleepers_wake_in_deadline_order(self):
+        """Concurrent sleepers wake in virtual-time order, without real waiting."""
+        clock = VirtualClock()
+        woke: list[tuple[str, float]] = []
+
+        async def sleeper(name: str, seconds: float) -> None:
+            await clock.sleep(seconds)
+            woke.append((name, clock.monotonic()))
+
+        start = time.monotonic()
+        await asyncio.gather(sleeper("slow", 3600.0), sleeper("fast", 1.0), sleeper("mid", 60.0))
+        assert time.monotonic() - start < 1.0
+        assert woke == [("fast", 1.0), ("mid", 60.0), ("slow", 3600.0)]
+
+    async def test_cancelled_sleep_does_not_block_others(self):
+        """A cancelled sleeper leaves the queue."""
+        clock = VirtualClock()
+        task = asyncio.create_task(clock.sleep(1.0))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.wait_for(clock.sleep(5.0), timeout=1.0)
+        assert clock.monotonic() == 5.0
+
+    async def test_system_clock_sleep(self):
+        """The system clock sleeps for real."""
+        start = SYSTEM_CLOCK.monotonic()
+        await SYSTEM_CLOCK.sleep(0.01)
+        assert SYSTEM_CLOCK.monotonic() - start >= 0.01
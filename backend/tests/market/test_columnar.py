@@ -0,0 +1,96 @@
+"""Tests for the columnar PriceCache."""
+
+import numpy as np
+import pytest
+
+from app.market.cache import PriceCache
+from app.market.columnar import CHANGE_LOG, ColumnarPriceCache
+
+
+class TestColumnarPriceCache:
+    """Unit tests for ColumnarPriceCache."""
+
+    def test_matches_dict_cache(self):
+        """The same operations give the same PriceUpdates as PriceCache."""
+        columnar, reference = ColumnarPriceCache(capacity=2), PriceCache()
+        for cache in (columnar, reference):
+            cache.update("AAPL", 190.004, timestamp=1.0)
+            cache.update_many({"AAPL": 191.0, "GOOGL": 175.0, "MSFT": 420.0}, timestamp=2.0)
+            cache.update_many({"GOOGL": 174.5}, timestamp=3.0, timestamps={"GOOGL": 2.5})
+            cache.remove("AAPL")
+            cache.update("TSLA", 250.0, timestamp=4.0)
+        assert columnar.get_all() == reference.get_all()
+        assert columnar.version == reference.version
+        assert len(columnar) == 3 and "AAPL" not in columnar
+        assert columnar.get_price("GOOGL") == 174.5
+
+    def test_update_returns_price_update(self):
+        """update() materializes the written row, with the previous price."""
+        cache = ColumnarPriceCache()
+        cache.update("AAPL", 190.00)
+        update = cache.update("AAPL", 191.00)
+        assert update.previous_price == 190.00
+        assert update.direction == "up"
+
+    def test_snapshot_is_read_only(self):
+        """Snapshot columns cannot be written to."""
+        cache = ColumnarPriceCache()
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0})
+        snap = cache.snapshot()
+        assert snap.tickers == ("AAPL", "GOOGL")
+        np.testing.assert_array_equal(snap.price, [190.0, 175.0])
+        with pytest.raises(ValueError):
+            snap.price[0] = 1.0
+
+    def test_snapshot_survives_later_writes(self):
+        """A held snapshot keeps its version's prices through updates and removals."""
+        cache = ColumnarPriceCache()
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0, "MSFT": 420.0})
+        snap = cache.snapshot()
+
+        cache.update_many({"AAPL": 200.0, "NVDA": 900.0})
+        cache.remove("AAPL")  # Moves MSFT's row
+        assert snap.get("AAPL").price == 190.0
+        assert snap.get("MSFT").price == 420.0
+        assert "NVDA" not in snap and len(snap) == 3
+        assert cache.get("MSFT").price == 420.0
+
+    def test_snapshot_shared_until_next_write(self):
+        """Readers at the same version share one snapshot; no copy per reader."""
+        cache = ColumnarPriceCache()
+        cache.update("AAPL", 190.0)
+        first = cache.snapshot()
+        assert cache.snapshot() is first
+        cache.update("AAPL", 191.0)
+        second = cache.snapshot()
+        assert second is not first
+        assert second.version == first.version + 1
+
+    def test_grows_past_capacity(self):
+        """Rows are added beyond the initial capacity."""
+        cache = ColumnarPriceCache(capacity=1)
+        cache.update_many({f"T{i}": float(i + 1) for i in range(100)})
+        assert len(cache) == 100
+        assert cache.get_price("T99") == 100.0
+
+    def test_changes_since(self):
+        """Only rows updated after a version come back, oldest change first."""
+        cache = ColumnarPriceCache()
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0, "MSFT": 420.0})
+        version = cache.version
+        cache.update("MSFT", 421.0)
+        cache.update("AAPL", 191.0)
+        cache.remove("GOOGL")
+        assert list(cache.changes_since(version)) == ["MSFT", "AAPL"]
+        assert cache.get_version("AAPL") == cache.version
+        assert cache.snapshot().changes_since(version) == cache.changes_since(version)
+
+    def test_changes_since_beyond_log(self):
+        """Versions older than the change log are answered by a column scan."""
+        cache = ColumnarPriceCache()
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0})
+        version = cache.version
+        for i in range(CHANGE_LOG + 5):
+            cache.update("AAPL", 190.0 + i)
+        assert list(cache.changes_since(version)) == ["AAPL"]
+        assert list(cache.changes_since(0)) == ["GOOGL", "AAPL"]
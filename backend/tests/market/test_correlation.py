@@ -0,0 +1,199 @@
+"""Tests for correlation structure and Cholesky factor maintenance."""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.market.correlation import (
+    EmpiricalCorrelation,
+    FactorCache,
+    cholesky_append,
+    cholesky_delete,
+    is_stable_factor,
+    nearest_correlation,
+    sector_correlation,
+    sector_correlation_matrix,
+    sector_factor_loadings,
+    solve_lower,
+)
+from app.market.simulator import GBMSimulator
+
+TICKERS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA", "NVDA", "META", "JPM", "V", "NFLX", "ZZZZ"]
+
+
+class TestSectorCorrelation:
+    """Unit tests for the vectorized sector correlation builders."""
+
+    def test_matches_pairwise_rules(self):
+        """Every off-diagonal entry matches GBMSimulator._pairwise_correlation."""
+        corr = sector_correlation_matrix(TICKERS)
+        for i, t1 in enumerate(TICKERS):
+            for j, t2 in enumerate(TICKERS):
+                expected = 1.0 if i == j else GBMSimulator._pairwise_correlation(t1, t2)
+                assert corr[i, j] == expected
+
+    def test_factor_model_reproduces_matrix(self):
+        """Factor loadings plus idiosyncratic variance give the same correlations."""
+        loadings, idio = sector_factor_loadings(TICKERS)
+        implied = loadings @ loadings.T + np.diag(idio**2)
+        np.testing.assert_allclose(implied, sector_correlation_matrix(TICKERS), atol=1e-12)
+
+    def test_cross_block_shape(self):
+        """Cross correlations have shape (len(rows), len(cols))."""
+        assert sector_correlation(["AAPL"], ["JPM", "V", "TSLA"]).shape == (1, 3)
+
+
+class TestCholeskyUpdates:
+    """Unit tests for incremental Cholesky append/delete."""
+
+    def test_solve_lower(self):
+        """Blocked forward substitution solves the triangular system."""
+        lower = np.linalg.cholesky(sector_correlation_matrix(TICKERS))
+        b = np.arange(len(TICKERS), dtype=float)
+        np.testing.assert_allclose(lower @ solve_lower(lower, b, block=4), b)
+
+    def test_append_matches_full_factorization(self):
+        """Appending rows gives the same factor as refactorizing."""
+        old, new = TICKERS[:6], TICKERS[6:]
+        lower = np.linalg.cholesky(sector_correlation_matrix(old))
+        extended = cholesky_append(
+            lower, sector_correlation(new, old), sector_correlation_matrix(new)
+        )
+        np.testing.assert_allclose(extended, np.linalg.cholesky(sector_correlation_matrix(TICKERS)))
+
+    def test_delete_matches_full_factorization(self):
+        """Deleting a row/column gives the same factor as refactorizing."""
+        lower = np.linalg.cholesky(sector_correlation_matrix(TICKERS))
+        for k in (0, 4, len(TICKERS) - 1):
+            remaining = TICKERS[:k] + TICKERS[k + 1 :]
+            expected = np.linalg.cholesky(sector_correlation_matrix(remaining))
+            np.testing.assert_allclose(cholesky_delete(lower, k), expected, atol=1e-12)
+
+    def test_unstable_factor_detected(self):
+        """A factor whose rows no longer have unit norm is flagged."""
+        lower = np.linalg.cholesky(sector_correlation_matrix(TICKERS))
+        assert is_stable_factor(lower)
+        lower[-1, -1] *= 1.01
+        assert not is_stable_factor(lower)
+        assert is_stable_factor(lower[:-1, :-1])
+
+    def test_simulator_factor_tracks_watchlist_edits(self):
+        """The simulator's incrementally maintained factor stays exact."""
+        sim = GBMSimulator(tickers=TICKERS[:3])
+        for ticker in TICKERS[3:]:
+            sim.add_ticker(ticker)
+        for ticker in ("GOOGL", "TSLA", "ZZZZ"):
+            sim.remove_ticker(ticker)
+        expected = np.linalg.cholesky(sector_correlation_matrix(sim.get_tickers()))
+        np.testing.assert_allclose(sim._cholesky, expected, atol=1e-12)
+
+    def test_simulator_falls_back_to_rebuild(self, monkeypatch):
+        """If the incremental update is judged unstable, the factor is rebuilt."""
+        sim = GBMSimulator(tickers=TICKERS[:5])
+        monkeypatch.setattr("app.market.simulator.is_stable_factor", lambda *a: False)
+        sim.add_ticker("JPM")
+        sim.remove_ticker("AAPL")
+        expected = np.linalg.cholesky(sector_correlation_matrix(sim.get_tickers()))
+        np.testing.assert_allclose(sim._cholesky, expected)
+
+
+class TestEmpiricalCorrelation:
+    """Tests for loading, repairing and caching empirical correlations."""
+
+    def test_nearest_correlation_repairs_indefinite_matrix(self):
+        """An indefinite 'correlation' matrix becomes a valid PD one."""
+        bad = np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+        assert np.linalg.eigvalsh(bad).min() < 0
+        fixed = nearest_correlation(bad)
+        np.testing.assert_allclose(np.diagonal(fixed), 1.0)
+        np.testing.assert_allclose(fixed, fixed.T)
+        np.linalg.cholesky(fixed)  # Does not raise
+
+    def test_nearest_correlation_keeps_valid_matrix(self):
+        """A matrix that is already PD passes through unchanged."""
+        corr = sector_correlation_matrix(TICKERS)
+        np.testing.assert_allclose(nearest_correlation(corr), corr, atol=1e-12)
+
+    def test_covariance_normalized(self):
+        """A covariance matrix is converted to correlations."""
+        cov = np.array([[4.0, 1.2], [1.2, 1.0]])
+        emp = EmpiricalCorrelation(["AAPL", "JPM"], cov)
+        np.testing.assert_allclose(emp.matrix(["AAPL", "JPM"]), [[1.0, 0.6], [0.6, 1.0]])
+
+    def test_unknown_tickers_fall_back_to_sectors(self):
+        """Pairs outside the matrix use the sector correlations."""
+        emp = EmpiricalCorrelation(["AAPL", "JPM"], np.array([[1.0, -0.2], [-0.2, 1.0]]))
+        corr = emp.matrix(["AAPL", "JPM", "GOOGL", "V"])
+        assert corr[0, 1] == pytest.approx(-0.2)
+        expected = sector_correlation_matrix(["AAPL", "JPM", "GOOGL", "V"])
+        np.testing.assert_allclose(corr[2:, :], expected[2:, :])
+
+    def test_from_csv_and_npz(self, tmp_path):
+        """Both file formats load the same matrix."""
+        corr = np.array([[1.0, 0.3], [0.3, 1.0]])
+        csv_path = tmp_path / "corr.csv"
+        csv_path.write_text(",AAPL,JPM\nAAPL,1.0,0.3\nJPM,0.3,1.0\n")
+        npz_path = tmp_path / "corr.npz"
+        np.savez(npz_path, tickers=np.array(["AAPL", "JPM"]), correlation=corr)
+        for path in (csv_path, npz_path):
+            emp = EmpiricalCorrelation.from_file(path)
+            assert emp.tickers == ["AAPL", "JPM"]
+            np.testing.assert_allclose(emp.matrix(["AAPL", "JPM"]), corr)
+
+    def test_simulator_uses_empirical_matrix(self):
+        """The simulator factorizes the empirical matrix, appends included."""
+        emp = EmpiricalCorrelation(["AAPL", "JPM"], np.array([[1.0, -0.4], [-0.4, 1.0]]))
+        sim = GBMSimulator(tickers=["AAPL"], empirical=emp)
+        sim.add_ticker("JPM")
+        corr = sim._cholesky @ sim._cholesky.T
+        assert corr[0, 1] == pytest.approx(-0.4)
+
+    def test_factor_cache_round_trip(self, tmp_path):
+        """A second simulator over the same tickers loads the cached factor."""
+        cache = FactorCache(tmp_path)
+        first = GBMSimulator(tickers=TICKERS, factor_cache=cache)
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+
+        key = FactorCache.key(TICKERS, "sector")
+        marker = first._cholesky.copy()
+        marker[0, 0] = 42.0  # Prove the second simulator reads the file
+        cache.store(key, marker)
+        second = GBMSimulator(tickers=TICKERS, factor_cache=cache)
+        assert second._cholesky[0, 0] == 42.0
+
+    def test_factor_cache_keyed_by_source(self):
+        """Different ticker orders or correlation sources get different keys."""
+        key = FactorCache.key(["AAPL", "JPM"], "sector")
+        assert key != FactorCache.key(["JPM", "AAPL"], "sector")
+        assert key != FactorCache.key(["AAPL", "JPM"], "abc")
+
+    def test_factor_cache_evicts_least_recently_used(self, tmp_path):
+        """Stores beyond max_entries drop the entry loaded least recently."""
+        cache = FactorCache(tmp_path, max_entries=2)
+        lower = np.eye(3)
+        cache.store("a", lower)
+        cache.store("b", lower)
+        os.utime(tmp_path / "a.npy", ns=(1, 1))
+        os.utime(tmp_path / "b.npy", ns=(2, 2))
+        assert cache.load("a", 3) is not None  # Touch: "b" is now the oldest
+
+        cache.store("c", lower)
+        assert sorted(p.stem for p in tmp_path.glob("*.npy")) == ["a", "c"]
+
+    def test_factor_cache_respects_byte_limit(self, tmp_path):
+        """Factors larger than max_bytes are never written."""
+        cache = FactorCache(tmp_path, max_bytes=100)
+        cache.store("big", np.eye(10))
+        assert cache.load("big", 10) is None
+
+    def test_valid_matrix_not_repaired(self, monkeypatch):
+        """A positive-definite matrix skips the eigendecomposition."""
+        import app.market.correlation as correlation
+
+        def fail(*args, **kwargs):
+            raise AssertionError("nearest_correlation should not run")
+
+        monkeypatch.setattr(correlation, "nearest_correlation", fail)
+        matrix = np.array([[1.0, 0.5], [0.5, 1.0]])
+        EmpiricalCorrelation(["AAPL", "JPM"], matrix)
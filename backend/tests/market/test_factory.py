@@ -4,7 +4,8 @@ import os
 from unittest.mock import patch
 
 from app.market.cache import PriceCache
-from app.market.factory import create_market_data_source
+from app.market.checkpoint import Checkpointer
+from app.market.factory import create_checkpointer, create_market_data_source
 from app.market.massive_client import MassiveDataSource
 from app.market.simulator import SimulatorDataSource
 
@@ -77,3 +78,34 @@ class TestFactory:
 
         assert isinstance(source, MassiveDataSource)
         assert source._cache is cache
+
+    def test_simulator_receives_seed(self):
+        """Test that an explicit seed is passed through to the simulator."""
+        cache = PriceCache()
+
+        with patch.dict(os.environ, {}, clear=True):
+            source = create_market_data_source(cache, seed=123)
+
+        assert isinstance(source, SimulatorDataSource)
+        assert source._seed == 123
+
+    def test_simulator_seed_from_env(self):
+        """Test that SIMULATOR_SEED is used when no seed is passed."""
+        cache = PriceCache()
+
+        with patch.dict(os.environ, {"SIMULATOR_SEED": "77"}, clear=True):
+            source = create_market_data_source(cache)
+
+        assert isinstance(source, SimulatorDataSource)
+        assert source._seed == 77
+
+    def test_checkpointer_from_env(self, tmp_path):
+        """Test that MARKET_CHECKPOINT_FILE enables checkpoints."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache)
+
+        with patch.dict(os.environ, {}, clear=True):
+            assert create_checkpointer(cache, source) is None
+        path = str(tmp_path / "prices.npz")
+        with patch.dict(os.environ, {"MARKET_CHECKPOINT_FILE": path}, clear=True):
+            assert isinstance(create_checkpointer(cache, source), Checkpointer)
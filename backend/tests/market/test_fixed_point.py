@@ -0,0 +1,80 @@
+"""Tests for the fixed-point price cache."""
+
+import numpy as np
+import pytest
+
+from app.market.fixed_point import FixedPointPriceCache
+from app.market.history import PriceHistory
+from app.market.simulator import GBMSimulator, SimulatorDataSource
+
+
+class TestFixedPointPriceCache:
+    """Unit tests for FixedPointPriceCache."""
+
+    def test_prices_stored_as_integer_ticks(self):
+        """Float prices are rounded to ticks once and read back exactly."""
+        cache = FixedPointPriceCache(scale=100)
+        cache.update("AAPL", 190.005)
+        snapshot = cache.snapshot()
+        assert snapshot.price.dtype == np.int64
+        assert snapshot.get_ticks("AAPL") == 19000  # Round half to even
+        assert cache.get_price("AAPL") == 190.0
+
+    def test_direction_and_change_exact(self):
+        """Direction and change come from exact integer prices."""
+        cache = FixedPointPriceCache(scale=10_000)
+        cache.update("AAPL", 0.1)
+        update = cache.update("AAPL", 0.3)
+        assert update.direction == "up"
+        assert update.change == 0.2
+        assert update.to_dict()["previous_price"] == 0.1
+
+    def test_update_ticks(self):
+        """Ticks go in unconverted, as one version, with flat first updates."""
+        cache = FixedPointPriceCache()
+        cache.update_ticks({"AAPL": 19050, "GOOGL": 17525}, timestamp=1.0)
+        cache.update_ticks({"AAPL": 19049}, timestamps={"AAPL": 2.0})
+        assert cache.version == 2
+        assert cache.get("GOOGL").direction == "flat"
+        aapl = cache.get("AAPL")
+        assert (aapl.price, aapl.previous_price, aapl.timestamp) == (190.49, 190.5, 2.0)
+        assert aapl.direction == "down"
+
+    def test_select_in_units(self):
+        """Array consumers (history, bars) read prices in currency units."""
+        cache = FixedPointPriceCache()
+        history = PriceHistory()
+        history.attach(cache)
+        cache.update_ticks({"AAPL": 19050}, timestamp=1.0)
+        cache.update_ticks({"AAPL": 19100}, timestamp=2.0)
+        np.testing.assert_array_equal(history.last("AAPL")[1], [190.5, 191.0])
+
+    def test_invalid_scale(self):
+        """Scales below one tick per unit are rejected."""
+        with pytest.raises(ValueError):
+            FixedPointPriceCache(scale=0)
+
+
+class TestStepTicks:
+    """GBMSimulator.step_ticks and its use by SimulatorDataSource."""
+
+    def test_matches_step(self):
+        """step_ticks publishes the same prices as step(), as integer cents."""
+        a = GBMSimulator(["AAPL", "GOOGL"], seed=3)
+        b = GBMSimulator(["AAPL", "GOOGL"], seed=3)
+        for _ in range(50):
+            floats, ticks = a.step(), b.step_ticks(100)
+            assert {t: round(p * 100) for t, p in floats.items()} == ticks
+            assert all(isinstance(v, int) for v in ticks.values())
+
+    @pytest.mark.asyncio
+    async def test_simulator_writes_ticks(self):
+        """The simulator publishes straight into a fixed-point cache."""
+        cache = FixedPointPriceCache(scale=10_000)
+        source = SimulatorDataSource(price_cache=cache, update_interval=60.0, seed=3)
+        await source.start(["AAPL", "GOOGL"])
+        source._tick()
+        expected = round(source._sim.get_price("AAPL") * 10_000)
+        assert cache.snapshot().get_ticks("AAPL") == expected
+        assert cache.version == 2  # Seeded, then one tick
+        await source.stop()
@@ -0,0 +1,90 @@
+"""Tests for per-ticker price history."""
+
+import numpy as np
+
+from app.market.cache import PriceCache
+from app.market.columnar import ColumnarPriceCache
+from app.market.history import PriceHistory, downsample
+from app.market.stream import _history_payload
+
+
+def _fill(cache: PriceCache, n: int) -> None:
+    """Write n ticks: AAPL at 100 + i and GOOGL at 200 + i, at timestamp i + 1."""
+    for i in range(n):
+        cache.update_many({"AAPL": 100.0 + i, "GOOGL": 200.0 + i}, timestamp=i + 1.0)
+
+
+class TestPriceHistory:
+    """Unit tests for PriceHistory."""
+
+    def test_records_cache_writes(self):
+        """Every write to an attached cache is recorded in time order."""
+        cache = PriceCache()
+        cache.update("AAPL", 99.0, timestamp=0.5)
+        history = PriceHistory()
+        history.attach(cache)  # Starts from the current prices
+        _fill(cache, 3)
+        times, prices = history.last("AAPL")
+        np.testing.assert_array_equal(times, [0.5, 1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(prices, [99.0, 100.0, 101.0, 102.0])
+
+    def test_ring_keeps_latest_points(self):
+        """Past capacity the oldest points are overwritten."""
+        cache = PriceCache()
+        history = PriceHistory(capacity=4)
+        history.attach(cache)
+        _fill(cache, 10)
+        times, prices = history.last("GOOGL")
+        np.testing.assert_array_equal(prices, [206.0, 207.0, 208.0, 209.0])
+        assert list(history.last("GOOGL", n=2)[1]) == [208.0, 209.0]
+
+    def test_time_range(self):
+        """between() selects points by timestamp."""
+        cache = PriceCache()
+        history = PriceHistory()
+        history.attach(cache)
+        _fill(cache, 10)
+        times, prices = history.between("AAPL", 3.0, 5.0)
+        np.testing.assert_array_equal(times, [3.0, 4.0, 5.0])
+        assert len(history.between("AAPL", 8.0)[0]) == 3
+
+    def test_downsample_keeps_last_point(self):
+        """Downsampling returns at most `points` points, ending at the latest."""
+        times = np.arange(100.0)
+        sampled, _ = downsample(times, times, 7)
+        assert len(sampled) == 7
+        assert sampled[-1] == 99.0
+        assert np.all(np.diff(sampled) > 0)
+        assert len(downsample(times, times, 200)[0]) == 100
+
+    def test_removed_tickers_dropped(self):
+        """Tickers removed from the cache leave the history on the next write."""
+        cache = PriceCache()
+        history = PriceHistory(rows=1)  # Also forces the arrays to grow
+        history.attach(cache)
+        _fill(cache, 2)
+        cache.remove("GOOGL")
+        cache.update("AAPL", 150.0)
+        assert "GOOGL" not in history
+        assert history.last("GOOGL")[0].size == 0
+        assert history.last("AAPL")[1][-1] == 150.0
+
+    def test_columnar_cache(self):
+        """History reads batches straight from columnar snapshots."""
+        cache = ColumnarPriceCache()
+        history = PriceHistory()
+        history.attach(cache)
+        _fill(cache, 3)
+        np.testing.assert_array_equal(history.last("AAPL")[1], [100.0, 101.0, 102.0])
+
+    def test_history_payload(self):
+        """The HTTP payload lists known tickers as JSON-ready lists."""
+        cache = PriceCache()
+        history = PriceHistory()
+        history.attach(cache)
+        _fill(cache, 10)
+        payload = _history_payload(history, ["aapl", "NOPE"], points=5)
+        assert list(payload) == ["AAPL"]
+        assert payload["AAPL"]["prices"][-1] == 109.0
+        assert len(payload["AAPL"]["timestamps"]) == 5
+        assert len(_history_payload(history, ["AAPL"], points=50, since=8.0)["AAPL"]["prices"]) == 3
@@ -1,5 +1,6 @@
 """Tests for MassiveDataSource (mocked)."""
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -30,7 +31,7 @@ class TestMassiveDataSource:
             price_cache=cache,
             poll_interval=60.0,  # Long interval so the loop doesn't auto-poll
         )
-        source._tickers = ["AAPL", "GOOGL"]
+        source._tickers = dict.fromkeys(["AAPL", "GOOGL"])
         source._client = MagicMock()  # Satisfy the _poll_once guard
 
         mock_snapshots = [
@@ -43,6 +44,7 @@ class TestMassiveDataSource:
 
         assert cache.get_price("AAPL") == 190.50
         assert cache.get_price("GOOGL") == 175.25
+        assert cache.version == 1  # The whole poll is one batch
 
     async def test_malformed_snapshot_skipped(self):
         """Test that malformed snapshots are skipped gracefully."""
@@ -52,7 +54,7 @@ class TestMassiveDataSource:
             price_cache=cache,
             poll_interval=60.0,
         )
-        source._tickers = ["AAPL", "BAD"]
+        source._tickers = dict.fromkeys(["AAPL", "BAD"])
         source._client = MagicMock()  # Satisfy the _poll_once guard
 
         good_snap = _make_snapshot("AAPL", 190.50, 1707580800000)
@@ -75,7 +77,7 @@ class TestMassiveDataSource:
             price_cache=cache,
             poll_interval=60.0,
         )
-        source._tickers = ["AAPL"]
+        source._tickers = dict.fromkeys(["AAPL"])
         source._client = MagicMock()  # Satisfy the _poll_once guard
 
         with patch.object(source, "_fetch_snapshots", side_effect=Exception("network error")):
@@ -91,7 +93,7 @@ class TestMassiveDataSource:
             price_cache=cache,
             poll_interval=60.0,
         )
-        source._tickers = ["AAPL"]
+        source._tickers = dict.fromkeys(["AAPL"])
         source._client = MagicMock()  # Satisfy the _poll_once guard
 
         mock_snapshots = [_make_snapshot("AAPL", 190.50, 1707580800000)]
@@ -131,18 +133,31 @@ class TestMassiveDataSource:
         """Test removing a ticker."""
         cache = PriceCache()
         source = MassiveDataSource(api_key="test-key", price_cache=cache)
-        source._tickers = ["AAPL", "GOOGL"]
+        source._tickers = dict.fromkeys(["AAPL", "GOOGL"])
         cache.update("AAPL", 190.00)
 
         await source.remove_ticker("AAPL")
         assert "AAPL" not in source.get_tickers()
         assert cache.get("AAPL") is None
 
+    async def test_bulk_add_and_remove(self):
+        """Test batched watchlist edits keep order and skip duplicates."""
+        cache = PriceCache()
+        source = MassiveDataSource(api_key="test-key", price_cache=cache)
+        cache.update("GOOGL", 175.00)
+
+        await source.add_tickers(["aapl", "GOOGL", "AAPL", "MSFT"])
+        assert source.get_tickers() == ["AAPL", "GOOGL", "MSFT"]
+
+        await source.remove_tickers(["GOOGL", "NOPE"])
+        assert source.get_tickers() == ["AAPL", "MSFT"]
+        assert cache.get("GOOGL") is None
+
     async def test_get_tickers(self):
         """Test getting the list of active tickers."""
         cache = PriceCache()
         source = MassiveDataSource(api_key="test-key", price_cache=cache)
-        source._tickers = ["AAPL", "GOOGL"]
+        source._tickers = dict.fromkeys(["AAPL", "GOOGL"])
 
         tickers = source.get_tickers()
         assert tickers == ["AAPL", "GOOGL"]
@@ -151,7 +166,7 @@ class TestMassiveDataSource:
         """Test that polling is skipped when there are no tickers."""
         cache = PriceCache()
         source = MassiveDataSource(api_key="test-key", price_cache=cache)
-        source._tickers = []
+        source._tickers = {}
 
         # Should not call _fetch_snapshots
         with patch.object(source, "_fetch_snapshots") as mock_fetch:
@@ -199,3 +214,21 @@ class TestMassiveDataSource:
         assert cache.get_price("AAPL") == 190.50
 
         await source.stop()
+
+    async def test_start_on_restored_cache_polls_in_background(self):
+        """Test that start() does not block on the API when the cache is already warm."""
+        cache = PriceCache()
+        cache.update("AAPL", 180.00)  # e.g. restored from a checkpoint
+        source = MassiveDataSource(api_key="test-key", price_cache=cache, poll_interval=60.0)
+
+        mock_snapshots = [_make_snapshot("AAPL", 190.50, 1707580800000)]
+
+        with patch("app.market.massive_client.RESTClient"):
+            with patch.object(source, "_fetch_snapshots", return_value=mock_snapshots):
+                await source.start(["AAPL"])
+                assert cache.get_price("AAPL") == 180.00  # Last known price served at once
+                await asyncio.sleep(0.05)
+
+        assert cache.get_price("AAPL") == 190.50  # Refreshed by the background poll
+
+        await source.stop()
@@ -0,0 +1,55 @@
+"""Tests for offline bulk path generation."""
+
+import numpy as np
+
+from app.market.paths import generate_paths
+from app.market.seed_prices import SEED_PRICES
+from app.market.simulator import GBMSimulator
+
+TICKERS = ["AAPL", "GOOGL", "MSFT", "JPM", "V"]
+
+
+class TestGeneratePaths:
+    """Unit tests for generate_paths and GBMSimulator.simulate."""
+
+    def test_output_shape_and_seed_row(self, tmp_path):
+        """The file holds n_steps + 1 rows, starting from the seed prices."""
+        out = generate_paths(tmp_path / "paths.npy", TICKERS, 100, seed=1)
+        assert out.shape == (101, len(TICKERS))
+        assert list(out[0]) == [SEED_PRICES[t] for t in TICKERS]
+
+    def test_file_reloads_as_memmap(self, tmp_path):
+        """The written file can be memory-mapped back with np.load."""
+        path = tmp_path / "paths.npy"
+        generate_paths(path, TICKERS, 50, seed=1, chunk_steps=7)
+        loaded = np.load(path, mmap_mode="r")
+        assert isinstance(loaded, np.memmap)
+        assert loaded.shape == (51, len(TICKERS))
+        assert np.all(loaded > 0)
+
+    def test_seed_is_reproducible(self, tmp_path):
+        """Same seed and chunking give identical files."""
+        a = generate_paths(tmp_path / "a.npy", TICKERS, 200, seed=7, chunk_steps=64)
+        b = generate_paths(tmp_path / "b.npy", TICKERS, 200, seed=7, chunk_steps=64)
+        np.testing.assert_array_equal(a, b)
+
+    def test_float32_output(self, tmp_path):
+        """A narrower dtype can be requested for very large outputs."""
+        out = generate_paths(tmp_path / "p.npy", TICKERS, 10, dtype=np.float32)
+        assert out.dtype == np.float32
+
+    def test_paths_are_correlated(self, tmp_path):
+        """Log returns carry the sector correlation structure."""
+        out = generate_paths(
+            tmp_path / "p.npy", ["AAPL", "GOOGL", "JPM"], 20_000, seed=3, event_probability=0.0
+        )
+        corr = np.corrcoef(np.diff(np.log(out), axis=0).T)
+        assert abs(corr[0, 1] - 0.6) < 0.03
+        assert abs(corr[0, 2] - 0.3) < 0.03
+
+    def test_simulate_advances_state(self):
+        """simulate() leaves the simulator at the last generated row."""
+        sim = GBMSimulator(tickers=TICKERS, seed=5)
+        paths = sim.simulate(30)
+        assert paths.shape == (30, len(TICKERS))
+        assert sim.get_price("AAPL") == paths[-1, 0]
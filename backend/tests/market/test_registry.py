@@ -0,0 +1,90 @@
+"""Tests for the reference-counted TickerRegistry."""
+
+import pytest
+
+from app.market.cache import PriceCache
+from app.market.clock import VirtualClock
+from app.market.registry import TickerRegistry
+from app.market.simulator import SimulatorDataSource
+
+
+@pytest.fixture
+async def setup():
+    clock = VirtualClock()
+    cache = PriceCache(clock=clock)
+    source = SimulatorDataSource(price_cache=cache, update_interval=60.0, clock=clock)
+    await source.start([])
+    registry = TickerRegistry(source, grace_period=30.0, clock=clock)
+    yield registry, source, cache, clock
+    await registry.stop()
+    await source.stop()
+
+
+@pytest.mark.asyncio
+class TestTickerRegistry:
+    """Unit tests for TickerRegistry."""
+
+    async def test_source_tracks_union_of_references(self, setup):
+        """The source simulates every ticker some owner references, once."""
+        registry, source, cache, _ = setup
+        await registry.acquire("watchlist", ["AAPL", "GOOGL"])
+        await registry.acquire("positions", ["aapl", "MSFT"])
+        assert source.get_tickers() == ["AAPL", "GOOGL", "MSFT"]
+        assert registry.refcount("AAPL") == 2
+        assert "MSFT" in cache
+
+    async def test_eviction_waits_for_grace_period(self, setup):
+        """A ticker's last release evicts it only after the grace period."""
+        registry, source, cache, clock = setup
+        await registry.acquire("watchlist", ["AAPL", "GOOGL"])
+        await registry.acquire("positions", ["AAPL"])
+        await registry.release("watchlist")
+        assert "AAPL" in registry  # Still held by positions
+        assert "GOOGL" not in registry
+
+        clock.advance(29.0)
+        assert await registry.sweep() == []
+        assert "GOOGL" in source.get_tickers()
+        clock.advance(1.0)
+        assert await registry.sweep() == ["GOOGL"]
+        assert source.get_tickers() == ["AAPL"]
+        assert "GOOGL" not in cache
+
+    async def test_reacquire_cancels_eviction(self, setup):
+        """Re-referencing an idle ticker keeps it without touching the source."""
+        registry, source, _, clock = setup
+        await registry.acquire("sse-1", ["AAPL"])
+        await registry.release("sse-1", ["AAPL"])
+        clock.advance(10.0)
+        await registry.acquire("sse-2", ["AAPL"])
+        clock.advance(60.0)
+        assert await registry.sweep() == []
+        assert source.get_tickers() == ["AAPL"]
+
+    async def test_release_is_per_owner(self, setup):
+        """Releasing twice, or what an owner never held, changes nothing."""
+        registry, _, _, _ = setup
+        await registry.acquire("a", ["AAPL"])
+        await registry.acquire("b", ["AAPL"])
+        await registry.release("a", ["AAPL"])
+        await registry.release("a", ["AAPL"])
+        await registry.release("c", ["AAPL"])
+        assert registry.refcount("AAPL") == 1
+
+    async def test_start_adopts_unreferenced_source_tickers(self, setup):
+        """Tickers the source already had are evicted unless someone claims them."""
+        registry, source, _, clock = setup
+        await source.add_tickers(["AAPL", "TSLA"])
+        await registry.start()
+        await registry.acquire("watchlist", ["AAPL"])
+        clock.advance(30.0)
+        assert await registry.sweep() == ["TSLA"]
+        assert source.get_tickers() == ["AAPL"]
+
+    async def test_zero_grace_evicts_immediately(self, setup):
+        """With no grace period, the last release evicts at once."""
+        _, source, _, clock = setup
+        registry = TickerRegistry(source, grace_period=0, clock=clock)
+        await registry.acquire("a", ["AAPL"])
+        await registry.release("a")
+        assert source.get_tickers() == []
@@ -0,0 +1,126 @@
+"""Tests for Monte Carlo portfolio risk."""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.market.cache import PriceCache
+from app.market.risk import RiskEngine
+from app.market.simulator import GBMSimulator, SimulatorDataSource
+
+TICKERS = ["AAPL", "GOOGL", "MSFT", "JPM", "V"]
+
+
+@pytest.fixture
+def sim():
+    return GBMSimulator(tickers=TICKERS, seed=1)
+
+
+@pytest.fixture
+def cache(sim):
+    cache = PriceCache()
+    cache.update_many({t: sim.get_price(t) for t in TICKERS})
+    return cache
+
+
+class TestScenarioModel:
+    """Unit tests for GBMSimulator.scenario_model."""
+
+    @pytest.mark.parametrize("correlation", ["cholesky", "factor"])
+    def test_mixing_reproduces_correlations(self, correlation):
+        """mixing @ mixing.T is the simulator's correlation matrix for the tickers."""
+        sim = GBMSimulator(tickers=TICKERS, correlation=correlation)
+        model = sim.scenario_model(["JPM", "AAPL", "MSFT"])
+        corr = model.mixing @ model.mixing.T
+        np.testing.assert_allclose(np.diagonal(corr), 1.0)
+        assert corr[1, 2] == pytest.approx(0.6)  # AAPL-MSFT: same tech sector
+        assert corr[0, 1] == pytest.approx(0.3)  # JPM-AAPL: across sectors
+
+    def test_unknown_ticker_rejected(self, sim):
+        """Tickers outside the simulation have no model."""
+        with pytest.raises(ValueError, match="NOPE"):
+            sim.scenario_model(["AAPL", "NOPE"])
+
+
+class TestRiskEngine:
+    """Unit tests for RiskEngine."""
+
+    def test_var_and_shortfall(self, sim, cache):
+        """Losses are positive, and the tail average is at least the quantile."""
+        result = RiskEngine(sim, cache, seed=3).evaluate({"AAPL": 10, "JPM": 20})
+        value = 10 * cache.get_price("AAPL") + 20 * cache.get_price("JPM")
+        assert result.value == pytest.approx(value)
+        assert 0 < result.var <= result.expected_shortfall < result.value
+
+    def test_matches_lognormal_quantile(self, cache):
+        """Without shock events, a single stock's VaR is the lognormal quantile."""
+        sim = GBMSimulator(tickers=TICKERS, event_probability=0.0, seed=1)
+        engine = RiskEngine(sim, cache, scenarios=100_000, confidence=0.95, seed=3)
+        result = engine.evaluate({"AAPL": 100})
+
+        model = sim.scenario_model(["AAPL"])
+        steps = engine._horizon / (model.dt * GBMSimulator.TRADING_SECONDS_PER_YEAR)
+        mean, sd = model.drift[0] * steps, model.diffusion[0] * math.sqrt(steps)
+        expected = result.value * -math.expm1(mean - 1.6448536 * sd)
+        assert result.var == pytest.approx(expected, rel=0.03)
+
+    def test_hedge_reduces_risk(self, cache):
+        """Shorting a correlated stock against a long lowers the VaR."""
+        sim = GBMSimulator(tickers=TICKERS, event_probability=0.0, seed=1)
+        engine = RiskEngine(sim, cache, seed=3)
+        long_only = engine.evaluate({"AAPL": 10})
+        hedged = engine.evaluate({"AAPL": 10, "MSFT": -2})
+        assert hedged.var < long_only.var
+
+    def test_reproducible_with_seed(self, sim, cache):
+        """The same seed gives the same scenarios, evaluation after evaluation."""
+        a = RiskEngine(sim, cache, seed=3).evaluate({"AAPL": 10})
+        b = RiskEngine(sim, cache, seed=3).evaluate({"AAPL": 10})
+        assert a == b
+
+    def test_cached_until_prices_change(self, sim, cache):
+        """Results are reused until the cache version moves on."""
+        engine = RiskEngine(sim, cache, seed=3)
+        first = engine.evaluate({"AAPL": 10, "JPM": 0})
+        assert engine.evaluate({"AAPL": 10}) is first  # Zero quantities are ignored
+
+        cache.update("AAPL", cache.get_price("AAPL") * 2)
+        second = engine.evaluate({"AAPL": 10})
+        assert second is not first
+        assert second.value == pytest.approx(2 * first.value)
+
+    def test_empty_portfolio(self, sim, cache):
+        """No positions means no risk."""
+        result = RiskEngine(sim, cache).evaluate({})
+        assert result.value == result.var == result.expected_shortfall == 0.0
+
+    def test_unpriced_ticker_rejected(self, sim, cache):
+        """A position in a ticker without a price is an error."""
+        with pytest.raises(ValueError, match="TSLA"):
+            RiskEngine(sim, cache).evaluate({"TSLA": 1})
+
+    def test_process_pool_matches_in_process(self, sim, cache):
+        """Batches run in worker processes give the same result."""
+        local = RiskEngine(sim, cache, scenarios=4_000, batch_size=1_000, seed=3)
+        pooled = RiskEngine(sim, cache, scenarios=4_000, batch_size=1_000, seed=3, workers=2)
+        try:
+            assert pooled.evaluate({"AAPL": 10}) == local.evaluate({"AAPL": 10})
+        finally:
+            pooled.close()
+
+
+@pytest.mark.asyncio
+class TestDataSourceRisk:
+    """RiskEngine over a running SimulatorDataSource."""
+
+    async def test_engine_reads_live_source(self):
+        """The data source serves its simulator's model between ticks."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.05, executor="thread")
+        await source.start(["AAPL", "MSFT"])
+        try:
+            result = RiskEngine(source, cache).evaluate({"AAPL": 1, "MSFT": 1})
+            assert result.var > 0
+        finally:
+            await source.stop()
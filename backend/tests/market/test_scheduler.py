@@ -0,0 +1,83 @@
+"""Tests for TickScheduler."""
+
+import threading
+
+import pytest
+
+from app.market.clock import VirtualClock
+from app.market.scheduler import TickScheduler
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+class TestTickScheduler:
+    """Unit tests for deadline bookkeeping."""
+
+    def test_first_tick_immediate(self, clock):
+        """The first tick is due at once unless start_immediately=False."""
+        assert TickScheduler(0.5, clock=clock).delay() == 0.0
+        assert TickScheduler(0.5, start_immediately=False, clock=clock).delay() == 0.5
+
+    def test_deadlines_do_not_drift(self, clock):
+        """Work between ticks shortens the next wait instead of delaying it."""
+        sched = TickScheduler(0.5, clock=clock)
+        first = sched.fire()
+        clock.advance(0.2)  # Work done during the tick
+        assert sched.delay() == pytest.approx(0.3)
+        clock.advance(0.3)
+        second = sched.fire()
+        assert second.deadline == pytest.approx(first.deadline + 0.5)
+        assert second.lateness == pytest.approx(0.0)
+        assert second.index == 1
+
+    def test_skip_policy_drops_missed_ticks(self, clock):
+        """Overrunning several intervals collapses them into one tick of one interval."""
+        sched = TickScheduler(0.5, policy="skip", clock=clock)
+        sched.fire()
+        clock.advance(1.7)  # Deadlines at +0.5, +1.0 and +1.5 have passed
+        tick = sched.fire()
+        assert tick.missed == 2
+        assert tick.intervals == 1
+        assert tick.lateness == pytest.approx(1.2)
+        assert tick.index == 3
+        assert sched.delay() == pytest.approx(0.3)  # Next deadline stays on the grid
+
+    def test_catch_up_policy_covers_gap(self, clock):
+        """The catch_up policy reports every interval the tick stands for."""
+        sched = TickScheduler(0.5, policy="catch_up", clock=clock)
+        sched.fire()
+        clock.advance(1.7)
+        assert sched.fire().intervals == 3
+
+    def test_invalid_arguments_rejected(self):
+        """Non-positive intervals and unknown policies are rejected."""
+        with pytest.raises(ValueError):
+            TickScheduler(0)
+        with pytest.raises(ValueError):
+            TickScheduler(0.5, policy="burst")
+
+    def test_wait_returns_none_when_stopped(self):
+        """The threaded driver stops as soon as the event is set."""
+        stop = threading.Event()
+        sched = TickScheduler(10.0)
+        assert sched.wait(stop) is not None
+        stop.set()
+        assert sched.wait(stop) is None
+
+
+@pytest.mark.asyncio
+class TestTickSchedulerAsync:
+    """Tests for the async iterator."""
+
+    async def test_async_iteration(self):
+        """Ticks arrive on consecutive deadlines."""
+        ticks = []
+        async for tick in TickScheduler(0.01):
+            ticks.append(tick)
+            if len(ticks) == 3:
+                break
+        assert ticks[0].index == 0
+        assert ticks[2].deadline == pytest.approx(ticks[0].deadline + 0.02)
@@ -0,0 +1,86 @@
+"""Tests for the multi-process ShardedSimulator."""
+
+import numpy as np
+import pytest
+
+from app.market.seed_prices import SEED_PRICES
+from app.market.sharded import ShardedSimulator
+from app.market.simulator import GBMSimulator
+
+
+@pytest.fixture
+def sharded():
+    sim = ShardedSimulator(
+        tickers=["AAPL", "GOOGL", "MSFT", "JPM", "V"], workers=2, seed=7, event_probability=0.0
+    )
+    yield sim
+    sim.close()
+
+
+class TestShardedSimulator:
+    """Tests for the sharded simulator (spawns real worker processes)."""
+
+    def test_initial_prices_are_seeds(self, sharded):
+        """Workers publish seed prices into shared memory before the first step."""
+        assert sharded.get_price("JPM") == SEED_PRICES["JPM"]
+        assert sharded.get_tickers() == ["AAPL", "GOOGL", "MSFT", "JPM", "V"]
+
+    def test_step_returns_all_tickers_in_order(self, sharded):
+        """step() returns every ticker, in the caller's order."""
+        result = sharded.step()
+        assert list(result) == ["AAPL", "GOOGL", "MSFT", "JPM", "V"]
+        assert all(price > 0 for price in result.values())
+
+    def test_add_and_remove(self, sharded):
+        """Tickers can be added to and removed from shards."""
+        sharded.add_ticker("TSLA")
+        sharded.remove_ticker("GOOGL")
+        sharded.remove_ticker("NOPE")  # No-op
+        result = sharded.step()
+        assert set(result) == {"AAPL", "MSFT", "JPM", "V", "TSLA"}
+        assert sharded.get_price("GOOGL") is None
+
+    def test_bulk_add_and_remove(self, sharded):
+        """Batched edits spread new tickers over the shards and keep prices aligned."""
+        sharded.add_tickers(["TSLA", "NFLX", "META", "AAPL"])
+        sharded.remove_tickers(["GOOGL", "JPM", "NOPE"])
+        assert sharded.get_tickers() == ["AAPL", "MSFT", "V", "TSLA", "NFLX", "META"]
+        assert sum(sharded._shard_sizes) == 6
+        assert sharded.get_price("TSLA") == SEED_PRICES["TSLA"]
+        assert set(sharded.step()) == set(sharded.get_tickers())
+
+    def test_capacity_grows(self, sharded):
+        """Adding past the shared array's capacity reallocates it."""
+        capacity = sharded._capacity
+        for i in range(capacity):
+            sharded.add_ticker(f"X{i}")
+        assert sharded._capacity > capacity
+        assert len(sharded.step()) == capacity + 5
+
+    def test_cross_shard_correlation(self, sharded):
+        """AAPL and GOOGL sit on different shards but still move together."""
+        log_prices = np.log([list(sharded.step().values()) for _ in range(3000)])
+        corr = np.corrcoef(np.diff(log_prices, axis=0).T)
+        assert corr[0, 1] > 0.4  # tech/tech, ~0.6 before rounding noise
+
+    def test_matches_single_process_factor_mode(self, sharded):
+        """Same seed gives the same paths as an unsharded factor-mode simulator."""
+        single = GBMSimulator(
+            tickers=["AAPL", "GOOGL", "MSFT", "JPM", "V"],
+            seed=7,
+            event_probability=0.0,
+            correlation="factor",
+        )
+        for _ in range(100):
+            sharded.step()
+            single.step()
+        for ticker in single.get_tickers():
+            np.testing.assert_allclose(
+                sharded.get_price(ticker), single.get_price(ticker), rtol=1e-9
+            )
+
+    def test_close_is_idempotent(self):
+        """close() can be called twice."""
+        sim = ShardedSimulator(tickers=["AAPL"], workers=1)
+        sim.close()
+        sim.close()
@@ -0,0 +1,124 @@
+"""Tests for the shared-memory price cache."""
+
+import asyncio
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.market.shared_cache import SharedPriceCache, SharedPriceReader
+
+
+@pytest.fixture
+def shared():
+    cache = SharedPriceCache(capacity=8)
+    reader = SharedPriceReader(cache.name)
+    yield cache, reader
+    reader.close()
+    cache.close()
+
+
+class TestSharedPriceCache:
+    """Unit tests for SharedPriceCache and SharedPriceReader."""
+
+    def test_reader_sees_writes(self, shared):
+        """A reader attached by name sees every write, with versions and directions."""
+        cache, reader = shared
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0}, timestamp=1.0)
+        cache.update("AAPL", 191.0, timestamp=2.0)
+        assert reader.version == cache.version == 2
+        assert reader.get("AAPL") == cache.get("AAPL")
+        assert reader.get("AAPL").direction == "up"
+        assert reader.get_all() == cache.get_all()
+        assert list(reader.changes_since(1)) == ["AAPL"]
+
+    def test_snapshot_reused_until_next_write(self, shared):
+        """Reading twice without a write copies nothing the second time."""
+        cache, reader = shared
+        cache.update("AAPL", 190.0)
+        first = reader.snapshot()
+        assert reader.snapshot() is first
+        cache.update("AAPL", 191.0)
+        assert reader.snapshot() is not first
+        assert first.get_price("AAPL") == 190.0  # Old snapshots stay intact
+
+    def test_removal_reaches_reader(self, shared):
+        """Removed tickers disappear from the reader's ticker table."""
+        cache, reader = shared
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0, "MSFT": 420.0})
+        cache.remove("AAPL")
+        assert "AAPL" not in reader
+        assert reader.get_price("MSFT") == 420.0
+        assert len(reader) == 2
+
+    def test_reader_is_read_only(self, shared):
+        """Writes through a reader are rejected."""
+        _, reader = shared
+        with pytest.raises(TypeError):
+            reader.update("AAPL", 190.0)
+
+    def test_capacity_and_ticker_limits(self, shared):
+        """The fixed-size segment rejects overflow and oversized tickers."""
+        cache, _ = shared
+        cache.update_many({f"T{i}": 1.0 for i in range(8)})
+        with pytest.raises(ValueError):
+            cache.update("ONEMORE", 1.0)
+        with pytest.raises(ValueError):
+            cache.update("T0" * 9, 1.0)
+        assert len(cache) == 8
+
+    def test_consistent_under_concurrent_writes(self, shared):
+        """A reader never sees a torn write: every row carries one version's values."""
+        cache, reader = shared
+        tickers = [f"T{i}" for i in range(8)]
+        stop = threading.Event()
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                i += 1
+                cache.update_many(dict.fromkeys(tickers, float(i)))
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            for _ in range(2000):
+                snapshot = reader.snapshot()
+                if len(snapshot):
+                    assert set(snapshot.price.tolist()) == {float(snapshot.version)}
+        finally:
+            stop.set()
+            writer.join()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_change_and_listeners(self, shared):
+        """The reader's poller wakes waiters and feeds listeners."""
+        cache, reader = shared
+        seen = []
+        reader.add_listener(lambda snapshot, tickers: seen.append(tickers))
+        waiter = asyncio.create_task(reader.wait_for_change(0, timeout=5))
+        await asyncio.sleep(0.01)
+        cache.update_many({"AAPL": 190.0, "GOOGL": 175.0})
+        assert (await waiter).version == 1
+        assert seen == [["AAPL", "GOOGL"]]
+
+    def test_reader_in_another_process(self, shared):
+        """A separate interpreter reads the producer's prices by segment name."""
+        cache, _ = shared
+        cache.update_many({"AAPL": 190.5, "GOOGL": 175.25})
+        code = (
+            "import sys; from app.market.shared_cache import SharedPriceReader; "
+            "r = SharedPriceReader(sys.argv[1]); "
+            "print(r.version, r.get_price('AAPL'), r.get_price('GOOGL')); r.close()"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, cache.name],
+            cwd=Path(__file__).parents[2],
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        )
+        assert result.stdout.split() == ["1", "190.5", "175.25"]
@@ -0,0 +1,53 @@
+"""Tests for shared-memory segment helpers."""
+
+import subprocess
+import sys
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import pytest
+
+from app.market import shm
+
+
+class TestSharedMemory:
+    """Unit tests for create/attach/unlink."""
+
+    def test_attach_maps_the_same_bytes(self):
+        """An attached segment sees the creator's writes."""
+        segment = shm.create(16)
+        try:
+            segment.buf[:4] = b"ping"
+            other = shm.attach(segment.name)
+            assert bytes(other.buf[:4]) == b"ping"
+            other.close()
+        finally:
+            shm.unlink(segment)
+
+    def test_reader_process_exit_keeps_segment(self):
+        """A separate interpreter that attaches and exits does not unlink the segment."""
+        segment = shm.create(16)
+        try:
+            code = (
+                "import sys; from app.market import shm; "
+                "s = shm.attach(sys.argv[1]); s.buf[0] = 7; s.close()"
+            )
+            subprocess.run(
+                [sys.executable, "-c", code, segment.name],
+                cwd=Path(__file__).parents[2],
+                timeout=60,
+                check=True,
+            )
+            again = shm.attach(segment.name)  # Still there
+            assert again.buf[0] == 7
+            again.close()
+        finally:
+            shm.unlink(segment)
+
+    def test_unlink_removes_segment(self):
+        """unlink() frees the segment for good."""
+        segment = shm.create(16)
+        name = segment.name
+        shm.unlink(segment)
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
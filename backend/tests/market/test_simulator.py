@@ -1,7 +1,12 @@
 """Tests for GBMSimulator."""
 
+import math
+
+import numpy as np
+import pytest
+
 from app.market.seed_prices import SEED_PRICES
-from app.market.simulator import GBMSimulator
+from app.market.simulator import NORMAL_STREAM, GBMSimulator, _symbol_key
 
 
 class TestGBMSimulator:
@@ -129,3 +134,211 @@ class TestGBMSimulator:
         if '.' in price_str:
             decimal_part = price_str.split('.')[1]
             assert len(decimal_part) <= 2
+
+    def test_remove_keeps_state_aligned(self):
+        """Removing a ticker from the middle keeps prices attached to the right tickers."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL", "MSFT"])
+        sim.remove_ticker("GOOGL")
+        assert sim.get_tickers() == ["AAPL", "MSFT"]
+        assert sim.get_price("AAPL") == SEED_PRICES["AAPL"]
+        assert sim.get_price("MSFT") == SEED_PRICES["MSFT"]
+
+    def test_every_ticker_shocked_when_event_certain(self):
+        """With event_probability=1.0 every ticker moves by at least ~2% per step."""
+        sim = GBMSimulator(tickers=["AAPL", "JPM", "V"], event_probability=1.0)
+        result = sim.step()
+        for ticker, price in result.items():
+            assert abs(price / SEED_PRICES[ticker] - 1) > 0.015
+
+    def test_large_universe_step(self):
+        """A 1,000-ticker universe steps and returns a price for every ticker."""
+        tickers = [f"T{i:04d}" for i in range(1000)]
+        sim = GBMSimulator(tickers=tickers)
+        result = sim.step()
+        assert len(result) == 1000
+        assert all(price > 0 for price in result.values())
+
+    def test_factor_mode_step(self):
+        """Factor correlation mode steps without a dense Cholesky factor."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL", "JPM"], correlation="factor")
+        assert sim._cholesky is None
+        sim.add_ticker("TSLA")
+        sim.remove_ticker("GOOGL")
+        result = sim.step()
+        assert set(result) == {"AAPL", "JPM", "TSLA"}
+        assert sim._loadings.shape[0] == 3
+
+    def test_factor_mode_correlations(self):
+        """Factor-mode draws carry the sector correlations (tech 0.6, cross 0.3)."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL", "JPM"], correlation="factor")
+        raw, _, factors = sim._take_rows(20_000)
+        draws = sim._correlate(raw, factors)
+        corr = np.corrcoef(draws.T)
+        assert abs(corr[0, 1] - 0.6) < 0.03
+        assert abs(corr[0, 2] - 0.3) < 0.03
+
+    def test_unknown_correlation_mode_rejected(self):
+        """An unknown correlation mode raises ValueError."""
+        with pytest.raises(ValueError):
+            GBMSimulator(tickers=["AAPL"], correlation="nope")
+
+    def test_seed_makes_runs_reproducible(self):
+        """Two simulators with the same seed produce identical paths."""
+        a = GBMSimulator(tickers=["AAPL", "ZZZZ"], seed=42)
+        b = GBMSimulator(tickers=["AAPL", "ZZZZ"], seed=42)
+        assert a.get_price("ZZZZ") == b.get_price("ZZZZ")
+        for _ in range(200):
+            assert a.step() == b.step()
+
+    def test_ticker_paths_independent_of_other_tickers(self):
+        """In factor mode a ticker's path is unaffected by watchlist changes."""
+        a = GBMSimulator(tickers=["AAPL", "GOOGL", "JPM"], seed=9, correlation="factor")
+        b = GBMSimulator(tickers=["AAPL", "JPM"], seed=9, correlation="factor")
+        for i in range(150):
+            if i == 20:
+                b.add_ticker("ZZZZ")
+            if i == 90:
+                a.remove_ticker("GOOGL")
+            pa, pb = a.step(), b.step()
+            assert pa["AAPL"] == pb["AAPL"]
+            assert pa["JPM"] == pb["JPM"]
+
+    def test_appending_keeps_cholesky_paths(self):
+        """In cholesky mode, appending a ticker leaves earlier tickers' paths unchanged."""
+        a = GBMSimulator(tickers=["AAPL", "GOOGL"], seed=4)
+        b = GBMSimulator(tickers=["AAPL", "GOOGL"], seed=4)
+        for i in range(100):
+            if i == 30:
+                b.add_ticker("JPM")
+            pa, pb = a.step(), b.step()
+            assert pa["AAPL"] == pb["AAPL"]
+            assert pa["GOOGL"] == pb["GOOGL"]
+
+    def test_unknown_ticker_seed_price_is_deterministic(self):
+        """An unknown ticker's seed price depends only on the seed and symbol."""
+        a = GBMSimulator(tickers=["ZZZZ"], seed=11)
+        b = GBMSimulator(tickers=["AAPL", "QQQQ", "ZZZZ"], seed=11)
+        assert a.get_price("ZZZZ") == b.get_price("ZZZZ")
+        assert a.seed == 11
+
+    def test_simulate_continues_step_streams(self):
+        """simulate() and step() consume the same streams in order."""
+        a = GBMSimulator(tickers=["AAPL", "JPM"], seed=2, block_size=16)
+        b = GBMSimulator(tickers=["AAPL", "JPM"], seed=2, block_size=16)
+        for _ in range(5):
+            a.step()
+        b.simulate(5)
+        np.testing.assert_allclose(a.get_price("AAPL"), b.get_price("AAPL"), rtol=1e-12)
+
+    def test_draws_served_from_block(self):
+        """Correlated draws are generated once per block and consumed per tick."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL"], block_size=8)
+        sim.step()
+        block = sim._block
+        assert block.shape == (8, 2)
+        for _ in range(7):
+            sim.step()
+        assert sim._block is block
+        sim.step()
+        assert sim._block is not block  # Exhausted -> refilled
+
+    def test_block_invalidated_on_ticker_change(self):
+        """Adding or removing a ticker discards the pre-generated block."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL"])
+        sim.step()
+        sim.add_ticker("MSFT")
+        assert sim._block is None
+        assert len(sim.step()) == 3
+        sim.remove_ticker("AAPL")
+        assert sim._block is None
+        assert len(sim.step()) == 2
+
+    def test_strided_ticker_published_every_k_steps(self):
+        """A ticker with stride k only appears in every k-th step's output."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL"])
+        sim.set_stride("GOOGL", 3)
+        seen = ["GOOGL" in sim.step() for _ in range(9)]
+        assert seen == [True, False, False] * 3
+        assert sim.step()["AAPL"] > 0
+
+    def test_stride_scales_dt(self):
+        """A stride-k ticker moves by one draw of k*dt: drift x k, volatility x sqrt(k)."""
+        sim = GBMSimulator(tickers=["JPM"], seed=3, event_probability=0.0)
+        sim.set_stride("JPM", 4)
+        start = sim.get_price("JPM")
+        for _ in range(5):  # Due on step 0 (one step) and step 4 (steps 1-4)
+            sim.step()
+        raw = GBMSimulator.substream(3, NORMAL_STREAM, _symbol_key("JPM")).standard_normal(5)
+        drift, diffusion = sim._drift[0], sim._diffusion[0]
+        expected = (drift + diffusion * raw[0]) + (4 * drift + 2 * diffusion * raw[4])
+        assert math.log(sim.get_price("JPM") / start) == pytest.approx(expected, rel=1e-9)
+
+    def test_stride_variance_matches_dt(self):
+        """Per-update log-returns of a stride-k ticker have k times the one-step variance."""
+        sim = GBMSimulator(tickers=["JPM"], seed=5, event_probability=0.0)
+        sim.set_stride("JPM", 9)
+        sim.step()  # Step 0 covers a single step
+        prices = [sim.get_price("JPM")]
+        for _ in range(9 * 4000):
+            if sim.step():
+                prices.append(sim.get_price("JPM"))
+        returns = np.diff(np.log(prices))
+        expected = 9 * sim._diffusion[0] ** 2
+        assert returns.var() == pytest.approx(expected, rel=0.1)
+
+    def test_stride_skips_work_for_idle_tickers(self):
+        """Tickers that are not due keep their price and are not mixed or exp'd."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL", "JPM"])
+        sim.set_stride("JPM", 10)
+        sim.step()
+        before = sim.get_price("JPM")
+        for _ in range(9):
+            assert "JPM" not in sim.step()
+            assert sim.get_price("JPM") == before
+
+    def test_invalid_stride_rejected(self):
+        """Strides below 1 are rejected."""
+        sim = GBMSimulator(tickers=["AAPL"])
+        with pytest.raises(ValueError):
+            sim.set_stride("AAPL", 0)
+
+    def test_catch_up_step_scales_dt(self):
+        """advance(steps=k) scales drift by k and the volatility term by sqrt(k)."""
+        one = GBMSimulator(tickers=["AAPL", "JPM"], seed=9, event_probability=0.0)
+        four = GBMSimulator(tickers=["AAPL", "JPM"], seed=9, event_probability=0.0)
+        start = four._prices.copy()
+        r1 = np.log(one.advance() / start)
+        r4 = np.log(four.advance(steps=4) / start)
+        np.testing.assert_allclose(r4 - 4 * four._drift, 2 * (r1 - one._drift), rtol=1e-9)
+
+    def test_catch_up_step_publishes_due_strides(self):
+        """A catch-up step covering a stride boundary publishes the strided ticker."""
+        sim = GBMSimulator(tickers=["AAPL", "GOOGL"])
+        sim.set_stride("GOOGL", 3)
+        assert "GOOGL" in sim.step()  # step 0
+        assert "GOOGL" not in sim.step()  # step 1
+        assert "GOOGL" in sim.step(steps=2)  # steps 2-3 cover step 3
+        assert "GOOGL" not in sim.step(steps=2)  # steps 4-5
+        assert "GOOGL" in sim.step()  # step 6
+
+    def test_bulk_add_matches_fresh_factor(self):
+        """add_tickers extends the Cholesky factor to match a fresh factorization."""
+        sim = GBMSimulator(tickers=["AAPL", "JPM"])
+        sim.add_tickers(["GOOGL", "V", "TSLA", "AAPL", "ZZZ"])
+        assert sim.get_tickers() == ["AAPL", "JPM", "GOOGL", "V", "TSLA", "ZZZ"]
+        fresh = GBMSimulator(tickers=sim.get_tickers())
+        np.testing.assert_allclose(sim._cholesky, fresh._cholesky, atol=1e-10)
+
+    @pytest.mark.parametrize("drop", [["GOOGL"], ["AAPL", "V", "TSLA", "ZZZ", "META"]])
+    def test_bulk_remove_matches_fresh_factor(self, drop):
+        """remove_tickers (downdate or rebuild) leaves the same factor as a fresh one."""
+        tickers = ["AAPL", "JPM", "GOOGL", "V", "TSLA", "ZZZ", "MSFT", "NVDA", "META"]
+        sim = GBMSimulator(tickers=tickers)
+        sim.set_stride("JPM", 2)
+        sim.remove_tickers([*drop, "UNKNOWN"])
+        kept = [t for t in tickers if t not in drop]
+        assert sim.get_tickers() == kept
+        assert sim._stride[sim._index["JPM"]] == 2
+        fresh = GBMSimulator(tickers=kept)
+        np.testing.assert_allclose(sim._cholesky, fresh._cholesky, atol=1e-10)
+        assert sorted(sim.step()) == sorted(kept)
@@ -1,11 +1,13 @@
 """Integration tests for SimulatorDataSource."""
 
 import asyncio
+import threading
 
 import pytest
 
 from app.market.cache import PriceCache
-from app.market.simulator import SimulatorDataSource
+from app.market.clock import VirtualClock
+from app.market.simulator import GBMSimulator, SimulatorDataSource
 
 
 @pytest.mark.asyncio
@@ -136,3 +138,202 @@ class TestSimulatorDataSource:
         # Just verify it starts and stops cleanly
         await asyncio.sleep(0.2)
         await source.stop()
+
+    async def test_factor_correlation_mode(self):
+        """Test running the source with the sector factor correlation engine."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.01, correlation="factor")
+        await source.start(["AAPL", "GOOGL", "JPM"])
+
+        initial_version = cache.version
+        await asyncio.sleep(0.05)
+        assert cache.version > initial_version
+        assert source._sim._cholesky is None
+
+        await source.stop()
+
+    async def test_sharded_workers(self):
+        """Test running the simulation across worker processes."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.02, workers=2)
+        await source.start(["AAPL", "GOOGL", "JPM"])
+        assert cache.get("JPM") is not None
+
+        initial_version = cache.version
+        await asyncio.sleep(0.1)
+        assert cache.version > initial_version
+
+        await source.add_ticker("TSLA")
+        await source.remove_ticker("GOOGL")
+        assert set(source.get_tickers()) == {"AAPL", "JPM", "TSLA"}
+        assert cache.get("TSLA") is not None
+
+        await source.stop()
+        await source.stop()
+
+    async def test_thread_executor(self):
+        """Test stepping in a dedicated thread instead of on the event loop."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.01, executor="thread")
+        await source.start(["AAPL", "GOOGL"])
+        assert source._task is None
+        assert source._thread is not None and source._thread.is_alive()
+
+        initial_version = cache.version
+        await asyncio.sleep(0.1)
+        assert cache.version > initial_version
+
+        await source.add_ticker("TSLA")
+        await source.remove_ticker("GOOGL")
+        await asyncio.sleep(0.05)
+        assert cache.get("TSLA") is not None
+        assert cache.get("GOOGL") is None  # Not re-published by an in-flight tick
+
+        await source.stop()
+        assert source._thread is None
+
+    async def test_process_executor(self):
+        """Test stepping in a subprocess driven from a dedicated thread."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.01, executor="process")
+        await source.start(["AAPL"])
+        assert source._workers == 1
+
+        initial_version = cache.version
+        await asyncio.sleep(0.1)
+        assert cache.version > initial_version
+
+        await source.stop()
+
+    async def test_unknown_executor_rejected(self):
+        """Test that an unknown executor raises ValueError."""
+        with pytest.raises(ValueError):
+            SimulatorDataSource(price_cache=PriceCache(), executor="nope")
+
+    async def test_rate_tiers(self):
+        """Test that tickers in slower tiers are stepped with a larger stride."""
+        cache = PriceCache()
+        source = SimulatorDataSource(
+            price_cache=cache,
+            update_interval=0.05,
+            tiers={"focus": 0.01, "background": 0.5},
+        )
+        source.set_ticker_tier("JPM", "background")  # Before the ticker exists
+        await source.start(["AAPL", "JPM"])
+        source.set_ticker_tier("AAPL", "focus")
+        await source.add_ticker("TSLA")
+
+        sim = source._sim
+        strides = dict(zip(sim.get_tickers(), sim._stride.tolist()))
+        assert strides == {"AAPL": 1, "JPM": 50, "TSLA": 5}
+        assert sim._dt == pytest.approx(GBMSimulator.DEFAULT_DT / 5)
+
+        source.set_ticker_tier("JPM", None)
+        assert sim._stride[sim._index["JPM"]] == 5
+        await source.stop()
+
+    async def test_rate_tier_validation(self):
+        """Test that unknown tiers and non-multiple intervals are rejected."""
+        source = SimulatorDataSource(price_cache=PriceCache(), tiers={"fast": 0.1})
+        with pytest.raises(ValueError):
+            source.set_ticker_tier("AAPL", "nope")
+        with pytest.raises(ValueError):
+            SimulatorDataSource(price_cache=PriceCache(), tiers={"a": 0.2, "b": 0.3})
+
+    async def test_catch_up_policy_runs(self):
+        """The catch_up missed-tick policy keeps publishing prices."""
+        cache = PriceCache()
+        source = SimulatorDataSource(
+            price_cache=cache, update_interval=0.02, missed_ticks="catch_up"
+        )
+        await source.start(["AAPL"])
+        version = cache.version
+        await asyncio.sleep(0.1)
+        assert cache.version > version
+        await source.stop()
+
+    async def test_unknown_missed_tick_policy_rejected(self):
+        """An unknown missed-tick policy is rejected up front."""
+        with pytest.raises(ValueError):
+            SimulatorDataSource(price_cache=PriceCache(), missed_ticks="burst")
+
+    async def test_bulk_add_and_remove(self):
+        """Test batched watchlist edits update the simulator and cache in one go."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=10.0)
+        await source.start(["AAPL"])
+
+        version = cache.version
+        await source.add_tickers(["GOOGL", "MSFT", "AAPL", "JPM"])
+        assert cache.version == version + 1  # One seeding batch
+        assert source.get_tickers() == ["AAPL", "GOOGL", "MSFT", "JPM"]
+        assert all(cache.get(t) is not None for t in source.get_tickers())
+
+        await source.remove_tickers(["AAPL", "MSFT"])
+        assert source.get_tickers() == ["GOOGL", "JPM"]
+        assert cache.get("AAPL") is None and cache.get("MSFT") is None
+
+        await source.stop()
+
+    async def test_virtual_clock_runs_as_fast_as_possible(self):
+        """On an unscaled VirtualClock, minutes of ticks take no real time."""
+        clock = VirtualClock(epoch=1_700_000_000.0)
+        cache = PriceCache(clock=clock)
+        source = SimulatorDataSource(price_cache=cache, update_interval=0.5, clock=clock)
+        await source.start(["AAPL", "GOOGL"])
+        version = cache.version
+
+        await clock.sleep(60.0)
+
+        # Ticks at t = 0, 0.5, ..., 60 → 121 ticks, one version each (the last may race)
+        assert cache.version - version >= 120
+        assert cache.get("AAPL").timestamp >= 1_700_000_059.5
+        await source.stop()
+
+    async def test_tick_is_one_cache_version(self):
+        """A tick publishes every ticker as a single cache version."""
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, update_interval=10.0)
+        await source.start(["AAPL", "GOOGL", "MSFT"])
+        version = cache.version
+        source._tick()
+        assert cache.version == version + 1
+        timestamps = {update.timestamp for update in cache.get_all().values()}
+        assert len(timestamps) == 1
+        await source.stop()
+
+    async def test_thread_executor_edits_do_not_block_loop(self):
+        """With a stepping thread, tier changes and edits never wait on a tick in progress."""
+        cache = PriceCache()
+        source = SimulatorDataSource(
+            price_cache=cache, update_interval=0.02, executor="thread", tiers={"slow": 0.1}
+        )
+        await source.start(["AAPL", "GOOGL"])
+
+        with source._sim_lock:  # A long tick in progress
+            source.set_ticker_tier("AAPL", "slow")  # Returns without the lock
+            add = asyncio.create_task(source.add_tickers(["MSFT"]))
+            await asyncio.sleep(0.05)  # The event loop keeps running meanwhile
+            assert not add.done()
+        await add
+
+        await asyncio.sleep(0.1)
+        sim = source._sim
+        assert sim._stride[sim._index["AAPL"]] == 5
+        assert "MSFT" in sim.get_tickers()
+        await source.stop()
+
+    async def test_correlation_file_loaded_off_the_loop(self, tmp_path):
+        """With a correlation file, the simulator is built in a worker thread."""
+        path = tmp_path / "corr.csv"
+        path.write_text(",AAPL,JPM\nAAPL,1.0,-0.4\nJPM,-0.4,1.0\n")
+        cache = PriceCache()
+        source = SimulatorDataSource(price_cache=cache, correlation_file=str(path))
+        built_in = []
+        build = source._build
+        source._build = lambda tickers: built_in.append(threading.get_ident()) or build(tickers)
+        await source.start(["AAPL", "JPM"])
+        assert built_in and built_in[0] != threading.get_ident()
+        corr = source._sim._cholesky @ source._sim._cholesky.T
+        assert corr[0, 1] == pytest.approx(-0.4)
+        await source.stop()